@@ -12,6 +12,40 @@ coherence.
 from itertools import permutations, combinations
 import numpy as np
 import pandas as pd
+from dariah_topics.preprocessing import EncodedCorpus
+
+
+def token2bow(token, type_dictionary):
+    """
+    Translates a token to its type ID.
+
+    Args:
+        token (str): A token.
+        type_dictionary (dict): A dictionary containing types as key and
+            IDs as values.
+
+    Returns:
+        The type ID, or None if the token is unknown.
+    """
+    return type_dictionary.get(token)
+
+
+def _read_sparse_bow(sparse_bow):
+    """
+    Creates a sparse bag-of-words model from an integer-encoded corpus.
+
+    Args:
+        sparse_bow (pd.DataFrame or EncodedCorpus): A DataFrame containing
+            MultiIndex with `doc_id` and `type_id` and word frequencies, or an
+            integer-encoded corpus.
+
+    Returns:
+        DataFrame containing MultiIndex with `doc_id` and `type_id` and word
+        frequencies.
+    """
+    if isinstance(sparse_bow, EncodedCorpus):
+        return sparse_bow.to_document_term_matrix()
+    return sparse_bow
 
 
 class Preparation:
@@ -26,12 +60,13 @@ class Preparation:
         Args:
             topics (pd.DataFrame): A DataFrame containing topic keys.
             sparse_bow (pd.DataFrame): A DataFrame containing MultiIndex with
-                `doc_id` and `type_id` and word frequencies.
+                `doc_id` and `type_id` and word frequencies, or an
+                :class:`preprocessing.EncodedCorpus`.
             type_dictionary (dict): A dictionary containing types as key and
                 IDs as values.
         """
         self.topics = topics
-        self.sparse_bow = sparse_bow
+        self.sparse_bow = _read_sparse_bow(sparse_bow)
         self.type_dictionary = type_dictionary
 
     def segment_topics(self, permutation=False):
@@ -66,7 +101,7 @@ class Preparation:
         Returns:
             Series containing document IDs for each token ID.
         """
-        bow = self.sparse_bow.reset_index(level=1)['token_id']
+        bow = self.sparse_bow.reset_index(level=1).iloc[:, 0]
         occurences = pd.Series()
         if isinstance(bigrams, set):
             pass
@@ -97,12 +132,13 @@ class Measures(Preparation):
         Args:
             topics (pd.DataFrame): A DataFrame containing topic keys.
             sparse_bow (pd.DataFrame): A DataFrame containing MultiIndex with
-                `doc_id` and `type_id` and word frequencies.
+                `doc_id` and `type_id` and word frequencies, or an
+                :class:`preprocessing.EncodedCorpus`.
             type_dictionary (dict): A dictionary containing types as key and
                 IDs as values.
         """
         self.type_dictionary = type_dictionary
-        self.sparse_bow = sparse_bow
+        self.sparse_bow = _read_sparse_bow(sparse_bow)
 
     def pmi_uci(self, pair, occurences, e=0.1, normalize=False):
         """
@@ -152,7 +188,7 @@ class Measures(Preparation):
         Returns:
             Integer.
         """
-        n = len(self.sparse_bow.count(level=0))
+        n = self.sparse_bow.index.get_level_values(0).nunique()
         try:
             k1 = occurences[str(pair[0])]
         except KeyError:
@@ -178,12 +214,13 @@ class Evaluation(Measures):
         Args:
             topics (pd.DataFrame): A DataFrame containing topic keys.
             sparse_bow (pd.DataFrame): A DataFrame containing MultiIndex with
-                `doc_id` and `type_id` and word frequencies.
+                `doc_id` and `type_id` and word frequencies, or an
+                :class:`preprocessing.EncodedCorpus`.
             type_dictionary (dict): A dictionary containing types as key and
                 IDs as values.
         """
         self.topics = topics
-        self.sparse_bow = sparse_bow
+        self.sparse_bow = _read_sparse_bow(sparse_bow)
         self.type_dictionary = type_dictionary
 
     def calculate_umass(self, mean=True, e=0.1):
@@ -1,18 +1,683 @@
-import lda
+"""
+Training LDA Models
+*******************
+
+Functions of this module are for **modeling purpose**. You can train `LDA models <https://en.wikipedia.org/wiki/Latent_Dirichlet_allocation>`_ \
+with `lda <https://pypi.python.org/pypi/lda>`_, `Gensim <https://radimrehurek.com/gensim/>`_, \
+`MALLET <http://mallet.cs.umass.edu/topics.php>`_ or with a native sampler, \
+which works directly on each ``document_term_matrix`` variant of :func:`preprocessing.create_document_term_matrix()`.
+
+Contents
+********
+    * :class:`ConvergenceMonitor` records the log likelihood during training \
+    and stops it early, if the log likelihood has converged.
+    * :class:`OnlineLDA` is an online variational Bayes LDA, which is trained \
+    mini-batch by mini-batch with :meth:`OnlineLDA.partial_fit()`.
+    * :func:`align_topic_word()` aligns the topic-word matrix of a trained \
+    model to a new vocabulary, e.g. for a warm start.
+    * :class:`NativeLDA` is a collapsed Gibbs sampler for LDA compiled with Numba, \
+    using the bucket decomposition of SparseLDA or Metropolis-Hastings steps \
+    with alias tables, whose cost per token does not grow with the number of topics.
+    * :func:`lda()` trains a LDA model with one of the supported implementations.
+    * :func:`train_models()` trains LDA models for a grid of parameters, e.g. \
+    topic counts and seeds, on a pool of worker processes.
+"""
+from dariah_topics import postprocessing
 from dariah_topics import utils
-import gensim
+from functools import partial
+from itertools import islice
+from gensim.models import LdaMulticore
+from lda.lda import LDA
+from lda.utils import check_random_state
+from multiprocessing import Pool, shared_memory
+from numba import njit
+import numpy as np
+import os
+import pandas as pd
+from scipy import sparse
+from scipy.special import digamma, gammaln
+import time
+import logging
+
+log = logging.getLogger('dariah_topics')
+
+_shared_document_term_matrix = None
+
+
+class ConvergenceMonitor:
+    """Records the log likelihood during training and detects convergence.
+
+    With this class you can monitor the training of a LDA model and stop it \
+    early. Pass an instance in ``callbacks`` to :func:`lda()` or \
+    :meth:`NativeLDA.fit()`. Every ``refresh`` iterations (every pass for Gensim), \
+    the model calls each callback with the iteration, the log likelihood, the \
+    perplexity and the wall-clock seconds per iteration since the last report. \
+    Any callable with this signature can be used as callback; if it returns \
+    True, training stops. This class stops training as soon as the relative \
+    change of the log likelihood over the last ``window`` reports is below \
+    ``tolerance``. For lda and native models, the log likelihood is the \
+    complete log likelihood log p(w, z), for Gensim models the variational bound. \
+    Gensim models report once per pass, and :func:`lda()` trains them with \
+    one pass by default, thus pass e.g. ``passes=50`` to stop them early.
+
+    Args:
+        window (int, optional): Number of reports to compare the current log
+            likelihood with. Defaults to 5.
+        tolerance (float, optional): Relative change of the log likelihood below
+            which the model is considered converged. If None, training is never
+            stopped. Defaults to 0.001.
+
+    Example:
+        >>> monitor = ConvergenceMonitor(window=2, tolerance=0.01)
+        >>> [monitor(iteration, loglikelihood, 10.0, 0.5) for iteration, loglikelihood in [(0, -1000), (10, -900), (20, -895), (30, -894)]]
+        [False, False, False, True]
+        >>> monitor.iterations, monitor.converged
+        ([0, 10, 20, 30], True)
+        >>> document_term_matrix = np.array([[5, 4, 0, 0], [0, 0, 6, 3], [4, 5, 1, 0]])
+        >>> monitor = ConvergenceMonitor(window=1, tolerance=0.5)
+        >>> model = lda(document_term_matrix, 2, iterations=100, callbacks=[monitor], random_state=1, refresh=10)
+        >>> model.n_iter_ < 100, monitor.converged
+        (True, True)
+    """
+    def __init__(self, window=5, tolerance=0.001):
+        self.window = window
+        self.tolerance = tolerance
+        self.iterations = []
+        self.loglikelihoods = []
+        self.perplexities = []
+        self.seconds = []
+        self.converged = False
+
+    def __call__(self, iteration, loglikelihood, perplexity, seconds):
+        self.iterations.append(iteration)
+        self.loglikelihoods.append(loglikelihood)
+        self.perplexities.append(perplexity)
+        self.seconds.append(seconds)
+        if self.tolerance is not None and len(self.loglikelihoods) > self.window:
+            previous = self.loglikelihoods[-self.window - 1]
+            self.converged = abs(loglikelihood - previous) <= self.tolerance * abs(previous)
+        return self.converged
+
+
+class NativeLDA:
+    """Latent Dirichlet allocation using sparse collapsed Gibbs sampling.
+
+    With this class you can train a LDA model on a ``document_term_matrix`` \
+    without converting it first, i.e. a pandas DataFrame for small or large \
+    corpora or a sparse matrix. Topics are sampled with the bucket decomposition \
+    of `SparseLDA <https://doi.org/10.1145/1557019.1557121>`_: the sampling \
+    distribution of a token splits into a *smoothing* bucket (``alpha * eta``), \
+    a *document* bucket (non-zero topics of the document) and a *topic word* \
+    bucket (non-zero topics of the type), whose masses are updated incrementally. \
+    The non-zero topics of each document and type are kept in lists, thus \
+    sampling a token only visits these topics, not all ``n_topics``. The \
+    sampling loops are compiled with `Numba <https://numba.pydata.org>`_. \
+    With ``sampler='alias'``, each token instead takes ``mh_steps`` Metropolis-Hastings \
+    steps, alternating between a *word proposal* drawn from stale alias tables \
+    and a *document proposal* drawn from the topics of the document \
+    (`LightLDA <https://arxiv.org/abs/1412.1576>`_). The word proposal mixes \
+    an alias table over the non-zero topics of the type, which is rebuilt once \
+    per iteration, and an alias table of the smoothing part shared by all \
+    types, which is rebuilt after ``n_topics`` proposals, so sampling a token \
+    costs amortized O(1) instead of O(``n_topics``). \
+    The attributes ``topic_word_``, ``doc_topic_``, ``components_``, ``nzw_``, \
+    ``ndz_``, ``nz_`` and ``loglikelihoods_`` correspond to those of a \
+    `lda <https://pypi.python.org/pypi/lda>`_ model, so :func:`postprocessing.show_topics()` \
+    and :func:`postprocessing.show_document_topics()` can be used as usual. \
+    For a large corpus model, column *j* of ``topic_word_`` corresponds to \
+    type ID *j + 1*. As with a lda model, the token arrays and sampling tables \
+    are deleted after training, thus the size of a trained model does not depend \
+    on the number of tokens.
+
+    Args:
+        n_topics (int): Number of topics.
+        n_iter (int, optional): Number of sampling iterations. Defaults to 1000.
+        alpha (float, optional): Dirichlet parameter for distribution over topics.
+            Defaults to 0.1.
+        eta (float, optional): Dirichlet parameter for distribution over words.
+            Defaults to 0.01.
+        random_state (int, optional): Seed of the random number generator.
+            Defaults to None.
+        refresh (int, optional): Compute and log the log likelihood every
+            ``refresh`` iterations. Defaults to 10.
+        sampler (str, optional): Either ``sparse`` for exact Gibbs sampling with
+            SparseLDA buckets or ``alias`` for alias-table Metropolis-Hastings
+            sampling, whose cost per token does not grow with the number of
+            topics. Defaults to ``sparse``.
+        mh_steps (int, optional): Only for ``sampler='alias'``. Number of
+            Metropolis-Hastings steps per token, each consisting of a word and
+            a document proposal. Defaults to 2.
+
+    Raises:
+        ValueError, if ``alpha`` or ``eta`` is not greater than zero, or if
+            ``sampler`` is not supported.
+
+    Example:
+        >>> from dariah_topics.preprocessing import create_document_term_matrix
+        >>> tokenized_corpus = [['apple', 'pear', 'apple'], ['ship', 'sea', 'ship'], ['pear', 'apple']]
+        >>> document_term_matrix, _, type_ids = create_document_term_matrix(tokenized_corpus, ['a', 'b', 'c'], sparse_matrix=True)
+        >>> model = NativeLDA(n_topics=2, n_iter=50, random_state=23).fit(document_term_matrix)
+        >>> model.topic_word_.shape, model.doc_topic_.shape
+        ((2, 4), (3, 2))
+        >>> int(model.nzw_.sum()), np.allclose(model.doc_topic_.sum(axis=1), 1)
+        (8, True)
+        >>> model = NativeLDA(n_topics=2, n_iter=50, random_state=23, sampler='alias').fit(document_term_matrix)
+        >>> int(model.nzw_.sum()), np.array_equal(model.nz_, model.nzw_.sum(axis=1))
+        (8, True)
+        >>> import tempfile
+        >>> from dariah_topics import postprocessing, preprocessing
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     postprocessing.save_model(model, tmpdir, binary=True)
+        ...     loaded_model = preprocessing.read_model(tmpdir)
+        ...     type(loaded_model).__name__, np.array_equal(loaded_model.topic_word_, model.topic_word_)
+        ('NativeLDA', True)
+    """
+    def __init__(self, n_topics, n_iter=1000, alpha=0.1, eta=0.01, random_state=None, refresh=10,
+                 sampler='sparse', mh_steps=2):
+        if alpha <= 0 or eta <= 0:
+            raise ValueError("alpha and eta must be greater than zero")
+        if sampler not in {'sparse', 'alias'}:
+            raise ValueError("{} is no supported sampler".format(sampler))
+        self.n_topics = n_topics
+        self.n_iter = n_iter
+        self.alpha = alpha
+        self.eta = eta
+        self.random_state = random_state
+        self.refresh = refresh
+        self.sampler = sampler
+        self.mh_steps = mh_steps
+
+    def fit(self, document_term_matrix, y=None, callbacks=None, initial_topic_word=None):
+        """Trains the model.
+
+        The number of iterations actually run is stored in ``n_iter_``. If \
+        ``initial_topic_word`` is not None, the model is warm-started: the \
+        initial topic of every token is drawn proportional to the column of its \
+        type, instead of uniformly.
+
+        Args:
+            document_term_matrix (pandas.DataFrame or scipy.sparse.spmatrix): A
+                document-term matrix with integer counts.
+            y: Ignored.
+            callbacks (list, optional): Callables, e.g. a :class:`ConvergenceMonitor`,
+                called every ``refresh`` iterations. Training stops if one returns
+                True. Defaults to None.
+            initial_topic_word (numpy.ndarray, optional): Topic-word matrix of a
+                trained model, aligned to the columns of ``document_term_matrix``,
+                e.g. by :func:`align_topic_word()`. Defaults to None.
+
+        Returns:
+            The model itself.
+        """
+        random_state = np.random.RandomState(self.random_state)
+        self._initialize(_to_sparse_matrix(document_term_matrix), random_state, initial_topic_word)
+        monitor = _TrainingMonitor(callbacks, len(self.words))
+        self.n_iter_ = self.n_iter
+        for iteration in range(self.n_iter):
+            if iteration % self.refresh == 0 and self._log_likelihood(monitor, iteration):
+                self.n_iter_ = iteration
+                break
+            self._sample_topics(random_state)
+        else:
+            self._log_likelihood(monitor, self.n_iter - 1)
+        self._estimate_distributions()
+        self.nzw_ = np.ascontiguousarray(self.nzw_)
+        del self.words
+        del self.indptr
+        del self.topics
+        del self._nwz
+        del self._word_indptr
+        del self._word_topics
+        del self._word_nnz
+        del self._alias_tables
+        return self
+
+    def fit_transform(self, document_term_matrix, y=None):
+        """Trains the model and returns the document-topic distributions.
+
+        Args:
+            document_term_matrix (pandas.DataFrame or scipy.sparse.spmatrix): A
+                document-term matrix with integer counts.
+            y: Ignored.
+
+        Returns:
+            The document-topic distributions as NumPy array.
+        """
+        return self.fit(document_term_matrix).doc_topic_
+
+    def loglikelihood(self):
+        """Calculates the complete log likelihood, log p(w, z).
+
+        Returns:
+            The log likelihood as float.
+        """
+        n_topics, vocab_size = self.nzw_.shape
+        n_documents = self.ndz_.shape[0]
+        alpha, eta = self.alpha, self.eta
+        nd = self.ndz_.sum(axis=1)
+        return float(n_topics * (gammaln(vocab_size * eta) - vocab_size * gammaln(eta))
+                     + gammaln(self.nzw_ + eta).sum() - gammaln(self.nz_ + vocab_size * eta).sum()
+                     + n_documents * (gammaln(n_topics * alpha) - n_topics * gammaln(alpha))
+                     + gammaln(self.ndz_ + alpha).sum() - gammaln(nd + n_topics * alpha).sum())
+
+    def _estimate_distributions(self):
+        """Computes point estimates of the topic-word and document-topic distributions.
+        """
+        self.components_ = (self.nzw_ + self.eta).astype(float)
+        self.components_ /= self.components_.sum(axis=1)[:, np.newaxis]
+        self.topic_word_ = self.components_
+        self.doc_topic_ = (self.ndz_ + self.alpha).astype(float)
+        self.doc_topic_ /= self.doc_topic_.sum(axis=1)[:, np.newaxis]
+
+    def _initialize(self, document_term_matrix, random_state, initial_topic_word=None):
+        """Assigns a random topic to every token and counts the assignments.
+        """
+        n_documents, vocab_size = document_term_matrix.shape
+        self.words = np.repeat(document_term_matrix.indices, document_term_matrix.data)
+        document_lengths = np.asarray(document_term_matrix.sum(axis=1)).ravel()
+        self.indptr = np.concatenate(([0], np.cumsum(document_lengths)))
+        documents = np.repeat(np.arange(n_documents), np.diff(self.indptr))
+        log.info("Sampling {} topics for {} tokens in {} documents with {} types ...".format(
+            self.n_topics, len(self.words), n_documents, vocab_size))
+        if initial_topic_word is None:
+            self.topics = random_state.randint(self.n_topics, size=len(self.words))
+        else:
+            self.topics = _draw_initial_topics(self.words, _check_topic_word(initial_topic_word, self.n_topics,
+                                                                             vocab_size), random_state)
+        self._nwz = np.zeros((vocab_size, self.n_topics), dtype=np.intc)
+        self.ndz_ = np.zeros((n_documents, self.n_topics), dtype=np.intc)
+        np.add.at(self._nwz, (self.words, self.topics), 1)
+        np.add.at(self.ndz_, (documents, self.topics), 1)
+        self.nzw_ = self._nwz.T
+        self.nz_ = self._nwz.sum(axis=0).astype(np.intc)
+        self.loglikelihoods_ = []
+        self._word_indptr, self._word_topics, self._word_nnz = _index_word_topics(self._nwz)
+        capacity = len(self._word_topics)
+        self._alias_tables = (np.zeros(capacity, dtype=np.int64), np.zeros(capacity), np.zeros(capacity),
+                              np.zeros(capacity, dtype=np.int64), np.zeros(vocab_size, dtype=np.int64),
+                              np.zeros(vocab_size))
+
+    def _log_likelihood(self, monitor, iteration):
+        """Computes, records and reports the log likelihood.
+
+        Returns:
+            True, if training should stop.
+        """
+        self.loglikelihoods_.append(self.loglikelihood())
+        return monitor.report(iteration, self.loglikelihoods_[-1])
+
+    def _sample_topics(self, random_state):
+        """Samples all topic assignments once, document by document.
+        """
+        if self.sampler == 'alias':
+            self._sample_topics_metropolis_hastings(random_state)
+        else:
+            self._sample_topics_sparse(random_state)
+
+    def _sample_topics_metropolis_hastings(self, random_state):
+        """Samples all topic assignments once with alias-table Metropolis-Hastings steps.
+        """
+        _sweep_metropolis_hastings(self.words, self.topics, self.indptr, self._nwz, self.ndz_, self.nz_,
+                                   self._word_indptr, self._word_topics, self._word_nnz, *self._alias_tables,
+                                   self.alpha, self.eta, self.mh_steps, random_state.randint(2 ** 31 - 1))
+
+    def _sample_topics_sparse(self, random_state):
+        """Samples all topic assignments once with the SparseLDA buckets.
+        """
+        _sweep_sparse(self.words, self.topics, self.indptr, self._nwz, self.ndz_, self.nz_, self._word_indptr,
+                      self._word_topics, self._word_nnz, self.alpha, self.eta, random_state.randint(2 ** 31 - 1))
+
+
+class OnlineLDA:
+    """Latent Dirichlet allocation using online variational Bayes.
+
+    With this class you can train a LDA model on a stream of documents, \
+    mini-batch by mini-batch, as described by `Hoffman, Blei and Bach (2010) \
+    <https://papers.nips.cc/paper/3902-online-learning-for-latent-dirichlet-allocation>`_. \
+    Every call of :meth:`partial_fit()` infers the topic distributions of the \
+    documents in a batch (E-step) and blends the resulting estimate of the \
+    variational topic-word parameters into ``components_`` with the learning \
+    rate ``(tau0 + t) ** -kappa``, *t* being the number of the batch, counting \
+    from 1 (M-step). Only ``components_`` with one row per topic and one column per \
+    type is kept, thus memory usage does not depend on the number of documents. \
+    The vocabulary may grow from batch to batch, e.g. if the batches are \
+    created by a :class:`preprocessing.DocumentTermMatrixBuilder`. Column *j* \
+    corresponds to type ID *j + 1*, as in a sparse document-term matrix. A \
+    model saved with :func:`postprocessing.save_model()` can be trained further \
+    after :func:`preprocessing.read_model()`.
+
+    Args:
+        n_topics (int): Number of topics.
+        alpha (float, optional): Dirichlet parameter for distribution over topics.
+            Defaults to 0.1.
+        eta (float, optional): Dirichlet parameter for distribution over words.
+            Defaults to 0.01.
+        tau0 (float, optional): Non-negative delay, which down-weights early
+            batches. Defaults to 1.0.
+        kappa (float, optional): Forgetting rate in (0.5, 1], i.e. how fast
+            old batches are forgotten. Defaults to 0.7.
+        total_documents (int, optional): Expected total number of documents.
+            If None, the number of documents seen so far is used. Defaults to None.
+        max_iter (int, optional): Maximum number of E-step iterations per document.
+            Defaults to 100.
+        tol (float, optional): The E-step of a document stops, if the mean change
+            of its topic parameters is below ``tol``. Defaults to 0.001.
+        random_state (int, optional): Seed of the random number generator.
+            Defaults to None.
+
+    Raises:
+        ValueError, if ``kappa`` is not in (0.5, 1] or ``tau0`` is negative.
+
+    Example:
+        >>> model = OnlineLDA(n_topics=2, random_state=23)
+        >>> model.partial_fit([[(0, 2), (1, 1)], [(2, 2), (3, 1)]]).topic_word_.shape
+        (2, 4)
+        >>> model.partial_fit([[(0, 1), (4, 3)]]).topic_word_.shape
+        (2, 5)
+        >>> model.n_batches_, model.n_documents_, np.allclose(model.transform([[(2, 3)]]).sum(), 1)
+        (2, 3, True)
+        >>> model = OnlineLDA(n_topics=2, tau0=0, random_state=23)
+        >>> bool(np.isfinite(model.partial_fit([[(0, 2), (1, 1)]]).components_).all())
+        True
+        >>> import tempfile
+        >>> from dariah_topics import postprocessing, preprocessing
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     postprocessing.save_model(model, tmpdir, binary=True)
+        ...     loaded_model = preprocessing.read_model(tmpdir).partial_fit([[(2, 2), (1, 1)]])
+        >>> np.array_equal(loaded_model.components_, model.partial_fit([[(2, 2), (1, 1)]]).components_)
+        True
+    """
+    def __init__(self, n_topics, alpha=0.1, eta=0.01, tau0=1.0, kappa=0.7, total_documents=None, max_iter=100,
+                 tol=0.001, random_state=None):
+        if not 0.5 < kappa <= 1:
+            raise ValueError("kappa must be in (0.5, 1]")
+        if tau0 < 0:
+            raise ValueError("tau0 must not be negative")
+        self.n_topics = n_topics
+        self.alpha = alpha
+        self.eta = eta
+        self.tau0 = tau0
+        self.kappa = kappa
+        self.total_documents = total_documents
+        self.max_iter = max_iter
+        self.tol = tol
+        self.random_state = random_state
+        self.components_ = np.empty((n_topics, 0))
+        self.n_batches_ = 0
+        self.n_documents_ = 0
+        self._seed = np.random.randint(2 ** 31 - 1) if random_state is None else random_state
+        self._n_draws = 0
+
+    @property
+    def topic_word_(self):
+        """Point estimate of the topic-word distributions.
+        """
+        return self.components_ / self.components_.sum(axis=1)[:, np.newaxis]
+
+    def fit(self, corpus, y=None, batch_size=256):
+        """Trains the model with one pass over a corpus, in mini-batches.
+
+        Args:
+            corpus: A document-term matrix or an iterable of bag-of-words
+                documents, see :meth:`partial_fit()`. An iterable is consumed
+                lazily, ``batch_size`` documents at a time.
+            y: Ignored.
+            batch_size (int, optional): Number of documents per mini-batch.
+                Defaults to 256.
+
+        Returns:
+            The model itself.
+        """
+        if isinstance(corpus, (pd.DataFrame, tuple)) or sparse.issparse(corpus):
+            matrix = _to_batch_matrix(corpus)
+            batches = (matrix[start:start + batch_size] for start in range(0, matrix.shape[0], batch_size))
+        else:
+            offset = 1 if isinstance(corpus, pd.Series) else 0
+            corpus = iter(corpus)
+            batches = iter(lambda: list(islice(corpus, batch_size)), [])
+        for batch in batches:
+            self.partial_fit(batch if sparse.issparse(batch) else _bow_to_sparse_matrix(batch, offset))
+        return self
+
+    def partial_fit(self, batch, y=None):
+        """Updates the topics with a mini-batch of documents.
+
+        Args:
+            batch: A document-term matrix (pandas DataFrame or sparse matrix),
+                the tuple returned by :meth:`preprocessing.DocumentTermMatrixBuilder.to_sparse_matrix()`,
+                a list of bag-of-words documents with ``(id, frequency)`` tuples
+                and Gensim IDs (type ID minus one), or the pandas Series returned
+                by :func:`postprocessing.doc2bow()`, which contains type IDs.
+            y: Ignored.
+
+        Returns:
+            The model itself.
+        """
+        matrix = _to_batch_matrix(batch)
+        self._grow_vocabulary(matrix.shape[1])
+        if matrix.shape[0] == 0:
+            return self
+        _, statistics = self._infer(matrix)
+        self.n_documents_ += matrix.shape[0]
+        total_documents = self.n_documents_ if self.total_documents is None else self.total_documents
+        rho = (self.tau0 + self.n_batches_ + 1) ** -self.kappa
+        self.components_ = (1 - rho) * self.components_ \
+            + rho * (self.eta + total_documents / matrix.shape[0] * statistics)
+        self.n_batches_ += 1
+        log.debug("Updated topics with batch #{} of {} documents, rho = {:.4f}.".format(
+            self.n_batches_, matrix.shape[0], rho))
+        return self
+
+    def transform(self, batch):
+        """Infers the document-topic distributions of documents.
+
+        Args:
+            batch: Documents in one of the formats of :meth:`partial_fit()`.
+
+        Returns:
+            The document-topic distributions as NumPy array.
+        """
+        matrix = _to_batch_matrix(batch)
+        gamma, _ = self._infer(matrix[:, :self.components_.shape[1]])
+        return gamma / gamma.sum(axis=1)[:, np.newaxis]
+
+    def _grow_vocabulary(self, vocab_size):
+        """Adds randomly initialized columns for new types.
+        """
+        missing = vocab_size - self.components_.shape[1]
+        if missing > 0:
+            new = self._next_random_state().gamma(100.0, 0.01, (self.n_topics, missing))
+            self.components_ = np.hstack((self.components_, new))
+
+    def _infer(self, matrix):
+        """Runs the E-step for each document of a batch.
+
+        Returns:
+            A tuple of the variational document-topic parameters and the
+                sufficient statistics for the topic-word parameters.
+        """
+        components = self.components_[:, :matrix.shape[1]]
+        exp_elog_beta = np.exp(digamma(components) - digamma(self.components_.sum(axis=1))[:, np.newaxis])
+        gamma = self._next_random_state().gamma(100.0, 0.01, (matrix.shape[0], self.n_topics))
+        statistics = np.zeros_like(components)
+        for document in range(matrix.shape[0]):
+            start, stop = matrix.indptr[document], matrix.indptr[document + 1]
+            ids, counts = matrix.indices[start:stop], matrix.data[start:stop]
+            if len(ids) == 0:
+                gamma[document] = self.alpha
+                continue
+            gamma_d = gamma[document]
+            exp_elog_theta = np.exp(digamma(gamma_d) - digamma(gamma_d.sum()))
+            beta_d = exp_elog_beta[:, ids]
+            norm = exp_elog_theta @ beta_d + 1e-100
+            for _ in range(self.max_iter):
+                previous = gamma_d
+                gamma_d = self.alpha + exp_elog_theta * (beta_d @ (counts / norm))
+                exp_elog_theta = np.exp(digamma(gamma_d) - digamma(gamma_d.sum()))
+                norm = exp_elog_theta @ beta_d + 1e-100
+                if np.mean(np.abs(gamma_d - previous)) < self.tol:
+                    break
+            gamma[document] = gamma_d
+            statistics[:, ids] += np.outer(exp_elog_theta, counts / norm)
+        return gamma, statistics * exp_elog_beta
+
+    def _next_random_state(self):
+        """Derives a new random number generator from the seed and the number of draws.
+
+        Only the seed and a counter are kept instead of a generator, thus a \
+        model saved with :func:`postprocessing.save_model()` continues with \
+        the same random numbers after :func:`preprocessing.read_model()`.
+        """
+        self._n_draws += 1
+        return np.random.RandomState([self._seed, self._n_draws])
+
+
+def align_topic_word(topic_word, vocabulary, new_vocabulary):
+    """Aligns a topic-word matrix to a new vocabulary by type.
+
+    With this function you can reuse the topic-word matrix of a trained model, \
+    e.g. ``topic_word_``, for a document-term matrix with changed columns. Columns \
+    of types in both vocabularies are copied, columns of types missing in \
+    ``vocabulary`` get the mean of the symmetric Dirichlet prior, i.e. \
+    ``1 / len(new_vocabulary)`` in every topic. Types missing in ``new_vocabulary`` \
+    are dropped.
+
+    Args:
+        topic_word (numpy.ndarray): Topic-word matrix, with columns corresponding
+            to ``vocabulary``.
+        vocabulary (list): Types of the columns of ``topic_word``.
+        new_vocabulary (list): Types of the columns of the new document-term matrix.
+
+    Returns:
+        The aligned topic-word matrix as NumPy array.
+
+    Example:
+        >>> topic_word = np.array([[0.5, 0.3, 0.2], [0.1, 0.1, 0.8]])
+        >>> align_topic_word(topic_word, ['apple', 'pear', 'ship'], ['ship', 'sea', 'apple']).tolist()
+        [[0.2, 0.3333333333333333, 0.5], [0.8, 0.3333333333333333, 0.1]]
+    """
+    positions = {type_: n for n, type_ in enumerate(vocabulary)}
+    columns = np.array([positions.get(type_, -1) for type_ in new_vocabulary], dtype=np.intp)
+    aligned = np.full((topic_word.shape[0], len(columns)), 1 / max(len(columns), 1))
+    known = columns >= 0
+    aligned[:, known] = topic_word[:, columns[known]]
+    log.info("Aligned {} of {} types, {} types are new.".format(known.sum(), len(columns), (~known).sum()))
+    return aligned
+
 
 def lda(document_term_matrix, topics, iterations=1000, implementation='lda', gensim_corpus=None,
         type2id=None, path_to_mallet=None, clean_tokenized_corpus=None, document_labels=None,
-        output_topic_keys=None, output_doc_topics=None, **kwargs):
-    if implementation == 'lda':
-        model = lda.LDA(n_topics=topics, n_iter=iterations, **kwargs)
+        output_topic_keys=None, output_doc_topics=None, callbacks=None, initial_model=None,
+        initial_vocabulary=None, vocabulary=None, **kwargs):
+    """Trains a LDA model with one of the supported implementations.
+
+    With this function you can train a LDA model with `lda <https://pypi.python.org/pypi/lda>`_ \
+    (``lda``), the :class:`NativeLDA` sampler (``native``), :class:`OnlineLDA` \
+    (``online``), `Gensim <https://radimrehurek.com/gensim/>`_ (``gensim``) or \
+    `MALLET <http://mallet.cs.umass.edu/topics.php>`_ (``mallet``). ``lda`` and \
+    ``native`` are trained by collapsed Gibbs sampling on a ``document_term_matrix``, \
+    ``online`` by online variational Bayes, mini-batch by mini-batch, on a \
+    ``document_term_matrix`` or, if it is None, on ``gensim_corpus``. With \
+    ``initial_model``, ``lda`` and ``native`` models start from the topic-word \
+    matrix of a trained model instead of a random assignment (warm start). If \
+    ``initial_vocabulary`` is not None, this matrix is aligned to ``vocabulary`` \
+    by :func:`align_topic_word()` first.
+
+    Args:
+        document_term_matrix (pandas.DataFrame or scipy.sparse.spmatrix): A
+            document-term matrix, for ``lda``, ``native`` and ``online``.
+        topics (int): Number of topics.
+        iterations (int, optional): Number of iterations, for ``online`` the
+            maximum number of E-step iterations per document. Defaults to 1000.
+        implementation (str, optional): One of ``lda``, ``native``, ``online``,
+            ``gensim`` or ``mallet``. Defaults to ``lda``.
+        gensim_corpus (list, optional): Bag-of-words corpus for ``gensim``, or
+            for ``online`` if ``document_term_matrix`` is None. Defaults to None.
+        type2id (dict, optional): Gensim dictionary for ``gensim``. Defaults to None.
+        path_to_mallet (str, optional): Path to MALLET for ``mallet``. Defaults
+            to None.
+        clean_tokenized_corpus (list, optional): Tokenized corpus for ``mallet``.
+            Defaults to None.
+        document_labels (list, optional): Document labels for ``mallet``.
+            Defaults to None.
+        output_topic_keys (str, optional): Output file of MALLET. Defaults to None.
+        output_doc_topics (str, optional): Output file of MALLET. Defaults to None.
+        callbacks (list, optional): Callables, e.g. a :class:`ConvergenceMonitor`,
+            called with the progress of ``lda``, ``native`` and ``gensim``
+            models. Training stops if one returns True. Ignored with a warning
+            by ``online`` and ``mallet``. Defaults to None.
+        initial_model (optional): A trained lda, native or Gensim model, or its
+            topic-word matrix, to warm start ``lda`` or ``native``. Defaults to None.
+        initial_vocabulary (list, optional): Types of the columns of the
+            topic-word matrix of ``initial_model``. If None, the columns are
+            assumed to match ``document_term_matrix``. Defaults to None.
+        vocabulary (list, optional): Types of the columns of ``document_term_matrix``.
+            If None, the columns of a document-term matrix designed for small
+            corpora are used. Defaults to None.
+        **kwargs: Further arguments for the model of ``implementation``, e.g.
+            ``random_state``, or ``batch_size`` for ``online``.
+
+    Returns:
+        The trained model, or None for ``mallet``, which writes its output to files.
+
+    Raises:
+        ValueError, if ``implementation`` is not supported, does not support a
+            warm start, or ``vocabulary`` is missing to align ``initial_model``.
+
+    Example:
+        >>> from dariah_topics.preprocessing import create_document_term_matrix
+        >>> tokenized_corpus = [['apple', 'pear', 'apple'], ['ship', 'sea', 'ship'], ['pear', 'apple']]
+        >>> document_term_matrix = create_document_term_matrix(tokenized_corpus, ['a', 'b', 'c'])
+        >>> model = lda(document_term_matrix, 2, iterations=10, implementation='native', random_state=1)
+        >>> model.topic_word_.shape
+        (2, 4)
+        >>> new_document_term_matrix = create_document_term_matrix(tokenized_corpus + [['sea', 'boat']],
+        ...                                                        ['a', 'b', 'c', 'd'])
+        >>> lda(new_document_term_matrix, 2, iterations=10, implementation='native', initial_model=model,
+        ...     initial_vocabulary=document_term_matrix.columns, random_state=1).topic_word_.shape
+        (2, 5)
+        >>> lda(document_term_matrix, 2, iterations=10, implementation='online', random_state=1).topic_word_.shape
+        (2, 4)
+    """
+    initial_topic_word = None
+    if initial_model is not None:
+        if implementation not in {'lda', 'native'}:
+            raise ValueError("Warm start is not supported for {}".format(implementation))
+        if vocabulary is None and isinstance(document_term_matrix, pd.DataFrame) \
+                and not isinstance(document_term_matrix.index, pd.MultiIndex):
+            vocabulary = document_term_matrix.columns
+        initial_topic_word = _get_topic_word(initial_model)
+        if initial_vocabulary is not None and vocabulary is None:
+            raise ValueError("The vocabulary of the document-term matrix is required to align the initial model")
+        elif initial_vocabulary is not None:
+            initial_topic_word = align_topic_word(initial_topic_word, initial_vocabulary, vocabulary)
+    if implementation == 'lda' and (callbacks is not None or initial_topic_word is not None):
+        model = _ExtendedLDA(n_topics=topics, n_iter=iterations, **kwargs)
+        model.fit(document_term_matrix, callbacks=callbacks, initial_topic_word=initial_topic_word)
+        return model
+    elif implementation == 'lda':
+        model = LDA(n_topics=topics, n_iter=iterations, **kwargs)
         model.fit(document_term_matrix)
         return model
+    elif implementation == 'native':
+        model = NativeLDA(n_topics=topics, n_iter=iterations, **kwargs)
+        model.fit(document_term_matrix, callbacks=callbacks, initial_topic_word=initial_topic_word)
+        return model
+    elif implementation == 'online':
+        if callbacks is not None:
+            log.warning("Callbacks are not supported for online LDA and will be ignored.")
+        batch_size = kwargs.pop('batch_size', 256)
+        model = OnlineLDA(n_topics=topics, max_iter=iterations, **kwargs)
+        model.fit(gensim_corpus if document_term_matrix is None else document_term_matrix, batch_size=batch_size)
+        return model
+    elif implementation == 'gensim' and callbacks is not None:
+        return _fit_gensim_model(gensim_corpus, type2id, topics, iterations, callbacks, **kwargs)
     elif implementation == 'gensim':
         model = LdaMulticore(corpus=gensim_corpus, id2word=type2id, num_topics=topics, iterations=iterations, **kwargs)
         return model
     elif implementation == 'mallet':
+        if callbacks is not None:
+            log.warning("Callbacks are not supported for MALLET and will be ignored.")
         Mallet = utils.Mallet(path_to_mallet)
         mallet_corpus = Mallet.import_tokenized_corpus(clean_tokenized_corpus, document_labels)
         Mallet.train_topics(mallet_corpus,
@@ -22,4 +687,844 @@ def lda(document_term_matrix, topics, iterations=1000, implementation='lda', gen
                             num_iterations=iterations,
                             **kwargs)
     else:
-        raise ValueError("{} is no supported LDA implementation".fromat(implementation))
+        raise ValueError("{} is no supported LDA implementation".format(implementation))
+
+
+def train_models(document_term_matrix, grid, implementation='native', processes=None, path=None,
+                 binary=False):
+    """Trains LDA models for a grid of parameters in parallel.
+
+    With this function you can train one model per entry of ``grid``, e.g. for \
+    different topic counts and seeds, on a pool of worker processes. The \
+    ``document_term_matrix`` is converted to a sparse matrix and placed in \
+    shared memory once, so it is neither copied nor pickled for every model. \
+    Models are yielded as soon as they are finished, i.e. not necessarily in \
+    the order of ``grid``. If ``path`` is not None, every worker saves its \
+    model with :func:`postprocessing.save_model()` as ``model_<n>.pickle`` (or \
+    the directory ``model_<n>``, if ``binary`` is True), with *n* being the \
+    position in ``grid``, and only the path is sent back. Models that could not \
+    be trained are logged with the ``dariah_topics`` logger and skipped, but \
+    errors while saving a model are raised.
+
+    Args:
+        document_term_matrix (pandas.DataFrame or scipy.sparse.spmatrix): A
+            document-term matrix.
+        grid (list): Keyword arguments for :func:`lda()`, one dictionary per
+            model, e.g. ``{'topics': 10, 'iterations': 500, 'random_state': 1}``.
+        implementation (str, optional): Either ``native`` or ``lda``, i.e. an
+            implementation working on a document-term matrix. Defaults to ``native``.
+        processes (int, optional): Number of worker processes. If None, the
+            number of CPUs is used. Defaults to None.
+        path (str, optional): Directory to save the models to. If None, the
+            models are returned. Defaults to None.
+        binary (bool, optional): If True, models are saved as separate arrays,
+            see :func:`postprocessing.save_model()`. Defaults to False.
+
+    Yields:
+        A tuple of the position in ``grid``, its parameters and the model, or
+            the path to the saved model, respectively.
+
+    Raises:
+        ValueError, if ``implementation`` does not work on a document-term matrix.
+            Errors while saving a model, e.g. :class:`OSError`, are raised as well.
+
+    Example:
+        >>> from dariah_topics.preprocessing import create_document_term_matrix
+        >>> tokenized_corpus = [['apple', 'pear', 'apple'], ['ship', 'sea', 'ship'], ['pear', 'apple']]
+        >>> document_term_matrix = create_document_term_matrix(tokenized_corpus, ['a', 'b', 'c'])
+        >>> grid = [{'topics': topics, 'iterations': 10, 'random_state': seed} for topics in [2, 3] for seed in [1, 2]]
+        >>> models = sorted(train_models(document_term_matrix, grid, processes=2), key=lambda result: result[0])
+        >>> [(n, model.topic_word_.shape) for n, _, model in models]
+        [(0, (2, 4)), (1, (2, 4)), (2, (3, 4)), (3, (3, 4))]
+        >>> import tempfile
+        >>> from dariah_topics.preprocessing import read_model
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     paths = sorted(path for _, _, path in train_models(document_term_matrix, grid[:2], processes=2,
+        ...                                                          path=tmpdir, binary=True))
+        ...     [(os.path.basename(path), read_model(path).topic_word_.shape) for path in paths]
+        [('model_0', (2, 4)), ('model_1', (2, 4))]
+    """
+    if implementation not in {'native', 'lda'}:
+        raise ValueError("{} does not work on a document-term matrix".format(implementation))
+    grid = list(grid)
+    if path is not None and not os.path.exists(path):
+        log.info("Creating directory {} ...".format(path))
+        os.makedirs(path)
+    log.info("Training {} models with {} ...".format(len(grid), implementation))
+    block, descriptor = _share_sparse_matrix(_to_sparse_matrix(document_term_matrix))
+    worker = partial(_train_model, implementation=implementation, path=path, binary=binary)
+    try:
+        with Pool(processes, initializer=_attach_sparse_matrix, initargs=(descriptor,)) as pool:
+            for n, parameters, model, error in pool.imap_unordered(worker, enumerate(grid)):
+                if error is not None:
+                    log.error("Skipping model #{} with {}, because it could not be trained: {}".format(
+                        n, parameters, error))
+                else:
+                    log.info("Finished model #{} with {}.".format(n, parameters))
+                    yield n, parameters, model
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _attach_sparse_matrix(descriptor):
+    """Attaches a sparse matrix in shared memory to a worker process.
+
+    This private function is the initializer of the pool in :func:`train_models()`.
+
+    Args:
+        descriptor (tuple): Description of the sparse matrix, as returned by
+            :func:`_share_sparse_matrix()`.
+
+    Returns:
+        None.
+    """
+    global _shared_document_term_matrix
+    name, layout, shape = descriptor
+    block = shared_memory.SharedMemory(name=name)
+    arrays = [np.ndarray(array_shape, dtype=dtype, buffer=block.buf, offset=offset)
+              for dtype, array_shape, offset in layout]
+    _shared_document_term_matrix = block, sparse.csr_matrix(tuple(arrays), shape=shape, copy=False)
+
+
+def _draw_initial_topics(words, topic_word, random_state):
+    """Draws initial topics of tokens from a topic-word matrix.
+
+    This private function is wrapped in :meth:`NativeLDA.fit()` and :class:`_ExtendedLDA`. \
+    The topic of a token is drawn proportional to the column of its type, \
+    tokens of the same type are drawn at once.
+
+    Args:
+        words (numpy.ndarray): Column index of each token.
+        topic_word (numpy.ndarray): Topic-word matrix.
+        random_state (numpy.random.RandomState): Random number generator.
+
+    Returns:
+        The topic of each token as NumPy array.
+
+    Example:
+        >>> _draw_initial_topics(np.array([1, 0, 1]), np.array([[1.0, 0.0], [0.0, 1.0]]), np.random.RandomState(0)).tolist()
+        [1, 0, 1]
+    """
+    topics = np.empty(len(words), dtype=np.int_)
+    order = np.argsort(words, kind='mergesort')
+    for tokens in np.split(order, np.flatnonzero(np.diff(words[order])) + 1):
+        if len(tokens):
+            weights = topic_word[:, words[tokens[0]]]
+            topics[tokens] = random_state.choice(len(weights), size=len(tokens), p=weights / weights.sum())
+    return topics
+
+
+def _fit_gensim_model(gensim_corpus, type2id, topics, iterations, callbacks, passes=1, **kwargs):
+    """Trains a Gensim model pass by pass and reports the variational bound.
+
+    This private function is wrapped in :func:`lda()`. After each pass, the \
+    callbacks are called with the pass as iteration and the variational bound \
+    of ``gensim_corpus`` as log likelihood.
+
+    Args:
+        gensim_corpus (list): A corpus in bag-of-words format.
+        type2id (dict): Mapping of type IDs to types.
+        topics (int): Number of topics.
+        iterations (int): Maximum number of iterations of the E-step.
+        callbacks (list): Callables, e.g. a :class:`ConvergenceMonitor`.
+        passes (int, optional): Maximum number of passes through the corpus.
+            With one pass, callbacks are called once and cannot stop training
+            early. Defaults to 1.
+
+    Returns:
+        A Gensim ``LdaMulticore`` model.
+    """
+    if passes == 1:
+        log.warning("Training Gensim with one pass, thus callbacks cannot stop training early. "
+                    "Set passes to train with more passes.")
+    num_tokens = sum(count for document in gensim_corpus for _, count in document)
+    monitor = _TrainingMonitor(callbacks, num_tokens)
+    model = LdaMulticore(corpus=gensim_corpus, id2word=type2id, num_topics=topics, iterations=iterations,
+                         passes=1, **kwargs)
+    for n in range(1, passes + 1):
+        if n > 1:
+            model.update(gensim_corpus)
+        if monitor.report(n, model.bound(gensim_corpus)):
+            break
+    return model
+
+
+def _bow_to_sparse_matrix(bow, offset=0):
+    """Converts bag-of-words documents to a sparse matrix.
+
+    This private function is wrapped in :class:`OnlineLDA`. Column *j* \
+    corresponds to the ID *j + offset*. Entries with a lower ID, e.g. the \
+    placeholders of empty documents in :func:`postprocessing.doc2bow()`, are dropped.
+
+    Args:
+        bow (list): Documents as lists of ``(id, frequency)`` tuples.
+        offset (int, optional): The ID of column 0. Defaults to 0.
+
+    Returns:
+        A sparse matrix in CSR format.
+
+    Example:
+        >>> _bow_to_sparse_matrix([[(1, 2), (0, 1)], []]).toarray()
+        array([[1, 2],
+               [0, 0]])
+    """
+    lengths, ids, counts = [], [], []
+    for document in bow:
+        document = [(id_ - offset, count) for id_, count in document if id_ >= offset]
+        lengths.append(len(document))
+        ids.extend(id_ for id_, _ in document)
+        counts.extend(count for _, count in document)
+    indptr = np.concatenate(([0], np.cumsum(lengths, dtype=np.intp)))
+    shape = (len(lengths), max(ids, default=-1) + 1)
+    matrix = sparse.csr_matrix((np.asarray(counts, dtype=np.intp), np.asarray(ids, dtype=np.intp), indptr),
+                               shape=shape)
+    matrix.sum_duplicates()
+    return matrix
+
+
+@njit(cache=True)
+def _build_alias_table(weights, probabilities, aliases):
+    """Builds an alias table with Vose's method.
+
+    This private function is wrapped in :func:`_build_word_alias_table()` and \
+    :func:`_sweep_metropolis_hastings()`. The table is written to \
+    ``probabilities`` and ``aliases``, thus rebuilding it allocates no new \
+    arrays but a stack of small and large entries.
+
+    Args:
+        weights (numpy.ndarray): Positive, unnormalized weights.
+        probabilities (numpy.ndarray): Acceptance probabilities of the table.
+        aliases (numpy.ndarray): Aliases of the table.
+
+    Returns:
+        None.
+
+    Example:
+        >>> probabilities, aliases = np.zeros(2), np.zeros(2, dtype=np.int64)
+        >>> _build_alias_table(np.array([1.0, 3.0]), probabilities, aliases)
+        >>> probabilities.tolist(), aliases.tolist()
+        ([0.5, 1.0], [1, 1])
+    """
+    size = len(weights)
+    scale = size / weights.sum()
+    stack = np.empty(size, dtype=np.int64)
+    n_small, n_large = 0, 0
+    for index in range(size):
+        probabilities[index] = weights[index] * scale
+        aliases[index] = index
+        if probabilities[index] < 1:
+            stack[n_small] = index
+            n_small += 1
+        else:
+            n_large += 1
+            stack[size - n_large] = index
+    while n_small > 0 and n_large > 0:
+        n_small -= 1
+        less, more = stack[n_small], stack[size - n_large]
+        n_large -= 1
+        aliases[less] = more
+        probabilities[more] -= 1 - probabilities[less]
+        if probabilities[more] < 1:
+            stack[n_small] = more
+            n_small += 1
+        else:
+            n_large += 1
+            stack[size - n_large] = more
+    for index in range(n_small):
+        probabilities[stack[index]] = 1.0
+    for index in range(size - n_large, size):
+        probabilities[stack[index]] = 1.0
+
+
+@njit(cache=True)
+def _build_word_alias_table(word, nwz, nz, eta_sum, word_indptr, word_topics, word_nnz, table_topics, table_weights,
+                            table_probabilities, table_aliases, table_sizes, table_sums):
+    """Builds the alias table of a type over its non-zero topics.
+
+    This private function is wrapped in :func:`_sweep_metropolis_hastings()`. \
+    The table of type *w* is stored in the segment of *w* given by \
+    ``word_indptr``, with the topics in ascending order, and is built from \
+    ``nwz / (nz + V * eta)``. The *smoothing* part ``eta / (nz + V * eta)`` \
+    of the word proposal is shared by all types.
+
+    Returns:
+        None.
+
+    Example:
+        >>> nwz, nz = np.array([[0, 1, 3]]), np.array([2, 1, 3])
+        >>> indptr, word_topics, word_nnz = _index_word_topics(nwz)
+        >>> tables = np.zeros(3, dtype=np.int64), np.zeros(3), np.zeros(3), np.zeros(3, dtype=np.int64)
+        >>> sizes, sums = np.zeros(1, dtype=np.int64), np.zeros(1)
+        >>> _build_word_alias_table(0, nwz, nz, 1.0, indptr, word_topics, word_nnz, *tables, sizes, sums)
+        >>> tables[0][:sizes[0]].tolist(), tables[1][:sizes[0]].tolist(), float(sums[0])
+        ([1, 2], [0.5, 0.75], 1.25)
+    """
+    start = word_indptr[word]
+    size = word_nnz[word]
+    stop = start + size
+    table_topics[start:stop] = word_topics[start:stop]
+    table_topics[start:stop].sort()
+    table_sum = 0.0
+    for index in range(start, stop):
+        topic = table_topics[index]
+        table_weights[index] = nwz[word, topic] / (nz[topic] + eta_sum)
+        table_sum += table_weights[index]
+    if size > 0:
+        _build_alias_table(table_weights[start:stop], table_probabilities[start:stop], table_aliases[start:stop])
+    table_sizes[word] = size
+    table_sums[word] = table_sum
+
+
+def _check_topic_word(topic_word, n_topics, vocab_size):
+    """Checks the shape of an initial topic-word matrix.
+
+    This private function is wrapped in :meth:`NativeLDA.fit()` and :class:`_ExtendedLDA`.
+
+    Returns:
+        The topic-word matrix as NumPy array.
+
+    Raises:
+        ValueError, if the shape does not match the number of topics and types.
+    """
+    topic_word = np.asarray(topic_word, dtype=float)
+    if topic_word.shape != (n_topics, vocab_size):
+        raise ValueError("The initial topic-word matrix has shape {}, but {} topics and {} types are "
+                         "required. Use align_topic_word() for a changed vocabulary.".format(
+                             topic_word.shape, n_topics, vocab_size))
+    return topic_word
+
+
+class _ExtendedLDA(LDA):
+    """A lda model with callbacks and warm start.
+
+    This private class is used by :func:`lda()` if callbacks or an initial \
+    model are passed. It replicates the training loop of ``lda.LDA`` (versions \
+    1.0.5 to 3.0, see ``setup.py``) and stops it, if a callback returns True. With ``initial_topic_word``, the initial \
+    topics are drawn as in :meth:`NativeLDA.fit()`.
+    """
+    def fit(self, X, y=None, callbacks=None, initial_topic_word=None):
+        self._fit(X, callbacks, initial_topic_word)
+        return self
+
+    def _fit(self, X, callbacks=None, initial_topic_word=None):
+        random_state = check_random_state(self.random_state)
+        rands = self._rands.copy()
+        self._initialize(X)
+        if initial_topic_word is not None:
+            topic_word = _check_topic_word(initial_topic_word, self.n_topics, self.nzw_.shape[1])
+            self.ZS[:] = _draw_initial_topics(self.WS, topic_word, random_state)
+            for counts, indices in [(self.nzw_, (self.ZS, self.WS)), (self.ndz_, (self.DS, self.ZS)),
+                                    (self.nz_, (self.ZS,))]:
+                counts[...] = 0
+                np.add.at(counts, indices, 1)
+        monitor = _TrainingMonitor(callbacks, len(self.WS))
+        self.n_iter_ = self.n_iter
+        for iteration in range(self.n_iter):
+            random_state.shuffle(rands)
+            if iteration % self.refresh == 0:
+                self.loglikelihoods_.append(self.loglikelihood())
+                if monitor.report(iteration, self.loglikelihoods_[-1]):
+                    self.n_iter_ = iteration
+                    break
+            self._sample_topics(rands)
+        else:
+            monitor.report(self.n_iter - 1, self.loglikelihood())
+        self.components_ = (self.nzw_ + self.eta).astype(float)
+        self.components_ /= np.sum(self.components_, axis=1)[:, np.newaxis]
+        self.topic_word_ = self.components_
+        self.doc_topic_ = (self.ndz_ + self.alpha).astype(float)
+        self.doc_topic_ /= np.sum(self.doc_topic_, axis=1)[:, np.newaxis]
+        del self.WS
+        del self.DS
+        del self.ZS
+        return self
+
+
+@njit(cache=True)
+def _get_table_weight(table_topics, table_weights, offset, size, topic):
+    """Looks up the weight of a topic in the alias table of a type.
+
+    This private function is wrapped in :func:`_sweep_metropolis_hastings()`. \
+    The topics of the table are in ascending order, thus the lookup is a \
+    binary search.
+
+    Returns:
+        The weight of the topic, or 0, if the topic is not in the table.
+
+    Example:
+        >>> float(_get_table_weight(np.array([1, 2]), np.array([0.5, 0.75]), 0, 2, 2))
+        0.75
+    """
+    low, high = offset, offset + size
+    while low < high:
+        middle = (low + high) // 2
+        if table_topics[middle] < topic:
+            low = middle + 1
+        else:
+            high = middle
+    if low < offset + size and table_topics[low] == topic:
+        return table_weights[low]
+    return 0.0
+
+
+def _get_topic_word(model):
+    """Gets the topic-word matrix of a model.
+
+    This private function is wrapped in :func:`lda()`.
+
+    Args:
+        model: A lda, native or Gensim model, or a topic-word matrix.
+
+    Returns:
+        The topic-word matrix as NumPy array.
+    """
+    if hasattr(model, 'topic_word_'):
+        return np.asarray(model.topic_word_)
+    elif hasattr(model, 'get_topics'):
+        return model.get_topics()
+    else:
+        return np.asarray(model)
+
+
+@njit(cache=True)
+def _index_word_topics(nwz):
+    """Lists the non-zero topics of each type.
+
+    This private function is wrapped in :meth:`NativeLDA._initialize()`. The \
+    list of type *w* has room for ``min(n_topics, frequency of w)`` topics, \
+    which is the maximum number of non-zero topics of the type.
+
+    Args:
+        nwz (numpy.ndarray): Number of tokens of each type assigned to each topic.
+
+    Returns:
+        The start of each list, followed by the total size, the lists as one
+            NumPy array, and the number of non-zero topics of each type.
+
+    Example:
+        >>> indptr, word_topics, word_nnz = _index_word_topics(np.array([[0, 2], [1, 0]]))
+        >>> indptr.tolist(), word_topics.tolist(), word_nnz.tolist()
+        ([0, 2, 3], [1, 0, 0], [1, 1])
+    """
+    vocab_size, n_topics = nwz.shape
+    indptr = np.zeros(vocab_size + 1, dtype=np.int64)
+    for word in range(vocab_size):
+        indptr[word + 1] = indptr[word] + min(n_topics, nwz[word].sum())
+    word_topics = np.zeros(indptr[-1], dtype=np.int64)
+    word_nnz = np.zeros(vocab_size, dtype=np.int64)
+    for word in range(vocab_size):
+        for topic in range(n_topics):
+            if nwz[word, topic] > 0:
+                word_topics[indptr[word] + word_nnz[word]] = topic
+                word_nnz[word] += 1
+    return indptr, word_topics, word_nnz
+
+
+@njit(cache=True)
+def _remove_word_topic(word_indptr, word_topics, word_nnz, word, topic):
+    """Removes a topic from the non-zero topics of a type.
+
+    This private function is wrapped in the sampling loops of :class:`NativeLDA`. \
+    The last topic of the list takes the place of the removed one.
+    """
+    start = word_indptr[word]
+    last = start + word_nnz[word] - 1
+    for index in range(start, last + 1):
+        if word_topics[index] == topic:
+            word_topics[index] = word_topics[last]
+            word_nnz[word] -= 1
+            break
+
+
+def _share_sparse_matrix(matrix):
+    """Copies the arrays of a sparse matrix into one block of shared memory.
+
+    This private function is wrapped in :func:`train_models()`.
+
+    Args:
+        matrix (scipy.sparse.csr_matrix): A sparse matrix.
+
+    Returns:
+        A tuple of the shared memory block, which has to be unlinked by the
+            caller, and a picklable description of the matrix.
+
+    Example:
+        >>> block, descriptor = _share_sparse_matrix(sparse.csr_matrix([[1, 0], [0, 2]]))
+        >>> descriptor[2]
+        (2, 2)
+        >>> block.close(); block.unlink()
+    """
+    arrays = [matrix.data, matrix.indices, matrix.indptr]
+    block = shared_memory.SharedMemory(create=True, size=max(sum(array.nbytes for array in arrays), 1))
+    layout = []
+    offset = 0
+    for array in arrays:
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf, offset=offset)[:] = array
+        layout.append((array.dtype.str, array.shape, offset))
+        offset += array.nbytes
+    return block, (block.name, layout, matrix.shape)
+
+
+@njit(cache=True)
+def _sweep_metropolis_hastings(words, topics, indptr, nwz, ndz, nz, word_indptr, word_topics, word_nnz, table_topics,
+                               table_weights, table_probabilities, table_aliases, table_sizes, table_sums, alpha,
+                               eta, mh_steps, seed):
+    """Samples all topic assignments once with alias-table Metropolis-Hastings steps.
+
+    This private function is wrapped in :meth:`NativeLDA._sample_topics_metropolis_hastings()` \
+    and updates all arrays in place. The word proposal of type *w* is the \
+    mixture of the alias table of *w* over its non-zero topics, see \
+    :func:`_build_word_alias_table()`, which is built when the sweep starts, \
+    and an alias table of the smoothing part, which is rebuilt after \
+    ``n_topics`` draws. Both tables are stale within the sweep, but both proposals \
+    are independent of the current topic of a token, thus the acceptance ratio \
+    is p(t) q(s) / (p(s) q(t)) for the current topic *s*, the proposed topic \
+    *t*, the collapsed conditional *p* and the proposal distribution *q*.
+
+    Args:
+        words (numpy.ndarray): Column index of each token.
+        topics (numpy.ndarray): Topic of each token.
+        indptr (numpy.ndarray): Start of each document, followed by the number
+            of tokens.
+        nwz (numpy.ndarray): Number of tokens of each type assigned to each topic.
+        ndz (numpy.ndarray): Number of tokens of each document assigned to each topic.
+        nz (numpy.ndarray): Number of tokens assigned to each topic.
+        word_indptr (numpy.ndarray): Start of the non-zero topics of each type,
+            see :func:`_index_word_topics()`.
+        word_topics (numpy.ndarray): Non-zero topics of all types.
+        word_nnz (numpy.ndarray): Number of non-zero topics of each type.
+        table_topics (numpy.ndarray): Topics of the alias tables of all types.
+        table_weights (numpy.ndarray): Unnormalized weights of the alias tables.
+        table_probabilities (numpy.ndarray): Acceptance probabilities of the
+            alias tables.
+        table_aliases (numpy.ndarray): Aliases of the alias tables.
+        table_sizes (numpy.ndarray): Number of topics of each alias table.
+        table_sums (numpy.ndarray): Sum of the weights of each alias table.
+        alpha (float): Dirichlet parameter for distribution over topics.
+        eta (float): Dirichlet parameter for distribution over words.
+        mh_steps (int): Number of Metropolis-Hastings steps per token.
+        seed (int): Seed of the random number generator.
+
+    Returns:
+        None.
+    """
+    np.random.seed(seed)
+    n_topics = nz.shape[0]
+    eta_sum = eta * nwz.shape[0]
+    alpha_sum = alpha * n_topics
+    smoothing_weights = np.zeros(n_topics)
+    smoothing_probabilities = np.zeros(n_topics)
+    smoothing_aliases = np.zeros(n_topics, dtype=np.int64)
+    smoothing_sum = 0.0
+    smoothing_draws = n_topics
+    for word in range(nwz.shape[0]):
+        _build_word_alias_table(word, nwz, nz, eta_sum, word_indptr, word_topics, word_nnz, table_topics,
+                                table_weights, table_probabilities, table_aliases, table_sizes, table_sums)
+    for document in range(len(indptr) - 1):
+        start, stop = indptr[document], indptr[document + 1]
+        length = stop - start
+        document_counts = ndz[document]
+        for token in range(start, stop):
+            word = words[token]
+            topic = initial = topics[token]
+            document_counts[topic] -= 1
+            nwz[word, topic] -= 1
+            nz[topic] -= 1
+            if nwz[word, topic] == 0:
+                _remove_word_topic(word_indptr, word_topics, word_nnz, word, topic)
+            for _ in range(mh_steps):
+                if smoothing_draws >= n_topics:
+                    for candidate in range(n_topics):
+                        smoothing_weights[candidate] = eta / (nz[candidate] + eta_sum)
+                    smoothing_sum = smoothing_weights.sum()
+                    _build_alias_table(smoothing_weights, smoothing_probabilities, smoothing_aliases)
+                    smoothing_draws = 0
+                offset, size = word_indptr[word], table_sizes[word]
+                u = np.random.random() * (table_sums[word] + smoothing_sum)
+                if u < table_sums[word]:
+                    u *= size / table_sums[word]
+                    index = offset + min(int(u), size - 1)
+                    if u - int(u) >= table_probabilities[index]:
+                        index = offset + table_aliases[index]
+                    proposal = table_topics[index]
+                else:
+                    smoothing_draws += 1
+                    u = (u - table_sums[word]) * n_topics / smoothing_sum
+                    proposal = min(int(u), n_topics - 1)
+                    if u - proposal >= smoothing_probabilities[proposal]:
+                        proposal = smoothing_aliases[proposal]
+                if proposal != topic:
+                    current_weight = smoothing_weights[topic] \
+                        + _get_table_weight(table_topics, table_weights, offset, size, topic)
+                    proposal_weight = smoothing_weights[proposal] \
+                        + _get_table_weight(table_topics, table_weights, offset, size, proposal)
+                    ratio = ((document_counts[proposal] + alpha) * (nwz[word, proposal] + eta)
+                             * (nz[topic] + eta_sum) * current_weight) \
+                        / ((document_counts[topic] + alpha) * (nwz[word, topic] + eta)
+                           * (nz[proposal] + eta_sum) * proposal_weight)
+                    if np.random.random() < ratio:
+                        topic = proposal
+                u = np.random.random() * (length + alpha_sum)
+                if u < length:
+                    proposal = topics[start + int(u)]
+                else:
+                    proposal = min(int((u - length) / alpha), n_topics - 1)
+                if proposal != topic:
+                    ratio = ((document_counts[proposal] + alpha) * (nwz[word, proposal] + eta)
+                             * (nz[topic] + eta_sum) * (document_counts[topic] + alpha + (topic == initial))) \
+                        / ((document_counts[topic] + alpha) * (nwz[word, topic] + eta)
+                           * (nz[proposal] + eta_sum) * (document_counts[proposal] + alpha + (proposal == initial)))
+                    if np.random.random() < ratio:
+                        topic = proposal
+            document_counts[topic] += 1
+            nwz[word, topic] += 1
+            nz[topic] += 1
+            if nwz[word, topic] == 1:
+                word_topics[word_indptr[word] + word_nnz[word]] = topic
+                word_nnz[word] += 1
+            topics[token] = topic
+
+
+@njit(cache=True)
+def _sweep_sparse(words, topics, indptr, nwz, ndz, nz, word_indptr, word_topics, word_nnz, alpha, eta, seed):
+    """Samples all topic assignments once with the SparseLDA buckets.
+
+    This private function is wrapped in :meth:`NativeLDA._sample_topics_sparse()` \
+    and updates all arrays in place. The masses of the smoothing and the \
+    document bucket are updated incrementally, the topic word bucket is \
+    computed for the non-zero topics of the type only. The non-zero topics of \
+    a document are collected when sampling of the document starts.
+
+    Args:
+        words (numpy.ndarray): Column index of each token.
+        topics (numpy.ndarray): Topic of each token.
+        indptr (numpy.ndarray): Start of each document, followed by the number
+            of tokens.
+        nwz (numpy.ndarray): Number of tokens of each type assigned to each topic.
+        ndz (numpy.ndarray): Number of tokens of each document assigned to each topic.
+        nz (numpy.ndarray): Number of tokens assigned to each topic.
+        word_indptr (numpy.ndarray): Start of the non-zero topics of each type,
+            see :func:`_index_word_topics()`.
+        word_topics (numpy.ndarray): Non-zero topics of all types.
+        word_nnz (numpy.ndarray): Number of non-zero topics of each type.
+        alpha (float): Dirichlet parameter for distribution over topics.
+        eta (float): Dirichlet parameter for distribution over words.
+        seed (int): Seed of the random number generator.
+
+    Returns:
+        None.
+    """
+    np.random.seed(seed)
+    n_topics = nz.shape[0]
+    eta_sum = eta * nwz.shape[0]
+    inverse = 1.0 / (nz + eta_sum)
+    document_topics = np.zeros(n_topics, dtype=np.int64)
+    positions = np.full(n_topics, -1, dtype=np.int64)
+    topic_word_mass = np.zeros(n_topics)
+    for document in range(len(indptr) - 1):
+        start, stop = indptr[document], indptr[document + 1]
+        if start == stop:
+            continue
+        document_counts = ndz[document]
+        n_document_topics = 0
+        for token in range(start, stop):
+            topic = topics[token]
+            if positions[topic] < 0:
+                positions[topic] = n_document_topics
+                document_topics[n_document_topics] = topic
+                n_document_topics += 1
+        smoothing_sum = alpha * eta * inverse.sum()
+        document_sum = 0.0
+        for index in range(n_document_topics):
+            topic = document_topics[index]
+            document_sum += document_counts[topic] * eta * inverse[topic]
+        for token in range(start, stop):
+            word, topic = words[token], topics[token]
+            for change in (-1, 1):
+                if change == 1:
+                    offset = word_indptr[word]
+                    topic_word_sum = 0.0
+                    for index in range(word_nnz[word]):
+                        candidate = word_topics[offset + index]
+                        topic_word_sum += (alpha + document_counts[candidate]) * inverse[candidate] \
+                            * nwz[word, candidate]
+                        topic_word_mass[index] = topic_word_sum
+                    u = np.random.random() * (topic_word_sum + document_sum + smoothing_sum)
+                    if u < topic_word_sum:
+                        index = 0
+                        while index < word_nnz[word] - 1 and topic_word_mass[index] <= u:
+                            index += 1
+                        topic = word_topics[offset + index]
+                    elif u < topic_word_sum + document_sum and n_document_topics > 0:
+                        u -= topic_word_sum
+                        topic = document_topics[n_document_topics - 1]
+                        for index in range(n_document_topics):
+                            u -= document_counts[document_topics[index]] * eta * inverse[document_topics[index]]
+                            if u < 0:
+                                topic = document_topics[index]
+                                break
+                    else:
+                        u -= topic_word_sum + document_sum
+                        topic = n_topics - 1
+                        for candidate in range(n_topics):
+                            u -= alpha * eta * inverse[candidate]
+                            if u < 0:
+                                topic = candidate
+                                break
+                smoothing_sum -= alpha * eta * inverse[topic]
+                document_sum -= document_counts[topic] * eta * inverse[topic]
+                document_counts[topic] += change
+                nwz[word, topic] += change
+                nz[topic] += change
+                inverse[topic] = 1.0 / (nz[topic] + eta_sum)
+                smoothing_sum += alpha * eta * inverse[topic]
+                document_sum += document_counts[topic] * eta * inverse[topic]
+                if change == -1 and nwz[word, topic] == 0:
+                    _remove_word_topic(word_indptr, word_topics, word_nnz, word, topic)
+                elif change == 1 and nwz[word, topic] == 1:
+                    word_topics[word_indptr[word] + word_nnz[word]] = topic
+                    word_nnz[word] += 1
+                if change == -1 and document_counts[topic] == 0:
+                    n_document_topics -= 1
+                    last = document_topics[n_document_topics]
+                    document_topics[positions[topic]] = last
+                    positions[last] = positions[topic]
+                    positions[topic] = -1
+                elif change == 1 and document_counts[topic] == 1:
+                    positions[topic] = n_document_topics
+                    document_topics[n_document_topics] = topic
+                    n_document_topics += 1
+            topics[token] = topic
+        for index in range(n_document_topics):
+            positions[document_topics[index]] = -1
+
+
+def _to_batch_matrix(batch):
+    """Converts a mini-batch of :class:`OnlineLDA` to a sparse matrix.
+
+    This private function is wrapped in :class:`OnlineLDA`.
+
+    Args:
+        batch: Documents in one of the formats of :meth:`OnlineLDA.partial_fit()`.
+
+    Returns:
+        A sparse matrix in CSR format.
+    """
+    if isinstance(batch, tuple):
+        batch = batch[0]
+    if isinstance(batch, pd.Series):
+        return _bow_to_sparse_matrix(batch, offset=1)
+    elif isinstance(batch, pd.DataFrame) or sparse.issparse(batch):
+        return _to_sparse_matrix(batch)
+    else:
+        return _bow_to_sparse_matrix(batch)
+
+
+def _to_sparse_matrix(document_term_matrix):
+    """Converts a document-term matrix to a sparse matrix with integer counts.
+
+    This private function is wrapped in :meth:`NativeLDA.fit()`. For a large \
+    corpus model, row *i* corresponds to document ID *i + 1* and column *j* to \
+    type ID *j + 1*, as for the sparse variant.
+
+    Args:
+        document_term_matrix (pandas.DataFrame or scipy.sparse.spmatrix): A
+            document-term matrix.
+
+    Returns:
+        A sparse matrix in CSR format.
+
+    Raises:
+        ValueError, if ``document_term_matrix`` contains non-integer or negative counts.
+
+    Example:
+        >>> index = pd.MultiIndex.from_tuples([(1, 2), (1, 1), (2, 0)], names=['document_id', 'type_id'])
+        >>> document_term_matrix = pd.DataFrame([3, 1, 0], index=index)
+        >>> _to_sparse_matrix(document_term_matrix).toarray()
+        array([[1, 3],
+               [0, 0]])
+    """
+    if sparse.issparse(document_term_matrix):
+        matrix = sparse.csr_matrix(document_term_matrix)
+    elif isinstance(document_term_matrix.index, pd.MultiIndex):
+        document_id = document_term_matrix.index.get_level_values('document_id').values
+        type_id = document_term_matrix.index.get_level_values('type_id').values
+        count = document_term_matrix[0].values
+        nonzero = (count != 0) & (type_id > 0)
+        shape = (document_id.max(initial=0), type_id.max(initial=0))
+        matrix = sparse.csr_matrix((count[nonzero], (document_id[nonzero] - 1, type_id[nonzero] - 1)), shape=shape)
+    else:
+        matrix = sparse.csr_matrix(document_term_matrix.values)
+    matrix.sum_duplicates()
+    matrix.eliminate_zeros()
+    if np.any(matrix.data < 0) or np.any(matrix.data != np.rint(matrix.data)):
+        raise ValueError("The document-term matrix must contain non-negative integer counts.")
+    matrix.data = matrix.data.astype(np.intp, copy=False)
+    return matrix
+
+
+class _TrainingMonitor:
+    """Logs the log likelihood and time per iteration, and calls callbacks.
+
+    This private class is used by :meth:`NativeLDA.fit()`, :class:`_ExtendedLDA` \
+    and :func:`_fit_gensim_model()`.
+
+    Example:
+        >>> monitor = _TrainingMonitor([ConvergenceMonitor(window=1, tolerance=0.5)], 10)
+        >>> monitor.report(0, -100.0), monitor.report(10, -90.0)
+        (False, True)
+    """
+    def __init__(self, callbacks, num_tokens):
+        self.callbacks = callbacks or []
+        self.num_tokens = num_tokens
+        self.iteration = 0
+        self.timer = time.perf_counter()
+
+    def report(self, iteration, loglikelihood):
+        """Reports the log likelihood of an iteration.
+
+        Returns:
+            True, if any callback returns True.
+        """
+        now = time.perf_counter()
+        seconds = (now - self.timer) / max(iteration - self.iteration, 1)
+        self.iteration, self.timer = iteration, now
+        perplexity = float(np.exp(-loglikelihood / self.num_tokens)) if self.num_tokens else float('nan')
+        log.info("<{}> log likelihood: {:.0f}, perplexity: {:.1f}, {:.3f}s per iteration".format(
+            iteration, loglikelihood, perplexity, seconds))
+        stop = False
+        for callback in self.callbacks:
+            stop = bool(callback(iteration, loglikelihood, perplexity, seconds)) or stop
+        if stop:
+            log.info("Stopping training after iteration {}.".format(iteration))
+        return stop
+
+
+def _train_model(task, implementation, path, binary):
+    """Trains a LDA model on the shared document-term matrix in a worker process.
+
+    This private function is wrapped in :func:`train_models()`. Exceptions \
+    while training are not raised in the worker, but returned to the calling \
+    process. Exceptions while saving are raised.
+
+    Args:
+        task (tuple): Position in the grid and keyword arguments for :func:`lda()`.
+        implementation (str): Either ``native`` or ``lda``.
+        path (str): Directory to save the model to. If None, the model is returned.
+        binary (bool): If True, the model is saved as separate arrays.
+
+    Returns:
+        A tuple of the position, the parameters, the model or its path (or None)
+            and an error message (or None).
+    """
+    n, parameters = task
+    try:
+        model = lda(_shared_document_term_matrix[1], implementation=implementation, **parameters)
+    except Exception as error:
+        return n, parameters, None, "{}: {}".format(type(error).__name__, error)
+    if path is not None:
+        filepath = os.path.join(path, 'model_{}'.format(n) if binary else 'model_{}.pickle'.format(n))
+        postprocessing.save_model(model, filepath, binary=binary)
+        model = filepath
+    return n, parameters, model, None
@@ -22,22 +22,30 @@ Recurrent variable names are based on the following conventions:
 Contents
 ********
     * :func:`doc2bow()`
+    * :func:`save_encoded_corpus()` writes a tokenized corpus as one contiguous \
+    binary array of type IDs, which can be memory-mapped by :func:`preprocessing.read_encoded_corpus()`.
     * :func:`save_document_term_matrix()` writes a document-term matrix to a `CSV <https://en.wikipedia.org/wiki/Comma-separated_values>`_
-    file or to a `Matrix Market <http://math.nist.gov/MatrixMarket/formats.html#MMformat>`_ file, respectively.
+    file, to a `Matrix Market <http://math.nist.gov/MatrixMarket/formats.html#MMformat>`_ file \
+    or to a binary NPZ file, respectively.
     * :func:`save_model()` saves a LDA model (except MALLET models, which will be saved \
-    by specifying a parameter of :func:`mallet.create_mallet_model()`).
+    by specifying a parameter of :func:`mallet.create_mallet_model()`), either pickled \
+    or as separate arrays, which can be memory-mapped by :func:`preprocessing.read_model()`.
     * :func:`save_tokenized_corpus()` writes tokens of a tokenized corpus to plain text \
     files per document.
     * :func:`show_document_topics()` shows topic probabilities for each document.
     * :func:`show_topics()` shows topics generated by a LDA model.
     * :func:`show_word_weights()` shows word probabilities for each topic.
 """
+import csv
 import itertools
+import json
 import operator
 import os
 import numpy as np
 import pandas as pd
 import pickle
+from scipy import sparse
+from dariah_topics import preprocessing
 import logging
 
 log = logging.getLogger('dariah_topics')
@@ -74,16 +82,98 @@ def doc2bow(document_term_matrix):
     return doc2bow
 
 
-def save_document_term_matrix(document_term_matrix, path, document_ids=None, type_ids=None, matrix_market=False):
+def save_encoded_corpus(tokenized_corpus, document_labels, path, type_ids=None):
+    """Saves a tokenized corpus in a binary, integer-encoded format.
+
+    With this function you can write a ``tokenized_corpus`` to ``path`` as \
+    one contiguous array of type IDs (``tokens.bin``, unsigned 32-bit integers), \
+    the start offset of each document (``offsets.npy``), the ``type_ids`` \
+    (``type_ids.csv``) and the ``document_labels`` (``document_labels.txt``). \
+    Documents are encoded and written one after another, so the corpus does not \
+    have to fit into memory. A ``tokenized_document`` may also be an array of \
+    type IDs, e.g. produced by :class:`preprocessing.Tokenizer`. Use the function \
+    :func:`preprocessing.read_encoded_corpus()` to memory-map the corpus. \
+    Arrays of type IDs can only be written together with the ``type_ids`` \
+    they were encoded with.
+
+    Args:
+        tokenized_corpus (list): Tokenized corpus containing one or more
+            iterables containing tokens.
+        document_labels (list): Name of each `tokenized_document` in `tokenized_corpus`.
+        path (str): Path to the output directory.
+        type_ids (dict, optional): A dictionary with types as key and identifiers
+            as values. Unknown tokens will be added. Defaults to None.
+
+    Returns:
+        ``type_ids``.
+
+    Raises:
+        ValueError, if a ``tokenized_document`` is an array of type IDs, but
+            ``type_ids`` is None.
+
+    Example:
+        >>> import tempfile
+        >>> from dariah_topics import preprocessing
+        >>> tokenized_corpus = [['this', 'is', 'document', 'one'], ['this', 'is', 'document', 'two']]
+        >>> document_labels = ['document_one', 'document_two']
+        >>> with tempfile.TemporaryDirectory() as path:
+        ...     save_encoded_corpus(tokenized_corpus, document_labels, path)
+        ...     preprocessing.read_encoded_corpus(path)[1].tolist()
+        {'this': 1, 'is': 2, 'document': 3, 'one': 4, 'two': 5}
+        [1, 2, 3, 5]
+        >>> with tempfile.TemporaryDirectory() as path:
+        ...     save_encoded_corpus([np.array([1, 2])], ['document'], path)
+        Traceback (most recent call last):
+            ...
+        ValueError: Unable to save document, because an array of type IDs requires type_ids.
+    """
+    log.info("Saving encoded corpus to {} ...".format(path))
+    if not os.path.exists(path):
+        log.info("Creating directory {} ...".format(path))
+        os.makedirs(path)
+    has_type_ids = type_ids is not None
+    if type_ids is None:
+        type_ids = {}
+
+    offsets = [0]
+    with open(os.path.join(path, 'tokens.bin'), 'wb') as tokens_file, \
+         open(os.path.join(path, 'document_labels.txt'), 'w', encoding='utf-8') as labels_file:
+        for tokenized_document, document_label in zip(tokenized_corpus, document_labels):
+            log.debug("Current document: {}".format(document_label))
+            if isinstance(tokenized_document, np.ndarray) and tokenized_document.dtype.kind in 'iu':
+                if not has_type_ids:
+                    raise ValueError("Unable to save {}, because an array of type IDs requires type_ids.".format(document_label))
+                encoded_document = tokenized_document.astype(np.uint32)
+            else:
+                encoded_document = np.fromiter(preprocessing._encode_tokens(tokenized_document, type_ids), dtype=np.uint32)
+            tokens_file.write(encoded_document.tobytes())
+            labels_file.write('{}\n'.format(document_label))
+            offsets.append(offsets[-1] + len(encoded_document))
+
+    np.save(os.path.join(path, 'offsets.npy'), np.array(offsets, dtype=np.int64))
+    with open(os.path.join(path, 'type_ids.csv'), 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        for type_, id_ in type_ids.items():
+            writer.writerow([id_, type_])
+    return type_ids
+
+
+def save_document_term_matrix(document_term_matrix, path, document_ids=None, type_ids=None, matrix_market=False,
+                              binary=False):
     """Saves document-term matrix.
     
     Writes a ``document_term_matrix`` and, in case of a large corpus matrix, \
     ``document_ids`` and ``type_ids``, which have to be specified, to comma-separated \
     values (CSV) files. Furthermore, if ``document_term_matrix`` is designed for \
-    large corpora and ``matrix_market`` is True, the matrix will be saved in the \
+    large corpora or a sparse matrix and ``matrix_market`` is True, the matrix will be saved in the \
     `Matrix Market format <http://math.nist.gov/MatrixMarket/formats.html#MMformat>`_ (`.mm`). \
     Libraries like `scipy <https://www.scipy.org>`_ and `gensim <https://radimrehurek.com/gensim/>`_ \
-    are able to read and process the Matrix Market format.
+    are able to read and process the Matrix Market format. If ``binary`` is True, \
+    the non-zero values of any variant of ``document_term_matrix``, including \
+    sparse matrices, are saved as compressed NumPy arrays (`.npz`), together \
+    with ``document_ids`` and ``type_ids``, if specified. This avoids formatting \
+    and parsing millions of numbers as strings, but the arrays are decompressed \
+    into memory when reading, i.e. the file cannot be memory-mapped.
     Use the function :func:`preprocessing.create_document_term_matrix()` to create a
     document-term matrix.
 
@@ -105,6 +195,9 @@ def save_document_term_matrix(document_term_matrix, path, document_ids=None, typ
         matrix_market (bool, optional): If True, matrix will be saved in Matrix
             Market format. Only for the large corpus variant of ``document_term_matrix``
             available. Defaults to False.
+        binary (bool, optional): If True, matrix will be saved as
+            ``document_term_matrix.npz``. Use :func:`preprocessing.read_document_term_matrix()`
+            to read it. Defaults to False.
 
     Returns:
         None.
@@ -125,14 +218,21 @@ def save_document_term_matrix(document_term_matrix, path, document_ids=None, typ
         >>> save_document_term_matrix(document_term_matrix, path, document_ids, type_ids)
         >>> isinstance(preprocessing.read_document_term_matrix(os.path.join(path, 'document_term_matrix.csv')), pd.DataFrame)
         True
+        >>> save_document_term_matrix(document_term_matrix, path, document_ids, type_ids, binary=True)
+        >>> from dariah_topics.preprocessing import read_document_term_matrix
+        >>> read_document_term_matrix(os.path.join(path, 'document_term_matrix.npz')).equals(document_term_matrix)
+        True
     """
     if not os.path.exists(path):
         log.info("Creating directory {} ...".format(path))
         os.makedirs(path)
+    if binary:
+        _save_binary_document_term_matrix(document_term_matrix, path, document_ids, type_ids)
+        return None
     if not matrix_market:
         log.info("Saving document_term_matrix.csv to {} ...".format(path))
         document_term_matrix.to_csv(os.path.join(path, 'document_term_matrix.csv'))
-    if isinstance(document_term_matrix.index, pd.MultiIndex) and not matrix_market:
+    if not matrix_market and isinstance(document_term_matrix.index, pd.MultiIndex):
         if document_ids and type_ids is not None:
             log.info("Saving document_ids.csv to {} ...".format(path))
             pd.Series(document_ids).to_csv(os.path.join(path, 'document_ids.csv'))
@@ -140,36 +240,60 @@ def save_document_term_matrix(document_term_matrix, path, document_ids=None, typ
             pd.Series(type_ids).to_csv(os.path.join(path, 'type_ids.csv'))
         else:
             raise ValueError("You have to pass document_ids and type_ids as parameters.")
-    elif isinstance(document_term_matrix.index, pd.MultiIndex) and matrix_market:
+    elif matrix_market and (sparse.issparse(document_term_matrix) or isinstance(document_term_matrix.index, pd.MultiIndex)):
         _save_matrix_market(document_term_matrix, path)
     return None
 
 
-def save_model(model, filepath):
+def save_model(model, filepath, binary=False, vocabulary=None):
     """Saves a LDA model.
 
     With this function you can save a LDA model using :module:`pickle`. If you want \
     to save MALLET models, you have to specify a parameter of the function :func:`mallet.create_mallet_model()`.
+    If ``binary`` is True, ``filepath`` is a directory and each NumPy array of \
+    the model, e.g. ``topic_word_`` and ``doc_topic_`` of a `lda <https://pypi.python.org/pypi/lda>`_ \
+    model, is saved as separate ``.npy`` file, the remaining parameters in \
+    ``model.json``. Gensim models are saved with their own :meth:`save()`, \
+    storing every array separately. Use :func:`preprocessing.read_model()` to \
+    memory-map the arrays, which loads instantly and shares memory between \
+    processes.
 
     Args:
         model: Fitted LDA model produced by `Gensim <https://radimrehurek.com/gensim/>`_
             or `lda <https://pypi.python.org/pypi/lda>`_.
         filepath (str): Path to LDA model, e.g. ``/home/models/model.pickle``.
+        binary (bool, optional): If True, arrays are saved separately as ``.npy``
+            files to the directory ``filepath``. Defaults to False.
+        vocabulary (list, optional): Types corresponding to the columns of the
+            topic-word matrix. Saved as ``vocabulary.npy``, if ``binary`` is True.
+            Defaults to None.
 
     Returns:
         None.
 
     Example:
+        >>> import tempfile
         >>> from lda import LDA
         >>> from gensim.models import LdaModel
         >>> from dariah_topics import preprocessing
-        >>> save_model(LDA, 'model.pickle')
-        >>> preprocessing.read_model('model.pickle') == LDA
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     filepath = os.path.join(tmpdir, 'model.pickle')
+        ...     save_model(LDA, filepath)
+        ...     preprocessing.read_model(filepath) == LDA
+        ...     save_model(LdaModel, filepath)
+        ...     preprocessing.read_model(filepath) == LdaModel
         True
-        >>> save_model(LdaModel, 'model.pickle')
-        >>> preprocessing.read_model('model.pickle') == LdaModel
         True
+        >>> model = LDA(n_topics=2, n_iter=10, random_state=1).fit(np.array([[1, 2, 0], [0, 1, 3]]))
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     save_model(model, tmpdir, binary=True, vocabulary=['this', 'is', 'example'])
+        ...     loaded_model, vocabulary = preprocessing.read_model(tmpdir, vocabulary=True)
+        ...     np.array_equal(loaded_model.topic_word_, model.topic_word_), vocabulary.tolist()
+        (True, ['this', 'is', 'example'])
     """
+    if binary:
+        _save_binary_model(model, filepath, vocabulary)
+        return None
     with open(filepath, 'wb') as file:
         pickle.dump(model, file, protocol=pickle.HIGHEST_PROTOCOL)
     return None
@@ -219,7 +343,8 @@ def show_document_topics(topics, model=None, document_labels=None, doc_topics_fi
     
     With this function you can show the topic distributions for all documents in a pandas DataFrame. \
     For each topic, the top ``num_keys`` keys will be considered. If you have a
-    * `lda <https://pypi.python.org/pypi/lda>`_ model, you have to pass the model \
+    * `lda <https://pypi.python.org/pypi/lda>`_ or :class:`modeling.NativeLDA` model, \
+    or any other model with a ``doc_topic_`` attribute, you have to pass the model \
     as ``model`` and the document-term matrix vocabulary as ``vocabulary``.
     * `Gensim <https://radimrehurek.com/gensim/>`_ model, you have to pass only the model \
     as ``model``.
@@ -243,11 +368,10 @@ def show_document_topics(topics, model=None, document_labels=None, doc_topics_fi
 
     Example:
     """
-    from lda.lda import LDA
     from gensim.models import LdaModel, LdaMulticore
   
     index = [' '.join(keys[:num_keys]) for keys in topics.values]
-    if isinstance(model, LDA):
+    if hasattr(model, 'doc_topic_'):
         return _show_lda_document_topics(model, document_labels, index).round(dec)
     elif isinstance(model, LdaModel) or isinstance(model, LdaMulticore):
         return _show_gensim_document_topics(doc2bow, model, document_labels, index).round(dec)
@@ -260,8 +384,10 @@ def show_topics(model=None, vocabulary=None, topic_keys_file=None, num_keys=10):
     
     With this function you can show all topics of a LDA model in a pandas DataFrame. \
     For each topic, the top ``num_keys`` keys will be considered. If you have a
-    * `lda <https://pypi.python.org/pypi/lda>`_ model, you have to pass the model \
-    as ``model`` and the document-term matrix vocabulary as ``vocabulary``.
+    * `lda <https://pypi.python.org/pypi/lda>`_, :class:`modeling.NativeLDA` or \
+    :class:`modeling.OnlineLDA` model, or any other model with a ``topic_word_`` \
+    attribute, you have to pass the model as ``model`` and the document-term \
+    matrix vocabulary as ``vocabulary``.
     * `Gensim <https://radimrehurek.com/gensim/>`_ model, you have to pass only the model \
     as ``model``.
     * `MALLET <http://mallet.cs.umass.edu/topics.php>`_ based workflow, you have to\
@@ -280,10 +406,9 @@ def show_topics(model=None, vocabulary=None, topic_keys_file=None, num_keys=10):
 
     Example:
     """
-    from lda.lda import LDA
     from gensim.models import LdaModel, LdaMulticore
     
-    if isinstance(model, LDA):
+    if hasattr(model, 'topic_word_'):
         return _show_lda_topics(model, vocabulary, num_keys)
     elif isinstance(model, LdaModel) or isinstance(model, LdaMulticore):
         return _show_gensim_topics(model, num_keys)
@@ -578,36 +703,205 @@ def _show_mallet_topics(path_to_topic_keys_file):
     return pd.DataFrame(topics, index=index, columns=columns)
 
 
-def _save_matrix_market(document_term_matrix, path):
+def _label_array(labels):
+    """Converts labels to a NumPy array, which can be saved without pickling.
+
+    This private function is used by :func:`_save_binary_document_term_matrix()`. \
+    Numeric and boolean labels keep their dtype, all other labels are \
+    converted to str.
+
+    Args:
+        labels: Iterable of labels, e.g. a pandas Index or dictionary keys.
+
+    Returns:
+        The labels as NumPy array.
+
+    Example:
+        >>> _label_array([1, 2]).dtype.kind, _label_array(['a', None]).tolist()
+        ('i', ['a', 'None'])
+    """
+    labels = np.asarray(list(labels))
+    return labels.astype(str) if labels.dtype == object else labels
+
+
+def _save_binary_document_term_matrix(document_term_matrix, path, document_ids=None, type_ids=None):
+    """Writes a ``document_term_matrix`` to a compressed NPZ file.
+
+    The non-zero values are saved in coordinate format as the arrays ``row``, \
+    ``col`` and ``data``, the variant of ``document_term_matrix`` as ``kind``. \
+    For the small corpus variant, the ``index`` and ``columns`` are saved, \
+    otherwise ``document_ids`` and ``type_ids`` as pairs of arrays. Labels keep \
+    a numeric dtype, see :func:`_label_array()`. Nothing is pickled. This \
+    private function is wrapped in :func:`save_document_term_matrix()`.
+
+    Args:
+        document_term_matrix (pandas.DataFrame or scipy.sparse.spmatrix): Any
+            variant of a document-term matrix. Will be saved as ``document_term_matrix.npz``.
+        path (str): Path to the output directory.
+        document_ids (dict, optional): Dictionary containing ``document_labels`` as
+            keys and an unique identifier as value. Defaults to None.
+        type_ids (dict, optional): Dictionary containing types as keys and an
+            unique identifier as value. Defaults to None.
+
+    Returns:
+        None.
+    """
+    arrays = {}
+    if sparse.issparse(document_term_matrix):
+        arrays['kind'] = np.array('sparse')
+        coo = document_term_matrix.tocoo()
+        arrays['row'], arrays['col'], arrays['data'] = coo.row, coo.col, coo.data
+        arrays['shape'] = np.array(coo.shape)
+    elif isinstance(document_term_matrix.index, pd.MultiIndex):
+        arrays['kind'] = np.array('large')
+        arrays['row'] = document_term_matrix.index.get_level_values('document_id').values
+        arrays['col'] = document_term_matrix.index.get_level_values('type_id').values
+        arrays['data'] = document_term_matrix[0].values
+    else:
+        arrays['kind'] = np.array('small')
+        values = document_term_matrix.values
+        arrays['row'], arrays['col'] = values.nonzero()
+        arrays['data'] = values[arrays['row'], arrays['col']]
+        arrays['shape'] = np.array(values.shape)
+        arrays['index'] = _label_array(document_term_matrix.index)
+        arrays['columns'] = _label_array(document_term_matrix.columns)
+    for name, token2id in [('document_ids', document_ids), ('type_ids', type_ids)]:
+        if token2id is not None:
+            arrays[name + '_keys'] = _label_array(token2id.keys())
+            arrays[name + '_values'] = np.fromiter(token2id.values(), dtype=np.int64, count=len(token2id))
+
+    log.info("Saving document_term_matrix.npz to {} ...".format(path))
+    np.savez_compressed(os.path.join(path, 'document_term_matrix.npz'), **arrays)
+    return None
+
+
+def _numpy_scalar_to_json(value):
+    """Converts NumPy scalars for :func:`json.dump()`.
+
+    This private function is used by :func:`_save_binary_model()`.
+
+    Args:
+        value: Object :mod:`json` cannot serialize.
+
+    Returns:
+        The corresponding Python scalar.
+
+    Raises:
+        TypeError, if ``value`` is not a NumPy scalar.
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError("{} cannot be saved in model.json.".format(type(value).__name__))
+
+
+def _save_binary_model(model, path, vocabulary=None):
+    """Writes a LDA model as separate NumPy arrays and metadata.
+
+    Attributes of ``model`` that are NumPy arrays are saved as ``<name>.npy``, \
+    attributes referring to the same array only once. The class of ``model``, \
+    the names of the arrays and all other attributes are saved in ``model.json``. \
+    Gensim models are saved with :meth:`save()` as ``model.gensim``, with every \
+    array in a separate file. This private function is wrapped in :func:`save_model()`.
+
+    Args:
+        model: Fitted LDA model produced by `Gensim <https://radimrehurek.com/gensim/>`_
+            or `lda <https://pypi.python.org/pypi/lda>`_.
+        path (str): Path to the output directory.
+        vocabulary (list, optional): Types corresponding to the columns of the
+            topic-word matrix. Defaults to None.
+
+    Returns:
+        None.
+
+    Example:
+        >>> import tempfile
+        >>> from lda import LDA
+        >>> model = LDA(n_topics=2, n_iter=10, random_state=1).fit(np.array([[1, 2, 0], [0, 1, 3]]))
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     _save_binary_model(model, tmpdir)
+        ...     with open(os.path.join(tmpdir, 'model.json')) as file:
+        ...         json.load(file)['aliases']
+        {'topic_word_': 'components_'}
+    """
+    if not os.path.exists(path):
+        log.info("Creating directory {} ...".format(path))
+        os.makedirs(path)
+    metadata = {'module': type(model).__module__, 'class': type(model).__name__}
+    if hasattr(model, 'save') and hasattr(type(model), 'load'):
+        log.info("Saving model.gensim to {} ...".format(path))
+        model.save(os.path.join(path, 'model.gensim'), sep_limit=0)
+        metadata['gensim'] = True
+    else:
+        metadata['arrays'] = []
+        metadata['aliases'] = {}
+        metadata['attributes'] = {}
+        saved_arrays = {}
+        for name, value in vars(model).items():
+            if isinstance(value, np.ndarray):
+                if id(value) in saved_arrays:
+                    metadata['aliases'][name] = saved_arrays[id(value)]
+                    continue
+                log.info("Saving {}.npy to {} ...".format(name, path))
+                np.save(os.path.join(path, name + '.npy'), value, allow_pickle=False)
+                saved_arrays[id(value)] = name
+                metadata['arrays'].append(name)
+            else:
+                metadata['attributes'][name] = value
+    if vocabulary is not None:
+        log.info("Saving vocabulary.npy to {} ...".format(path))
+        np.save(os.path.join(path, 'vocabulary.npy'), np.array(list(vocabulary), dtype=str), allow_pickle=False)
+    with open(os.path.join(path, 'model.json'), 'w', encoding='utf-8') as file:
+        json.dump(metadata, file, default=_numpy_scalar_to_json)
+    return None
+
+
+def _save_matrix_market(document_term_matrix, path, block_size=100000):
     """
     Writes a `document_term_matrix` designed for large corpora to `Matrix Market <http://math.nist.gov/MatrixMarket/formats.html#MMformat>`_ file (`.mm`). Libraries like `scipy <https://www.scipy.org>`_
     and `gensim <https://radimrehurek.com/gensim/>`_ are able to read and process
-    the Matrix Market format. This private function is wrapped in `save_document_term_matrix()`.
+    the Matrix Market format. The entries are formatted and written in blocks of
+    `block_size` lines. This private function is wrapped in `save_document_term_matrix()`.
     
     **Use the function `preprocessing.create_document_term_matrix()` to create a
     document-term matrix.**
 
     Args:
-        document_term_matrix (pandas.DataFrame): Document-term matrix with only
-            one column corresponding to type frequencies and a pandas MultiIndex
-            with `document_ids` for level 0 and `type_ids` for level 1. Will be
-            saved as `document_term_matrix.mm`.
+        document_term_matrix (pandas.DataFrame or scipy.sparse.spmatrix): Document-term
+            matrix with only one column corresponding to type frequencies and a
+            pandas MultiIndex with `document_ids` for level 0 and `type_ids` for
+            level 1, or a sparse document-term matrix. Will be saved as
+            `document_term_matrix.mm`.
         path (str): Path to the output directory.
+        block_size (int, optional): Number of lines written at once. Defaults
+            to 100000.
 
     Returns:
         None.
 
     Example:
     """
-    num_docs = document_term_matrix.index.get_level_values('document_id').max()
-    num_types = document_term_matrix.index.get_level_values('type_id').max()
-    sum_counts = document_term_matrix[0].sum()
-    header = "{} {} {}\n".format(num_docs, num_types, sum_counts)
-
+    if sparse.issparse(document_term_matrix):
+        coo = sparse.csr_matrix(document_term_matrix).tocoo()
+        document_id, type_id, count = coo.row + 1, coo.col + 1, coo.data
+        num_docs, num_types = coo.shape
+    else:
+        document_id = document_term_matrix.index.get_level_values('document_id').values
+        type_id = document_term_matrix.index.get_level_values('type_id').values
+        count = document_term_matrix[0].values
+        num_docs, num_types = document_id.max(), type_id.max()
+        nonzero = count != 0
+        document_id, type_id, count = document_id[nonzero], type_id[nonzero], count[nonzero]
+    header = "{} {} {}\n".format(num_docs, num_types, len(count))
+
+    log.info("Saving document_term_matrix.mm to {} ...".format(path))
     with open(os.path.join(path, 'document_term_matrix.mm'), 'w', encoding='utf-8') as file:
         file.write("%%MatrixMarket matrix coordinate real general\n")
         file.write(header)
-        document_term_matrix.to_csv(file, sep=' ', header=None)
+        for start in range(0, len(count), block_size):
+            stop = start + block_size
+            lines = map("{} {} {!r}\n".format, document_id[start:stop].tolist(),
+                        type_id[start:stop].tolist(), count[start:stop].tolist())
+            file.write(''.join(lines))
     return None
 
 def show_topic_key_weights(topic_no, num_keys, model=None, vocabulary=None, topic_word_weights_file=None, sort_ascending=None):
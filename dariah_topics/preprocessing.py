@@ -25,53 +25,806 @@ conventions:
     and only one column corresponding to word frequencies. The first column of the \
     MultiIndex corresponds to a document ID (based on ``document_labels``) and the \
     second column to a type ID. The first variant is designed for small and the \
-    second for large corpora.
+    second for large corpora. A third variant is a `scipy <https://www.scipy.org>`_ \
+    sparse matrix in CSR format, with row *i* corresponding to document ID *i + 1* \
+    and column *j* to type ID *j + 1*.
     * ``token2id`` means a dictionary containing a token as key and an unique identifier \
     as key, e.g. ``{'first_document': 0, 'second_document': 1}``.
 
 Contents
 ********
+    * :class:`CorpusStatistics` holds collection frequencies, document frequencies \
+    and document lengths of a ``document_term_matrix``, see :func:`corpus_statistics()`.
+    * :class:`DocumentTermMatrixBuilder` collects counts of one ``tokenized_document`` \
+    after another in growable arrays and creates a document-term matrix.
+    * :class:`EncodedCorpus` is a memory-mapped, integer-encoded ``tokenized_corpus``, \
+    see :func:`read_encoded_corpus()`.
+    * :class:`MatrixMarketCorpus` is a Matrix Market file with an index of \
+    document offsets, see :func:`read_matrix_market_file()`.
+    * :class:`PreprocessingCache` stores results of preprocessing steps on disk, \
+    keyed by the content of the input files and all parameters.
+    * :class:`Tokenizer` compiles a Unicode regular expression once and tokenizes \
+    one or more ``document``, optionally to type IDs.
     * :func:`add_token2id` adds a token to a ``document_ids`` or ``type_ids`` dictionary \
     and assigns an unique identifier.
+    * :func:`corpus_statistics()` computes :class:`CorpusStatistics` once per \
+    ``document_term_matrix``.
     * :func:`create_document_term_matrix()` creates a document-term matrix, for either \
-    small or large corpora.
+    small or large corpora, or as sparse matrix.
     * :func:`filter_pos_tags()` filters a ``dkpro_document`` by specific \
     *part-of-speech tags* and returns either tokens or, if available, lemmas.
     * :func:`find_hapax_legomena()` determines *hapax legomena* based on frequencies \
     of a ``document_term_matrix``.
+    * :func:`hash_document()` counts the tokens of a ``tokenized_document`` in \
+    hash buckets, without a vocabulary.
     * :func:`list_mfw()` determines *most frequent words* based on frequencies \
     of a ``document_term_matrix``.
-    * :func:`read_document_term_matrix()` reads a document-term matrix from a CSV file.
-    * :func:`read_files()` reads one or multiple files based on a pathlist.
+    * :func:`prune_vocabulary()` removes types by document frequency and keeps \
+    the most frequent types of a ``document_term_matrix``.
+    * :func:`read_document_term_matrix()` reads a document-term matrix from a CSV \
+    or binary NPZ file.
+    * :func:`read_dkpro_files()` reads `DARIAH-DKPro-Wrapper <https://github.com/DARIAH-DE/DARIAH-DKPro-Wrapper>`_ \
+    output in chunks and filters by *part-of-speech tags* while reading.
+    * :func:`read_encoded_corpus()` memory-maps a corpus saved with \
+    :func:`postprocessing.save_encoded_corpus()`.
+    * :func:`read_files()` reads one or multiple files based on a pathlist, \
+    including compressed files and ZIP or tar archives.
     * :func:`read_matrix_market_file()` reads a `Matrix Market <http://math.nist.gov/MatrixMarket/formats.html#MMformat>`_ \
-    file for `Gensim <https://radimrehurek.com/gensim/>`_.
+    file for `Gensim <https://radimrehurek.com/gensim/>`_ or as sparse matrix.
     * :func:`read_model()` reads a LDA model.
     * :func:`read_token2id()` reads a ``document_ids`` or ``type_ids`` dictionary \
     from a CSV file.
-    * :func:`remove_features()` removes features from a ``document_term_matrix``.
+    * :func:`remove_features()` removes features from a ``document_term_matrix`` or ``tokenized_corpus``.
     * :func:`segment()` is a wrapper for :func:`segment_fuzzy()` and segments a \
     ``tokenized_document`` into segments of a certain number of tokens, respecting existing chunks.
+    * :func:`segment_array()` segments an integer-encoded ``tokenized_document`` \
+    like :func:`segment()`, but returns segment boundaries instead of copies.
     * :func:`segment_fuzzy()` segments a ``tokenized_document``, tolerating existing \
     chunks (like paragraphs).
     * :func:`split_paragraphs()` splits a ``document`` or ``dkpro_document`` by paragraphs.
+    * :func:`stream_document_term_matrix()` creates a document-term matrix while \
+    reading and tokenizing one ``document`` at a time.
     * :func:`tokenize()` tokenizes a ``document`` based on a Unicode regular expression.
+    * :func:`tokenize_files()` reads and tokenizes files in parallel worker processes.
 """
 
 
 from collections import Counter, defaultdict
+from collections.abc import Iterator
 import csv
-from itertools import chain
-from gensim.corpora import MmCorpus
+from functools import partial, wraps
+import hashlib
+from itertools import chain, islice
+from multiprocessing import Pool
 import os
+from array import array
+import bz2
+import gzip
+import importlib
+import inspect
+import io
+import json
 from lxml import etree
 import numpy as np
 import pandas as pd
 import pickle
 import regex
+from scipy import sparse
+import tarfile
+import weakref
+import zipfile
+import zlib
 import logging
+import lzma
 
 log = logging.getLogger('dariah_topics')
 
+_corpus_statistics_cache = {}
+
+_DECOMPRESSORS = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}
+
+_MAX_BUCKET_TYPES = 10
+
+
+class CorpusStatistics:
+    """Frequencies of a document-term matrix as NumPy arrays.
+
+    With this class you can compute collection frequencies, document frequencies \
+    and document lengths of a ``document_term_matrix`` in one pass, and look up \
+    *most frequent words* and *hapax legomena* in O(vocabulary). All arrays are \
+    indexed by type ID or document ID, respectively, thus index 0 is unused. \
+    For the small corpus variant, column *j* corresponds to type ID *j + 1* and \
+    row *i* to document ID *i + 1*. Use :func:`corpus_statistics()` to get the \
+    statistics of a document-term matrix only once.
+
+    Args:
+        document_term_matrix (pandas.DataFrame or scipy.sparse.spmatrix): A
+            document-term matrix.
+        type_ids (dict, optional): A dictionary with types as key and identifiers
+            as values. Required, if ``document_term_matrix`` is designed for large
+            corpora or is a sparse matrix. Defaults to None.
+
+    Example:
+        >>> document_labels = ['document_one', 'document_two']
+        >>> tokenized_corpus = [['hapax', 'stopword', 'stopword'], ['stopword']]
+        >>> document_term_matrix, _, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, sparse_matrix=True)
+        >>> statistics = CorpusStatistics(document_term_matrix, type_ids)
+        >>> statistics.collection_frequencies, statistics.document_frequencies, statistics.document_lengths
+        (array([0, 1, 3]), array([0, 1, 2]), array([0, 3, 1]))
+        >>> statistics.most_frequent(1), statistics.hapax_legomena()
+        (['stopword'], ['hapax'])
+        >>> CorpusStatistics(sparse.csr_matrix([[1, 0, 3, 2]]), {'one': 1, 'zero': 2, 'three': 3}).most_frequent()
+        ['three', 'one']
+    """
+    def __init__(self, document_term_matrix, type_ids=None):
+        if sparse.issparse(document_term_matrix):
+            document_term_matrix = sparse.csr_matrix(document_term_matrix)
+            nonzero = document_term_matrix.data != 0
+            indices = document_term_matrix.indices[nonzero] + 1
+            num_types = document_term_matrix.shape[1] + 1
+            self.collection_frequencies = np.bincount(indices, weights=document_term_matrix.data[nonzero],
+                                                      minlength=num_types).astype(document_term_matrix.dtype)
+            self.document_frequencies = np.bincount(indices, minlength=num_types)
+            self.document_lengths = np.concatenate(([0], np.asarray(document_term_matrix.sum(axis=1)).ravel()))
+            self.num_documents = document_term_matrix.shape[0]
+        elif isinstance(document_term_matrix.index, pd.MultiIndex):
+            document_id = document_term_matrix.index.get_level_values('document_id').values
+            type_id = document_term_matrix.index.get_level_values('type_id').values
+            count = document_term_matrix[0].values
+            nonzero = (count != 0) & (type_id > 0)
+            num_types = max(max(type_ids.values(), default=0), type_id.max(initial=0)) + 1
+            self.collection_frequencies = np.bincount(type_id[nonzero], weights=count[nonzero],
+                                                      minlength=num_types).astype(count.dtype)
+            self.document_frequencies = np.bincount(type_id[nonzero], minlength=num_types)
+            self.document_lengths = np.bincount(document_id, weights=count).astype(count.dtype)
+            self.num_documents = len(np.unique(document_id))
+        else:
+            values = document_term_matrix.values
+            self.collection_frequencies = np.concatenate(([0], values.sum(axis=0)))
+            self.document_frequencies = np.concatenate(([0], (values > 0).sum(axis=0)))
+            self.document_lengths = np.concatenate(([0], values.sum(axis=1)))
+            self.num_documents = len(values)
+            type_ids = {type_: id_ for id_, type_ in enumerate(document_term_matrix.columns, 1)}
+        self.id2type = np.empty(len(self.collection_frequencies), dtype=object)
+        if type_ids:
+            types = list(type_ids)
+            ids, first = np.unique(np.fromiter(type_ids.values(), dtype=np.int64, count=len(type_ids)),
+                                   return_index=True)
+            self.id2type[ids] = [types[index] for index in first.tolist()]
+        self.type_ids = type_ids
+
+    def hapax_legomena(self):
+        """Determines types occurring only once in the corpus.
+
+        Returns:
+            Hapax legomena in a list, ordered by type ID.
+        """
+        return self.id2type[np.flatnonzero(self.collection_frequencies == 1)].tolist()
+
+    def most_frequent(self, most_frequent_tokens=100):
+        """Determines the types with the highest collection frequency.
+
+        Args:
+            most_frequent_tokens (int, optional): Number of types. Defaults to 100.
+
+        Returns:
+            Most frequent tokens in a list, ties ordered by type ID. Types not
+                occurring in the corpus and type IDs without type, e.g. of
+                removed types, are not considered.
+        """
+        candidates = np.flatnonzero((self.collection_frequencies > 0) & np.not_equal(self.id2type, None))
+        order = np.argsort(-self.collection_frequencies[candidates], kind='mergesort')[:most_frequent_tokens]
+        return self.id2type[candidates[order]].tolist()
+
+
+class DocumentTermMatrixBuilder:
+    """Collects token counts document by document.
+
+    With this class you can create a document-term matrix without keeping the \
+    ``tokenized_corpus`` in memory. Each ``tokenized_document`` is counted as \
+    soon as it is added, the vocabulary grows incrementally, and only the \
+    non-zero counts are appended to growable arrays. Thus, memory usage is \
+    proportional to the size of the matrix, not to the size of the corpus.
+    Document and type IDs are assigned in order of appearance, starting with 1.
+    Use :meth:`from_document_term_matrix()` to continue with an existing \
+    document-term matrix, e.g. for a growing corpus. New documents and types \
+    get new IDs, removed documents keep their IDs reserved, thus existing IDs \
+    stay valid.
+
+    Example:
+        >>> builder = DocumentTermMatrixBuilder()
+        >>> builder.add_document('document_one', ['this', 'is', 'document', 'one'])
+        >>> builder.add_document('document_two', ['this', 'is', 'document', 'two'])
+        >>> document_term_matrix, document_ids, type_ids = builder.to_sparse_matrix()
+        >>> document_term_matrix.toarray()
+        array([[1, 1, 1, 1, 0],
+               [1, 1, 1, 0, 1]])
+        >>> builder.add_document('document_three', ['this', 'is', 'another', 'document'])
+        >>> document_term_matrix.shape
+        (2, 5)
+        >>> builder.remove_document('document_three')
+        >>> document_term_matrix, document_ids, type_ids = builder.to_large_corpus_model()
+        >>> len(document_term_matrix)
+        8
+        >>> builder = DocumentTermMatrixBuilder.from_document_term_matrix(document_term_matrix, document_ids, type_ids)
+        >>> builder.remove_document('document_one')
+        >>> builder.add_document('document_three', ['this', 'is', 'another', 'document'])
+        >>> document_term_matrix, document_ids, type_ids = builder.to_sparse_matrix()
+        >>> document_term_matrix.toarray()
+        array([[0, 0, 0, 0, 0, 0],
+               [1, 1, 1, 0, 1, 0],
+               [1, 1, 1, 0, 0, 1]])
+        >>> document_ids
+        {'document_two': 2, 'document_three': 3}
+    """
+    def __init__(self):
+        self.document_ids = {}
+        self.type_ids = {}
+        self.indptr = array('l', [0])
+        self.indices = array('l')
+        self.counts = array('l')
+        self.removed_ids = set()
+
+    @classmethod
+    def from_document_term_matrix(cls, document_term_matrix, document_ids, type_ids):
+        """Creates a builder containing an existing document-term matrix.
+
+        Args:
+            document_term_matrix (pandas.DataFrame or scipy.sparse.spmatrix): A
+                document-term matrix designed for large corpora or a sparse matrix.
+            document_ids (dict): Dictionary containing ``document_labels`` as keys
+                and an unique identifier as value.
+            type_ids (dict): A dictionary with types as key and identifiers as values.
+
+        Returns:
+            A :class:`DocumentTermMatrixBuilder`. Document IDs not contained in
+                ``document_ids`` are considered as removed.
+
+        Raises:
+            ValueError, if ``document_term_matrix`` is designed for small corpora.
+        """
+        if sparse.issparse(document_term_matrix):
+            document_term_matrix = sparse.csr_matrix(document_term_matrix)
+        elif isinstance(document_term_matrix.index, pd.MultiIndex):
+            document_id = document_term_matrix.index.get_level_values('document_id').values
+            type_id = document_term_matrix.index.get_level_values('type_id').values
+            count = document_term_matrix[0].values
+            nonzero = (count != 0) & (type_id > 0)
+            num_documents = max(max(document_ids.values(), default=0), document_id.max(initial=0))
+            num_types = max(max(type_ids.values(), default=0), type_id.max(initial=0))
+            document_term_matrix = sparse.csr_matrix((count[nonzero], (document_id[nonzero] - 1, type_id[nonzero] - 1)),
+                                                     shape=(num_documents, num_types))
+        else:
+            raise ValueError("Commit a document-term matrix designed for large corpora or a sparse matrix.")
+        document_term_matrix.sort_indices()
+        builder = cls()
+        builder.document_ids = dict(document_ids)
+        builder.type_ids = dict(type_ids)
+        for name, values in [('indptr', document_term_matrix.indptr), ('indices', document_term_matrix.indices),
+                             ('counts', document_term_matrix.data)]:
+            growable_array = array('l')
+            growable_array.frombytes(values.astype(np.dtype('l')).tobytes())
+            setattr(builder, name, growable_array)
+        num_rows = max(document_term_matrix.shape[0], max(document_ids.values(), default=0))
+        builder.indptr.extend([builder.indptr[-1]] * (num_rows - document_term_matrix.shape[0]))
+        builder.removed_ids = set(range(1, num_rows + 1)).difference(document_ids.values())
+        return builder
+
+    def add_document(self, document_label, tokenized_document):
+        """Counts the tokens of one document.
+
+        If there is already a document ``document_label``, it will be replaced \
+        by the new one. The new document gets a new ID, the old ID stays reserved.
+
+        Args:
+            document_label (str): Name or label of the document.
+            tokenized_document (list): An iterable of tokens.
+
+        Returns:
+            None.
+
+        Example:
+            >>> builder = DocumentTermMatrixBuilder()
+            >>> builder.add_document('document', ['first', 'version'])
+            >>> builder.add_document('document', ['second', 'version'])
+            >>> document_term_matrix, document_ids, type_ids = builder.to_sparse_matrix()
+            >>> document_term_matrix.toarray()
+            array([[0, 0, 0],
+                   [0, 1, 1]])
+            >>> document_ids
+            {'document': 2}
+        """
+        log.debug("Updating {} in document-term matrix ...".format(document_label))
+        if document_label in self.document_ids:
+            self.removed_ids.add(self.document_ids[document_label])
+        counts = Counter(tokenized_document)
+        self._append_row(document_label, [type_id - 1 for type_id in _encode_tokens(counts, self.type_ids)],
+                         counts.values())
+        return None
+
+    def _append_row(self, document_label, indices, counts):
+        """Appends a row of non-zero counts with a new document ID.
+
+        Args:
+            document_label (str): Name or label of the document.
+            indices (list): Column of each count, i.e. type ID minus one.
+            counts (list): Non-zero counts.
+
+        Returns:
+            None.
+        """
+        self.document_ids[document_label] = len(self.indptr)
+        self.indices.extend(indices)
+        self.counts.extend(counts)
+        self.indptr.append(len(self.indices))
+        return None
+
+    def remove_document(self, document_label):
+        """Removes a document, keeping its ID reserved.
+
+        Args:
+            document_label (str): Name or label of the document.
+
+        Returns:
+            None.
+
+        Raises:
+            KeyError, if there is no document ``document_label``.
+        """
+        log.debug("Removing {} from document-term matrix ...".format(document_label))
+        self.removed_ids.add(self.document_ids.pop(document_label))
+        return None
+
+    def to_large_corpus_model(self):
+        """Creates a document-term matrix designed for large corpora.
+
+        Returns:
+            A document-term matrix as pandas DataFrame with a MultiIndex,
+                ``document_ids`` and ``type_ids``.
+        """
+        lengths = np.diff(np.frombuffer(self.indptr, dtype=self.indptr.typecode))
+        empty = np.flatnonzero(lengths == 0) + 1
+        document_id = np.concatenate((np.repeat(np.arange(1, len(lengths) + 1), lengths), empty))
+        type_id = np.concatenate((np.frombuffer(self.indices, dtype=self.indices.typecode) + 1,
+                                  np.zeros(len(empty), dtype=int)))
+        count = np.concatenate((np.frombuffer(self.counts, dtype=self.counts.typecode),
+                                np.zeros(len(empty), dtype=int)))
+        if self.removed_ids:
+            keep = ~np.isin(document_id, list(self.removed_ids))
+            document_id, type_id, count = document_id[keep], type_id[keep], count[keep]
+        order = np.lexsort((type_id, document_id))
+        document_id, type_id, count = document_id[order], type_id[order], count[order]
+        multi_index = pd.MultiIndex.from_arrays([document_id, type_id], names=['document_id', 'type_id'])
+        document_term_matrix = pd.DataFrame({0: count}, index=multi_index)
+        return document_term_matrix, self.document_ids, self.type_ids
+
+    def to_sparse_matrix(self):
+        """Creates a sparse document-term matrix in CSR format.
+
+        Rows of removed documents are empty. The matrix does not share memory \
+        with the builder, thus more documents can be added afterwards.
+
+        Returns:
+            A document-term matrix as sparse CSR matrix, ``document_ids`` and
+                ``type_ids``.
+        """
+        document_term_matrix = sparse.csr_matrix((np.frombuffer(self.counts, dtype=self.counts.typecode).copy(),
+                                                  np.frombuffer(self.indices, dtype=self.indices.typecode).copy(),
+                                                  np.frombuffer(self.indptr, dtype=self.indptr.typecode).copy()),
+                                                 shape=(len(self.indptr) - 1, len(self.type_ids)))
+        if self.removed_ids:
+            keep = np.ones(document_term_matrix.shape[0], dtype=bool)
+            keep[[document_id - 1 for document_id in self.removed_ids]] = False
+            keep_values = np.repeat(keep, np.diff(document_term_matrix.indptr))
+            indptr = np.concatenate(([0], np.cumsum(keep_values)))[document_term_matrix.indptr]
+            document_term_matrix = sparse.csr_matrix((document_term_matrix.data[keep_values],
+                                                      document_term_matrix.indices[keep_values],
+                                                      indptr),
+                                                     shape=document_term_matrix.shape)
+        document_term_matrix.sort_indices()
+        return document_term_matrix, self.document_ids, self.type_ids
+
+
+class EncodedCorpus:
+    """Integer-encoded, memory-mapped tokenized corpus.
+
+    With this class you can access a corpus saved with :func:`postprocessing.save_encoded_corpus()` \
+    without reading it into memory. All type IDs are stored in one contiguous \
+    array, ``offsets`` marks the start of each document. Indexing returns the \
+    type IDs of a document as a view on the memory-mapped array, iterating \
+    yields each ``tokenized_document`` as list of tokens, thus an instance can \
+    be used as ``tokenized_corpus``, e.g. for :meth:`utils.Mallet.import_tokenized_corpus()`.
+    Use :meth:`doc2bow()` and :attr:`id2word` for `Gensim <https://radimrehurek.com/gensim/>`_ \
+    and :meth:`to_document_term_matrix()` for the :mod:`dariah_topics.evaluation` module.
+
+    Args:
+        tokens (numpy.ndarray): Type IDs of all documents.
+        offsets (numpy.ndarray): Start offset of each document, followed by the
+            total number of tokens.
+        type_ids (dict): A dictionary with types as key and identifiers as values.
+        document_labels (list): Name or label of each document.
+
+    Example:
+        >>> corpus = EncodedCorpus(np.array([1, 2, 1, 3]), np.array([0, 3, 4]),
+        ...                        {'this': 1, 'is': 2, 'that': 3}, ['first', 'second'])
+        >>> list(corpus)
+        [['this', 'is', 'this'], ['that']]
+        >>> list(corpus.doc2bow())
+        [[(0, 2), (1, 1)], [(2, 1)]]
+        >>> corpus.id2word
+        {0: 'this', 1: 'is', 2: 'that'}
+    """
+    def __init__(self, tokens, offsets, type_ids, document_labels):
+        self.tokens = tokens
+        self.offsets = offsets
+        self.type_ids = type_ids
+        self.document_labels = document_labels
+        self.id2type = {id_: type_ for type_, id_ in type_ids.items()}
+        self.id2word = {id_ - 1: type_ for id_, type_ in self.id2type.items()}
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if not -len(self) <= index < len(self):
+            raise IndexError("Document index {} out of range.".format(index))
+        index %= len(self)
+        return self.tokens[self.offsets[index]:self.offsets[index + 1]]
+
+    def __iter__(self):
+        id2type = self.id2type
+        for index in range(len(self)):
+            yield [id2type[type_id] for type_id in self[index].tolist()]
+
+    def doc2bow(self):
+        """Creates a re-iterable bag-of-words corpus for Gensim.
+
+        Like the columns of a sparse document-term matrix, Gensim IDs are type \
+        IDs minus one. Pass :attr:`id2word` as ``id2word`` to Gensim.
+
+        Returns:
+            An iterable yielding one list of ``(id, frequency)`` tuples
+                per document, which can be iterated multiple times.
+        """
+        return _EncodedBowCorpus(self)
+
+    def to_document_term_matrix(self, block_size=2 ** 24):
+        """Creates a document-term matrix designed for large corpora.
+
+        Tokens are counted in blocks of whole documents with about \
+        ``block_size`` tokens, thus memory usage does not depend on the size \
+        of the corpus. Like :func:`create_document_term_matrix()`, an empty \
+        document is represented by one row with type ID 0 and count 0, thus \
+        document IDs still line up with ``document_labels``.
+
+        Args:
+            block_size (int, optional): Number of tokens counted at once.
+                Defaults to 16 Mi.
+
+        Returns:
+            A document-term matrix as pandas DataFrame with a MultiIndex.
+
+        Example:
+            >>> corpus = EncodedCorpus(np.array([1, 2, 1]), np.array([0, 0, 3]), {'this': 1, 'is': 2}, ['empty', 'full'])
+            >>> corpus.to_document_term_matrix()[0].to_dict()
+            {(1, 0): 0, (2, 1): 2, (2, 2): 1}
+        """
+        num_types = max(self.id2type, default=0) + 1
+        blocks = []
+        start = 0
+        while start < len(self):
+            stop = np.searchsorted(self.offsets, self.offsets[start] + block_size, side='right') - 1
+            stop = min(max(stop, start + 1), len(self))
+            lengths = np.diff(self.offsets[start:stop + 1])
+            document_id = np.repeat(np.arange(start + 1, stop + 1), lengths)
+            tokens = np.asarray(self.tokens[self.offsets[start]:self.offsets[stop]], dtype=np.int64)
+            blocks.append(np.unique(document_id * num_types + tokens, return_counts=True))
+            start = stop
+        empty = np.flatnonzero(np.diff(self.offsets) == 0) + 1
+        blocks.append((empty * num_types, np.zeros(len(empty), dtype=np.int64)))
+        keys = np.concatenate([block_keys for block_keys, _ in blocks])
+        counts = np.concatenate([block_counts for _, block_counts in blocks])
+        order = np.argsort(keys, kind='stable')
+        keys, counts = keys[order], counts[order]
+        multi_index = pd.MultiIndex.from_arrays([keys // num_types, keys % num_types], names=['document_id', 'type_id'])
+        return pd.DataFrame({0: counts}, index=multi_index)
+
+
+class MatrixMarketCorpus:
+    """Indexed `Matrix Market <http://math.nist.gov/MatrixMarket/formats.html#MMformat>`_ corpus.
+
+    With this class you can use a Matrix Market file (`.mm`) like a \
+    :class:`gensim.corpora.MmCorpus`, without parsing the whole text file \
+    again on every pass. When opening the file, it is scanned once in blocks \
+    of ``block_size`` bytes to record the byte offset of each document. \
+    Indexing seeks directly to a document, iterating parses consecutive \
+    documents block by block. The entries have to be sorted by document ID, \
+    as written by :func:`postprocessing.save_document_term_matrix()`. Like in \
+    :class:`gensim.corpora.MmCorpus`, Gensim IDs are type IDs minus one.
+    Use the function :func:`read_matrix_market_file()` to create an instance.
+
+    Args:
+        filepath (str): Path to Matrix Market file.
+        block_size (int, optional): Number of bytes read at once. Defaults to
+            16 MiB.
+
+    Example:
+        >>> import tempfile
+        >>> with tempfile.NamedTemporaryFile(suffix='.mm') as tmpfile:
+        ...     tmpfile.write(b"%%MatrixMarket matrix coordinate real general\\n3 3 3\\n1 1 2\\n1 3 1\\n3 2 4\\n") and True
+        ...     tmpfile.flush()
+        ...     corpus = MatrixMarketCorpus(tmpfile.name)
+        ...     list(corpus)
+        ...     corpus[2]
+        True
+        [[(0, 2.0), (2, 1.0)], [], [(1, 4.0)]]
+        [(1, 4.0)]
+    """
+    def __init__(self, filepath, block_size=2 ** 24):
+        self.filepath = filepath
+        self.block_size = block_size
+        with open(filepath, 'rb') as file:
+            self.num_docs, self.num_terms, self.num_nnz = _read_matrix_market_header(file)
+            self.offsets = self._index_documents(file)
+
+    def __len__(self):
+        return self.num_docs
+
+    def __getitem__(self, index):
+        if not -len(self) <= index < len(self):
+            raise IndexError("Document index {} out of range.".format(index))
+        index %= len(self)
+        with open(self.filepath, 'rb') as file:
+            file.seek(self.offsets[index])
+            entries = _parse_matrix_market_entries(file.read(self.offsets[index + 1] - self.offsets[index]))
+        return list(zip((entries[:, 1].astype(np.int64) - 1).tolist(), entries[:, 2].tolist()))
+
+    def __iter__(self):
+        with open(self.filepath, 'rb') as file:
+            start = 0
+            while start < len(self):
+                stop = np.searchsorted(self.offsets, self.offsets[start] + self.block_size, side='right') - 1
+                stop = min(max(stop, start + 1), len(self))
+                file.seek(self.offsets[start])
+                entries = _parse_matrix_market_entries(file.read(self.offsets[stop] - self.offsets[start]))
+                bounds = np.searchsorted(entries[:, 0], np.arange(start + 2, stop + 1))
+                for document in np.split(entries, bounds):
+                    yield list(zip((document[:, 1].astype(np.int64) - 1).tolist(), document[:, 2].tolist()))
+                start = stop
+
+    def _index_documents(self, file):
+        """Records the byte offset of each document.
+
+        Args:
+            file: Matrix Market file opened in binary mode, positioned after
+                the header.
+
+        Returns:
+            Start offset of each document, followed by the size of the file.
+                Documents without entries start where the next document starts.
+
+        Raises:
+            ValueError, if a line is malformed or the number of entries differs
+                from the header.
+        """
+        log.info("Indexing {} ...".format(self.filepath))
+        offsets = np.full(self.num_docs + 1, os.fstat(file.fileno()).st_size, dtype=np.int64)
+        num_entries = 0
+        for line_offsets, entries in _iter_matrix_market_blocks(file, self.block_size):
+            document_ids = entries[:, 0].astype(np.int64)
+            first = np.flatnonzero(np.diff(document_ids, prepend=0))
+            np.minimum.at(offsets, document_ids[first] - 1, line_offsets[first])
+            num_entries += len(entries)
+        if num_entries != self.num_nnz:
+            raise ValueError("The file {} has {} entries, but its header declares {}.".format(self.filepath, num_entries,
+                                                                                               self.num_nnz))
+        return np.minimum.accumulate(offsets[::-1])[::-1]
+
+
+class PreprocessingCache:
+    """Content-addressed on-disk cache for preprocessing steps.
+
+    With this class you can skip preprocessing steps, e.g. :func:`read_files()`, \
+    :func:`tokenize_files()`, :func:`create_document_term_matrix()`, :func:`list_mfw()` \
+    or :func:`remove_features()`, if neither the input nor the parameters have \
+    changed since the last run. Call a function through the cache, or wrap it \
+    with :meth:`wrap()`. The result is looked up by a key derived from the \
+    function and all arguments. Arguments declared in ``path_arguments``, e.g. \
+    ``pathlist`` of :func:`read_files()`, and :class:`pathlib.Path` objects \
+    naming existing files, also as items of a list, contribute the hash of \
+    the file content instead of the path, other arguments their pickled value. \
+    Other strings are never looked up on disk. Results are \
+    pickled to ``directory``; iterators, e.g. the generator returned by \
+    :func:`read_files()`, are materialized as list. If the cache grows larger \
+    than ``max_size`` bytes, the least recently used results are removed.
+
+    Args:
+        directory (str): Path to the cache directory.
+        max_size (int, optional): Maximum size of the cache in bytes. Defaults
+            to 1 GiB.
+        path_arguments (tuple, optional): Names of parameters which take paths
+            of files. Defaults to ``('filepath', 'pathlist', 'path')``.
+
+    Example:
+        >>> import tempfile
+        >>> with tempfile.TemporaryDirectory() as directory:
+        ...     cache = PreprocessingCache(directory)
+        ...     cache(tokenize, 'This is an example.', lower=False)
+        ...     cached_tokenize = cache.wrap(tokenize)
+        ...     cached_tokenize('This is an example.', lower=False)
+        ...     cache.hits, cache.misses
+        ['This', 'is', 'an', 'example']
+        ['This', 'is', 'an', 'example']
+        (1, 1)
+    """
+    def __init__(self, directory, max_size=2 ** 30, path_arguments=('filepath', 'pathlist', 'path')):
+        self.directory = directory
+        self.max_size = max_size
+        self.path_arguments = path_arguments
+        self.hits = 0
+        self.misses = 0
+        if not os.path.exists(directory):
+            log.info("Creating directory {} ...".format(directory))
+            os.makedirs(directory)
+
+    def __call__(self, function, *args, **kwargs):
+        key = self.key(function, *args, **kwargs)
+        filepath = os.path.join(self.directory, key + '.pickle')
+        if os.path.exists(filepath):
+            log.info("Reading result of {} from cache ...".format(function.__name__))
+            with open(filepath, 'rb') as file:
+                result = pickle.load(file)
+            os.utime(filepath)
+            self.hits += 1
+            return result
+        self.misses += 1
+        result = function(*args, **kwargs)
+        if isinstance(result, Iterator):
+            result = list(result)
+        temporary_filepath = '{}.{}.tmp'.format(filepath, os.getpid())
+        with open(temporary_filepath, 'wb') as file:
+            pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary_filepath, filepath)
+        self.evict()
+        return result
+
+    def evict(self):
+        """Removes least recently used results until the cache fits ``max_size``.
+
+        Returns:
+            None.
+        """
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.pickle'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_size:
+                break
+            log.debug("Removing {} from cache ...".format(path))
+            os.remove(path)
+            size -= entry_size
+        return None
+
+    def key(self, function, *args, **kwargs):
+        """Creates the key of a function call.
+
+        The key depends on the qualified name of ``function``, the version of \
+        :mod:`dariah_topics` and the fingerprints of all arguments, thus results \
+        are recomputed after an update of the package. Arguments are bound to \
+        the parameters of ``function``, thus a path passed by position is \
+        recognized as well as by keyword.
+
+        Args:
+            function (callable): The cached function.
+            *args: Positional arguments of ``function``.
+            **kwargs: Keyword arguments of ``function``.
+
+        Returns:
+            The key as hexadecimal string.
+        """
+        from dariah_topics import __version__
+        hasher = hashlib.sha256()
+        hasher.update('{}.{} {}'.format(getattr(function, '__module__', None),
+                                        getattr(function, '__qualname__', None), __version__).encode('utf-8'))
+        if not hasattr(function, '__qualname__'):
+            hasher.update(pickle.dumps(function, protocol=pickle.HIGHEST_PROTOCOL))
+        try:
+            arguments = list(inspect.signature(function).bind(*args, **kwargs).arguments.items())
+        except (TypeError, ValueError):
+            arguments = [(None, argument) for argument in args] + sorted(kwargs.items())
+        for name, argument in arguments:
+            _update_prefixed(hasher, 'argument', str(name).encode('utf-8'))
+            _update_fingerprint(hasher, argument, name in self.path_arguments)
+        return hasher.hexdigest()
+
+    def wrap(self, function):
+        """Wraps a function, so that every call goes through the cache.
+
+        Args:
+            function (callable): The function to cache.
+
+        Returns:
+            The wrapped function.
+        """
+        @wraps(function)
+        def cached_function(*args, **kwargs):
+            return self(function, *args, **kwargs)
+        return cached_function
+
+
+class Tokenizer:
+    """Tokenizes with a precompiled Unicode regular expression.
+
+    With this class you can tokenize many documents with the same regular \
+    expression, which is compiled only once. An instance is a one-argument \
+    callable and can be used wherever :func:`tokenize()` is passed as callable, \
+    e.g. as ``tokenizer`` of :func:`segment()` or :func:`stream_document_term_matrix()`.
+    If ``type_ids`` is not None, the tokenizer emits integer type IDs instead \
+    of tokens. Unknown tokens are added to ``type_ids`` like :func:`add_token2id()` \
+    does, thus multiple tokenizers can share one vocabulary.
+
+    Args:
+        pattern (str, optional): Regular expression to match tokens. Defaults to
+            ``\\p{L}+\\p{P}?\\p{L}+``.
+        lower (boolean, optional): If True, lowers all characters. Defaults to True.
+        type_ids (dict, optional): A dictionary with types as key and identifiers
+            as values. Defaults to None.
+
+    Example:
+        >>> tokenizer = Tokenizer()
+        >>> tokenizer("This is 1 example text.")
+        ['this', 'is', 'example', 'text']
+        >>> tokenizer = Tokenizer(type_ids={})
+        >>> tokenizer.tokenize_corpus(["This is one text.", "This is another text."])
+        [array([1, 2, 3, 4]), array([1, 2, 5, 4])]
+        >>> tokenizer.type_ids
+        {'this': 1, 'is': 2, 'one': 3, 'text': 4, 'another': 5}
+    """
+    def __init__(self, pattern=r'\p{L}+\p{P}?\p{L}+', lower=True, type_ids=None):
+        if not hasattr(pattern, 'finditer'):
+            pattern = regex.compile(pattern)
+        self.pattern = pattern
+        self.lower = lower
+        self.type_ids = type_ids
+
+    def __call__(self, document):
+        return self.tokenize(document)
+
+    def tokenize(self, document):
+        """Tokenizes a document.
+
+        Args:
+            document (str): Document text.
+
+        Returns:
+            A ``tokenized_document`` as list or, if ``type_ids`` is not None,
+                a NumPy array of type IDs.
+        """
+        if self.lower:
+            document = document.lower()
+        if self.type_ids is not None:
+            tokens = (match.group() for match in self.pattern.finditer(document))
+            return np.fromiter(_encode_tokens(tokens, self.type_ids), dtype=np.int64)
+        elif self.pattern.groups == 0:
+            return self.pattern.findall(document)
+        else:
+            return [match.group() for match in self.pattern.finditer(document)]
+
+    def tokenize_corpus(self, corpus):
+        """Tokenizes a batch of documents.
+
+        Args:
+            corpus (list): An iterable of ``document``.
+
+        Returns:
+            A ``tokenized_corpus`` as list.
+        """
+        log.debug("Tokenizing corpus ...")
+        return [self.tokenize(document) for document in corpus]
+
 
 def add_token2id(token, token2id):
     """Adds token to token2id dictionary.
@@ -102,13 +855,62 @@ def add_token2id(token, token2id):
     return token2id
 
 
-def create_document_term_matrix(tokenized_corpus, document_labels, large_corpus=False):
+def corpus_statistics(document_term_matrix, type_ids=None):
+    """Gets the statistics of a document-term matrix, computing them only once.
+
+    With this function you can share :class:`CorpusStatistics` between \
+    :func:`list_mfw()`, :func:`find_hapax_legomena()` and :func:`prune_vocabulary()`. \
+    The statistics are cached for the lifetime of ``document_term_matrix``. \
+    Functions like :func:`remove_features()` return a new matrix, which gets \
+    new statistics. Do not modify a document-term matrix in place after its \
+    statistics have been computed.
+
+    Args:
+        document_term_matrix (pandas.DataFrame or scipy.sparse.spmatrix): A
+            document-term matrix.
+        type_ids (dict, optional): A dictionary with types as key and identifiers
+            as values. Required, if ``document_term_matrix`` is designed for large
+            corpora or is a sparse matrix. Defaults to None.
+
+    Returns:
+        A :class:`CorpusStatistics`.
+
+    Example:
+        >>> document_term_matrix = create_document_term_matrix([['this', 'is', 'this']], ['document'])
+        >>> corpus_statistics(document_term_matrix) is corpus_statistics(document_term_matrix)
+        True
+    """
+    key = id(document_term_matrix)
+    statistics, matrix_reference = _corpus_statistics_cache.get(key, (None, None))
+    if statistics is not None and matrix_reference() is document_term_matrix \
+            and (type_ids is None or statistics.type_ids is type_ids):
+        return statistics
+    log.debug("Computing corpus statistics ...")
+    statistics = CorpusStatistics(document_term_matrix, type_ids)
+    _corpus_statistics_cache[key] = (statistics, weakref.ref(document_term_matrix))
+    weakref.finalize(document_term_matrix, _corpus_statistics_cache.pop, key, None)
+    return statistics
+
+
+def create_document_term_matrix(tokenized_corpus, document_labels, large_corpus=False, sparse_matrix=False,
+                                num_buckets=None):
     """Creates a document-term matrix.
 
     With this function you can create a document-term-matrix where rows \
     correspond to documents in the collection and columns correspond to terms. \
     Use the function :func:`read_files()` to read and :func:`tokenize()` \
-    to tokenize your text files.
+    to tokenize your text files. If ``sparse_matrix`` is True, the matrix will \
+    be built in a single pass as `scipy <https://www.scipy.org>`_ sparse matrix \
+    in CSR format, which needs only memory for non-zero values. If ``num_buckets`` \
+    is not None, no vocabulary is built: each type is hashed into one of \
+    ``num_buckets`` columns by :func:`hash_document()`, thus each document is \
+    vectorized independently. The first ten types of each bucket are kept in \
+    ``type_ids`` with the ID of the bucket, thus ``type_ids`` does not grow with \
+    the vocabulary and types colliding in one bucket share a type ID; \
+    :func:`prune_vocabulary()` drops the types of removed buckets. For a small \
+    corpus, every document gets its own row, even if its label is not unique. \
+    Use :meth:`DocumentTermMatrixBuilder.add_document()` to replace a document \
+    by its label.
 
     Args:
         tokenized_corpus (list): Tokenized corpus as an iterable containing one
@@ -116,23 +918,51 @@ def create_document_term_matrix(tokenized_corpus, document_labels, large_corpus=
         document_labels (list): Name or label of each text file.
         large_corpus (bool, optional): Set to True, if ``tokenized_corpus`` is
             very large. Defaults to False.
+        sparse_matrix (bool, optional): Set to True, if you want a sparse matrix
+            in CSR format. Defaults to False.
+        num_buckets (int, optional): Number of columns of a sparse matrix created
+            with the hashing trick. Defaults to None.
 
     Returns:
-        Document-term matrix as pandas DataFrame.
+        Document-term matrix as pandas DataFrame or, if ``large_corpus`` or
+            ``sparse_matrix`` is True or ``num_buckets`` is not None, a
+            document-term matrix, ``document_ids`` and ``type_ids``.
+
+    Raises:
+        ValueError, if both ``large_corpus`` and ``sparse_matrix`` are True, or
+            ``large_corpus`` is True and ``num_buckets`` is not None, or if a
+            document label of a sparse matrix is not unique.
 
     Example:
         >>> tokenized_corpus = [['this', 'is', 'document', 'one'], ['this', 'is', 'document', 'two']]
         >>> document_labels = ['document_one', 'document_two']
         >>> create_document_term_matrix(tokenized_corpus, document_labels) #doctest: +NORMALIZE_WHITESPACE
-                      this   is  document  two  one
-        document_one   1.0  1.0       1.0  0.0  1.0
-        document_two   1.0  1.0       1.0  1.0  0.0
+                      this   is  document  one  two
+        document_one   1.0  1.0       1.0  1.0  0.0
+        document_two   1.0  1.0       1.0  0.0  1.0
         >>> document_term_matrix, document_ids, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, True)
         >>> isinstance(document_term_matrix, pd.DataFrame) and isinstance(document_ids, dict) and isinstance(type_ids, dict)
         True
+        >>> document_term_matrix, document_ids, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, sparse_matrix=True)
+        >>> document_term_matrix.toarray()
+        array([[1, 1, 1, 1, 0],
+               [1, 1, 1, 0, 1]])
+        >>> document_term_matrix, document_ids, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, num_buckets=16)
+        >>> document_term_matrix.shape, int(document_term_matrix.sum())
+        ((2, 16), 8)
+        >>> list_mfw(document_term_matrix, 16, type_ids)
+        ['this', 'document', 'one']
     """
-    if large_corpus:
+    if large_corpus and sparse_matrix:
+        raise ValueError("Set either large_corpus or sparse_matrix to True, not both.")
+    if large_corpus and num_buckets is not None:
+        raise ValueError("Set either large_corpus to True or num_buckets, not both.")
+    if num_buckets is not None:
+        return _create_hashed_corpus_model(tokenized_corpus, document_labels, num_buckets)
+    elif large_corpus:
         return _create_large_corpus_model(tokenized_corpus, document_labels)
+    elif sparse_matrix:
+        return _create_sparse_corpus_model(tokenized_corpus, document_labels)
     else:
         return _create_small_corpus_model(tokenized_corpus, document_labels)
 
@@ -183,8 +1013,8 @@ def find_hapax_legomena(document_term_matrix, type_ids=None):
     Args:
         document_term_matrix (pandas.DataFrame): A document-term matrix.
         type_ids (dict): A dictionary with types as key and identifiers as values.
-            If ``document_term_matrix`` is designed for large corpora, you have
-            to commit ``type_ids``, too.
+            If ``document_term_matrix`` is designed for large corpora or is a
+            sparse matrix, you have to commit ``type_ids``, too.
 
     Returns:
         Hapax legomena in a list.
@@ -198,14 +1028,51 @@ def find_hapax_legomena(document_term_matrix, type_ids=None):
         >>> document_term_matrix, _, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, large_corpus=True)
         >>> find_hapax_legomena(document_term_matrix, type_ids)
         ['hapax']
+        >>> document_term_matrix, _, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, sparse_matrix=True)
+        >>> find_hapax_legomena(document_term_matrix, type_ids)
+        ['hapax']
     """
     log.info("Determining hapax legomena ...")
-    if isinstance(document_term_matrix.index, pd.MultiIndex):
-        log.debug("Large corpus model ...")
-        return _hapax_legomena_large_corpus_model(document_term_matrix, type_ids)
-    else:
-        log.debug("Small corpus model ...")
-        return document_term_matrix.loc[:, document_term_matrix.max() == 1].columns.tolist()
+    return corpus_statistics(document_term_matrix, type_ids).hapax_legomena()
+
+
+def hash_document(tokenized_document, num_buckets=2 ** 20):
+    """Counts the tokens of a document in hash buckets.
+
+    With this function you can vectorize a ``tokenized_document`` without a \
+    vocabulary, e.g. in parallel worker processes. Each type is mapped to the \
+    bucket ``crc32(type) % num_buckets``, which is the same in every process. \
+    Types colliding in one bucket are counted together.
+    Use :func:`create_document_term_matrix()` with ``num_buckets`` to create a \
+    document-term matrix this way.
+
+    Args:
+        tokenized_document (list): An iterable of tokens.
+        num_buckets (int, optional): Number of buckets. Defaults to 2 ** 20.
+
+    Returns:
+        Sorted bucket indices, their counts, and the types of each bucket as
+            list, in order of appearance.
+
+    Example:
+        >>> buckets, counts, types = hash_document(['this', 'is', 'this'], num_buckets=1024)
+        >>> sorted(zip(types, counts.tolist()))
+        [(['is'], 1), (['this'], 2)]
+        >>> buckets, counts, types = hash_document(['this', 'is', 'this'], num_buckets=1)
+        >>> buckets.tolist(), counts.tolist(), types
+        ([0], [3], [['this', 'is']])
+    """
+    type_counts = Counter(tokenized_document)
+    types = list(type_counts)
+    hashes = np.fromiter((zlib.crc32(type_.encode('utf-8')) for type_ in types), dtype=np.int64, count=len(types))
+    buckets, inverse = np.unique(hashes % num_buckets, return_inverse=True)
+    inverse = inverse.ravel()
+    counts = np.bincount(inverse, weights=np.fromiter(type_counts.values(), dtype=np.int64, count=len(types)),
+                         minlength=len(buckets)).astype(np.int64)
+    bucket_types = [[] for _ in range(len(buckets))]
+    for type_, index in zip(types, inverse.tolist()):
+        bucket_types[index].append(type_)
+    return buckets, counts, bucket_types
 
 
 def list_mfw(document_term_matrix, most_frequent_tokens=100, type_ids=None):
@@ -220,8 +1087,8 @@ def list_mfw(document_term_matrix, most_frequent_tokens=100, type_ids=None):
     Args:
         document_term_matrix (pandas.DataFrame): A document-term matrix.
         most_frequent_tokens (int, optional): Treshold for most frequent tokens.
-        type_ids (dict): If ``document_term_matrix`` is designed for large corpora,
-            you have to commit ``type_ids``, too.
+        type_ids (dict): If ``document_term_matrix`` is designed for large corpora
+            or is a sparse matrix, you have to commit ``type_ids``, too.
 
     Returns:
         Most frequent tokens in a list.
@@ -235,30 +1102,111 @@ def list_mfw(document_term_matrix, most_frequent_tokens=100, type_ids=None):
         >>> document_term_matrix, _, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, large_corpus=True)
         >>> list_mfw(document_term_matrix, 1, type_ids)
         ['stopword']
+        >>> document_term_matrix, _, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, sparse_matrix=True)
+        >>> list_mfw(document_term_matrix, 1, type_ids)
+        ['stopword']
     """
     log.info("Determining stopwords ...")
-    if isinstance(document_term_matrix.index, pd.MultiIndex):
+    return corpus_statistics(document_term_matrix, type_ids).most_frequent(most_frequent_tokens)
+
+
+def prune_vocabulary(document_term_matrix, type_ids=None, min_df=1, max_df=1.0, max_features=None):
+    """Removes rare, ubiquitous or infrequent types in one pass.
+
+    With this function you can prune the vocabulary of a document-term matrix \
+    by document frequency (the number of documents containing a type) and \
+    collection frequency (the number of tokens of a type in the corpus). Both \
+    are computed together in one vectorized pass over the non-zero values. \
+    A type is kept, if its document frequency is between ``min_df`` and \
+    ``max_df``. If ``max_features`` is not None, only the remaining types with \
+    the highest collection frequency are kept. The remaining types get new, \
+    contiguous ``type_ids``, keeping their order.
+    Use the function :func:`create_document_term_matrix()` to create a \
+    document-term matrix.
+
+    Args:
+        document_term_matrix (pandas.DataFrame): A document-term matrix.
+        type_ids (dict): A dictionary with types as key and identifiers as values.
+            If ``document_term_matrix`` is designed for large corpora or is a
+            sparse matrix, you have to commit ``type_ids``, too.
+        min_df (int or float, optional): Minimum document frequency. A float is
+            interpreted as fraction of documents. Defaults to 1.
+        max_df (int or float, optional): Maximum document frequency. A float is
+            interpreted as fraction of documents. Defaults to 1.0.
+        max_features (int, optional): Maximum number of types. Defaults to None.
+
+    Returns:
+        The pruned document-term matrix and the new ``type_ids``, which is None
+            for a document-term matrix designed for small corpora without
+            ``type_ids``.
+
+    Raises:
+        ValueError, if ``max_df`` corresponds to fewer documents than ``min_df``,
+            or if ``type_ids`` is None, but ``document_term_matrix`` is designed
+            for large corpora or is a sparse matrix.
+
+    Example:
+        >>> document_labels = ['document_one', 'document_two']
+        >>> tokenized_corpus = [['this', 'is', 'document', 'one'], ['this', 'is', 'document', 'two']]
+        >>> document_term_matrix = create_document_term_matrix(tokenized_corpus, document_labels)
+        >>> document_term_matrix, _ = prune_vocabulary(document_term_matrix, max_df=0.5)
+        >>> document_term_matrix #doctest: +NORMALIZE_WHITESPACE
+                      one  two
+        document_one  1.0  0.0
+        document_two  0.0  1.0
+        >>> document_term_matrix, _, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, sparse_matrix=True)
+        >>> document_term_matrix, type_ids = prune_vocabulary(document_term_matrix, type_ids, min_df=2, max_features=2)
+        >>> document_term_matrix.toarray(), type_ids
+        (array([[1, 1],
+               [1, 1]]), {'this': 1, 'is': 2})
+        >>> prune_vocabulary(document_term_matrix)
+        Traceback (most recent call last):
+            ...
+        ValueError: Commit type_ids for a document-term matrix designed for large corpora or a sparse matrix.
+    """
+    log.info("Pruning vocabulary ...")
+    is_small = not sparse.issparse(document_term_matrix) and not isinstance(document_term_matrix.index, pd.MultiIndex)
+    if type_ids is None and not is_small:
+        raise ValueError("Commit type_ids for a document-term matrix designed for large corpora or a sparse matrix.")
+    if sparse.issparse(document_term_matrix):
+        log.debug("Sparse corpus model ...")
+        return _prune_sparse_corpus_model(document_term_matrix, type_ids, min_df, max_df, max_features)
+    elif isinstance(document_term_matrix.index, pd.MultiIndex):
         log.debug("Large corpus model ...")
-        return _list_mfw_large_corpus_model(document_term_matrix, type_ids, most_frequent_tokens)
+        return _prune_large_corpus_model(document_term_matrix, type_ids, min_df, max_df, max_features)
     else:
         log.debug("Small corpus model ...")
-        return document_term_matrix.iloc[:, :most_frequent_tokens].columns.tolist()
+        statistics = corpus_statistics(document_term_matrix)
+        keep = _select_types(statistics.document_frequencies[1:], statistics.collection_frequencies[1:],
+                             statistics.num_documents, min_df, max_df, max_features)
+        document_term_matrix = document_term_matrix.loc[:, keep]
+        if type_ids is not None:
+            remaining = set(document_term_matrix.columns)
+            ordered_types = sorted((id_, type_) for type_, id_ in type_ids.items() if type_ in remaining)
+            type_ids = {type_: n for n, (_, type_) in enumerate(ordered_types, 1)}
+        return document_term_matrix, type_ids
 
 
-def read_document_term_matrix(filepath):
-    """Reads a document-term matrix from CSV file.
+def read_document_term_matrix(filepath, token2id=False):
+    """Reads a document-term matrix from CSV or NPZ file.
 
     With this function you can read a CSV file containing a document-term \
-    matrix.
+    matrix, or a binary NPZ file written by :func:`postprocessing.save_document_term_matrix()` \
+    with ``binary`` True. The format is selected by the file extension. An NPZ \
+    file is loaded lazily, array by array, and restores the variant of the \
+    document-term matrix it was saved from, including sparse matrices.
     Use the function :func:`create_document_term_matrix()` to create a document-term \
     matrix.
 
     Args:
-        filepath (str): Path to CSV file.
+        filepath (str): Path to CSV or NPZ file.
+        token2id (bool, optional): If True, ``document_ids`` and ``type_ids``
+            saved in an NPZ file are returned, too. Defaults to False.
 
     Returns:
-        A document-term matrix as pandas DataFrame.
-    
+        A document-term matrix as pandas DataFrame or sparse matrix, and, if
+            ``token2id`` is True, ``document_ids`` and ``type_ids``.
+
     Example:
         >>> import tempfile
         >>> with tempfile.NamedTemporaryFile(suffix='.csv') as tmpfile:
@@ -277,6 +1225,11 @@ def read_document_term_matrix(filepath):
         document_id type_id   
         1           1        1
     """
+    if os.path.splitext(filepath)[1] == '.npz':
+        document_term_matrix, document_ids, type_ids = _read_binary_document_term_matrix(filepath)
+        if token2id:
+            return document_term_matrix, document_ids, type_ids
+        return document_term_matrix
     document_term_matrix = pd.read_csv(filepath)
     if 'document_id' and 'type_id' in document_term_matrix:
         return document_term_matrix.set_index(['document_id', 'type_id'])
@@ -286,7 +1239,106 @@ def read_document_term_matrix(filepath):
         return document_term_matrix
 
 
-def read_files(pathlist, file_format=None, xpath_expression='//tei:text', sep='\t', csv_columns=None):
+def read_dkpro_files(pathlist, pos_tags=['ADJ', 'V', 'NN'], lemma=True, paragraphs=False, sep='\t',
+                     chunksize=100000):
+    """Reads DARIAH-DKPro-Wrapper output in chunks and filters by POS-tags.
+
+    With this function you can read large `DARIAH-DKPro-Wrapper <https://github.com/DARIAH-DE/DARIAH-DKPro-Wrapper>`_ \
+    files without loading them completely. Only the columns ``CPOS``, ``Lemma`` \
+    (if ``lemma`` True) or ``Token`` (otherwise), and ``ParagraphId`` (if \
+    ``paragraphs`` True) are read, ``CPOS`` is stored as categorical, and each \
+    chunk is filtered by ``pos_tags`` right after reading. This is equivalent to \
+    :func:`read_files()` followed by :func:`filter_pos_tags()`, but keeps only \
+    the selected tokens in memory.
+
+    Args:
+        pathlist (list): One or more paths to CSV files.
+        pos_tags (list, optional): List of desired POS-tags. Defaults
+            to ``['ADJ', 'V', 'NN']``.
+        lemma (bool, optional): If True, lemmas will be selected, otherwise tokens.
+            Defaults to True.
+        paragraphs (bool, optional): If True, each document will be split into
+            paragraphs based on ``ParagraphId``. Defaults to False.
+        sep (str, optional): Separator of CSV file. Defaults to ``'\\t'``.
+        chunksize (int, optional): Number of rows read at once. Defaults to 100000.
+
+    Yields:
+        A ``tokenized_document`` as list or, if ``paragraphs`` is True, a list of
+            paragraphs, each a list of tokens.
+
+    Example:
+        >>> import tempfile
+        >>> with tempfile.NamedTemporaryFile(suffix='.csv') as tmpfile:
+        ...     tmpfile.write(b"ParagraphId\\tToken\\tLemma\\tCPOS\\n"
+        ...                   b"1\\tthis\\tthis\\tART\\n1\\twas\\tis\\tV\\n"
+        ...                   b"2\\ta\\ta\\tART\\n2\\tdocument\\tdocument\\tNN") and True
+        ...     tmpfile.flush()
+        ...     list(read_dkpro_files([tmpfile.name], chunksize=3))
+        ...     list(read_dkpro_files([tmpfile.name], lemma=False, paragraphs=True))
+        True
+        [['is', 'document']]
+        [[['was'], ['document']]]
+    """
+    column = 'Lemma' if lemma else 'Token'
+    usecols = ['CPOS', column] + (['ParagraphId'] if paragraphs else [])
+    dtype = {'CPOS': 'category', column: str}
+    log.info("Reading {} files and selecting {} {}s ...".format(len(pathlist), pos_tags, column.lower()))
+    for n, file in enumerate(pathlist):
+        log.debug("File #{}".format(n))
+        tokens = []
+        paragraph_ids = []
+        for chunk in pd.read_csv(file, sep=sep, quoting=csv.QUOTE_NONE, usecols=usecols, dtype=dtype,
+                                 keep_default_na=False, na_filter=False, chunksize=chunksize):
+            chunk = chunk[chunk['CPOS'].isin(pos_tags)]
+            tokens.extend(chunk[column].tolist())
+            if paragraphs:
+                paragraph_ids.extend(chunk['ParagraphId'].tolist())
+        if paragraphs:
+            boundaries = [0] + [i for i in range(1, len(paragraph_ids)) if paragraph_ids[i] != paragraph_ids[i - 1]] + [len(tokens)]
+            yield [tokens[start:stop] for start, stop in zip(boundaries[:-1], boundaries[1:]) if stop > start]
+        else:
+            yield tokens
+
+
+def read_encoded_corpus(path):
+    """Reads an integer-encoded corpus.
+
+    With this function you can open a corpus saved with :func:`postprocessing.save_encoded_corpus()`. \
+    The type IDs are memory-mapped, thus opening is instant regardless of the \
+    size of the corpus, and single documents can be sliced without copying.
+
+    Args:
+        path (str): Path to the directory containing the encoded corpus.
+
+    Returns:
+        An :class:`EncodedCorpus`.
+
+    Example:
+        >>> import tempfile
+        >>> from dariah_topics import postprocessing
+        >>> tokenized_corpus = [['this', 'is', 'document', 'one'], ['this', 'is', 'document', 'two']]
+        >>> document_labels = ['document_one', 'document_two']
+        >>> with tempfile.TemporaryDirectory() as path:
+        ...     _ = postprocessing.save_encoded_corpus(tokenized_corpus, document_labels, path)
+        ...     corpus = read_encoded_corpus(path)
+        ...     len(corpus), corpus.document_labels, list(corpus)[0]
+        (2, ['document_one', 'document_two'], ['this', 'is', 'document', 'one'])
+    """
+    log.info("Reading encoded corpus from {} ...".format(path))
+    offsets = np.load(os.path.join(path, 'offsets.npy'))
+    if offsets[-1] > 0:
+        tokens = np.memmap(os.path.join(path, 'tokens.bin'), dtype=np.uint32, mode='r', shape=(int(offsets[-1]),))
+    else:
+        tokens = np.zeros(0, dtype=np.uint32)
+    with open(os.path.join(path, 'document_labels.txt'), 'r', encoding='utf-8') as file:
+        document_labels = [line.rstrip('\n') for line in file]
+    with open(os.path.join(path, 'type_ids.csv'), 'r', encoding='utf-8', newline='') as file:
+        type_ids = {type_: int(id_) for id_, type_ in csv.reader(file)}
+    return EncodedCorpus(tokens, offsets, type_ids, document_labels)
+
+
+def read_files(pathlist, file_format=None, xpath_expression='//tei:text', sep='\t', csv_columns=None,
+               iterparse=False, labels=False):
     """Reads text files based on a pathlist.
 
     With this function you can read multiple file formats:
@@ -294,24 +1346,44 @@ def read_files(pathlist, file_format=None, xpath_expression='//tei:text', sep='\
         * TEI XML files (``.xml``).
         * CSV files (``.csv``), e.g. produced by `DARIAH-DKPro-Wrapper <https://github.com/DARIAH-DE/DARIAH-DKPro-Wrapper>`_. 
 
+    Each of these files may be compressed with gzip (``.gz``), bzip2 (``.bz2``) \
+    or xz (``.xz``), e.g. ``document.txt.gz``, and is decompressed while reading. \
+    ZIP (``.zip``) and tar archives (``.tar``, ``.tar.gz``, ``.tgz``, ``.tar.bz2``, \
+    ``.tar.xz``) are not unpacked to disk, but their members are read one after \
+    another in a streaming way. The format of a member is detected from its name.
+
     The argument ``pathlist`` is an iterable of full or relative paths. In case of \
     CSV files, you have the ability to select specific columns via ``columns``. \
     If there are multiple file formats in ``pathlist``, do not specify ``file_format`` \
-    and file extensions will be considered.
+    and file extensions will be considered. If ``iterparse`` is True, XML files \
+    are parsed incrementally and the text of each element matching ``xpath_expression`` \
+    is yielded as a separate ``document`` as soon as the element is closed, \
+    which keeps memory usage low even for very large files. As archives and \
+    ``iterparse`` yield multiple documents per path, set ``labels`` to True to \
+    get the label of each ``document``: the path of a file, the name of an \
+    archive member, followed by ``#`` and the index of the element, if the \
+    file is parsed incrementally.
 
     Args:
-        pathlist (list): One or more paths to text files.
+        pathlist (list): One or more paths to text files or archives.
         file_format (str, optional): Format of the files. Possible values are
             ``text``, ``xml`` and ``csv`. If None, file extensions will be considered.
+            For archives, the format applies to all members.
             Defaults to None.
         xpath_expression (str, optional): XPath expressions to match part of the
             XML file. Defaults to ``//tei:text``.
         sep (str, optional): Separator of CSV file. Defaults to ``'\\t'``
         columns (list, optional): Column name or names for CSV files. If None, the
             whole file will be processed. Defaults to None.
+        iterparse (bool, optional): If True, XML files will be parsed incrementally.
+            In this case, ``xpath_expression`` must select elements by name,
+            e.g. ``//tei:div``. Defaults to False.
+        labels (bool, optional): If True, a tuple of the label and the ``document``
+            is yielded. Defaults to False.
 
     Yields:
         A ``document`` as str or, in case of a CSV file, a ``dkpro_document`` as a pandas DataFrame.
+            If ``labels`` is True, a tuple of the label and the ``document``.
 
     Raises:
         ValueError, if ``file_format`` is not supported.
@@ -331,54 +1403,116 @@ def read_files(pathlist, file_format=None, xpath_expression='//tei:text', sep='\
         True
         True
         ['This is the first example.', 'This is the second example.']
+        >>> import zipfile
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     archive = os.path.join(tmpdir, 'corpus.zip')
+        ...     with zipfile.ZipFile(archive, 'w') as corpus:
+        ...         corpus.writestr('first.txt', "This is the first example.")
+        ...         corpus.writestr('second.xml.gz', gzip.compress(b"<text>This is the second example.</text>"))
+        ...     list(read_files([archive], xpath_expression='//text'))
+        ...     list(read_files([archive], xpath_expression='//text', labels=True))
+        ['This is the first example.', 'This is the second example.']
+        [('first.txt', 'This is the first example.'), ('second.xml.gz', 'This is the second example.')]
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     filepath = os.path.join(tmpdir, 'document.xml')
+        ...     with open(filepath, 'wb') as file:
+        ...         file.write(b"<text><div>First part.</div><div>Second part.</div></text>") and True
+        ...     documents = read_files([filepath], xpath_expression='//div', iterparse=True, labels=True)
+        ...     [(os.path.basename(label), document) for label, document in documents]
+        True
+        [('document.xml#0', 'First part.'), ('document.xml#1', 'Second part.')]
     """
     log.info("Reading {} files ...".format(len(pathlist)))
     for n, file in enumerate(pathlist):
         log.debug("File #{}".format(n))
-        _, extension = os.path.splitext(file)
-        if file_format == 'text' or extension == '.txt':
-            yield _read_txt(file)
-        elif file_format == 'xml' or extension == '.xml':
-            yield _read_xml(file, xpath_expression)
-        elif file_format == 'csv' or extension == '.csv':
-            yield _read_csv(file, sep, csv_columns)
-        else:
-            if file_format is None:
-                log.error("Skipping {}, because the file format {} is not supported.".format(file, extension))
-                pass
-            else:
-                raise ValueError("Unable to read {}, because the file format {} is not supported.".format(file, file_format))
+        for name, member in _iter_files(file):
+            for label, document in _read_documents(member, name, file_format, xpath_expression, sep, csv_columns,
+                                                   iterparse):
+                yield (label, document) if labels else document
 
 
-def read_matrix_market_file(filepath):
-    """Reads a Matrix Market file for Gensim.
+def read_matrix_market_file(filepath, sparse_matrix=False, block_size=2 ** 24):
+    """Reads a Matrix Market file for Gensim or as sparse matrix.
 
     With this function you can read a Matrix Market file to process it with \
-    `Gensim <https://radimrehurek.com/gensim/>`_.
+    `Gensim <https://radimrehurek.com/gensim/>`_, as :class:`MatrixMarketCorpus`. \
+    If ``sparse_matrix`` is True, the file is parsed in blocks of ``block_size`` \
+    bytes directly into a `scipy <https://www.scipy.org>`_ sparse matrix in \
+    CSR format, with row *i* corresponding to document ID *i + 1* and column \
+    *j* to type ID *j + 1*.
 
     Args:
         filepath (str): Path to Matrix Market file.
+        sparse_matrix (bool, optional): If True, a sparse matrix is returned.
+            Defaults to False.
+        block_size (int, optional): Number of bytes read at once. Defaults to
+            16 MiB.
 
     Returns:
-        Matrix Market model for Gensim.
+        A :class:`MatrixMarketCorpus` or a sparse document-term matrix. Previous
+            versions returned a :class:`gensim.corpora.MmCorpus`, which is
+            replaced by :class:`MatrixMarketCorpus` with the same interface:
+            ``len()``, indexing, iterating over bag-of-words documents with
+            Gensim IDs, ``num_docs``, ``num_terms`` and ``num_nnz``.
+
+    Raises:
+        ValueError, if a line is malformed or the number of entries differs
+            from the header.
+
+    Example:
+        >>> import tempfile
+        >>> with tempfile.NamedTemporaryFile(suffix='.mm') as tmpfile:
+        ...     tmpfile.write(b"%%MatrixMarket matrix coordinate real general\\n2 3 3\\n1 1 2\\n1 3 1\\n2 2 4\\n") and True
+        ...     tmpfile.flush()
+        ...     read_matrix_market_file(tmpfile.name, sparse_matrix=True).toarray()
+        ...     corpus = read_matrix_market_file(tmpfile.name)
+        ...     len(corpus), corpus.num_terms, list(corpus)
+        True
+        array([[2., 0., 1.],
+               [0., 4., 0.]])
+        (2, 3, [[(0, 2.0), (2, 1.0)], [(1, 4.0)]])
+        >>> with tempfile.NamedTemporaryFile(suffix='.mm') as tmpfile:
+        ...     tmpfile.write(b"%%MatrixMarket matrix coordinate real general\\n2 3 3\\n1 1 2\\n1 3 1\\n") and True
+        ...     tmpfile.flush()
+        ...     read_matrix_market_file(tmpfile.name, sparse_matrix=True)
+        Traceback (most recent call last):
+        ...
+        ValueError: The file ... has 2 entries, but its header declares 3.
     """
     if os.path.splitext(filepath)[1] != '.mm':
         raise ValueError("The file {} is not a Matrix Market file.".format(filepath))
-    return MmCorpus(filepath)
-
-
-def read_model(filepath):
+    if not sparse_matrix:
+        return MatrixMarketCorpus(filepath, block_size)
+    log.info("Reading {} ...".format(filepath))
+    with open(filepath, 'rb') as file:
+        num_docs, num_terms, num_nnz = _read_matrix_market_header(file)
+        blocks = [entries for _, entries in _iter_matrix_market_blocks(file, block_size)]
+    entries = np.concatenate(blocks) if blocks else np.empty((0, 3))
+    if len(entries) != num_nnz:
+        raise ValueError("The file {} has {} entries, but its header declares {}.".format(filepath, len(entries),
+                                                                                           num_nnz))
+    return sparse.csr_matrix((entries[:, 2], (entries[:, 0].astype(np.int64) - 1, entries[:, 1].astype(np.int64) - 1)),
+                             shape=(num_docs, num_terms))
+
+
+def read_model(filepath, vocabulary=False):
     """Reads a LDA model.
 
     With this function you can read a LDA model, if it was saved using :module:`pickle`.
     If you want to read MALLET models, you have to specify a parameter of the
     function :func:`create_mallet_model()`.
+    If ``filepath`` is a directory written by :func:`postprocessing.save_model()` \
+    with ``binary`` True, the arrays of the model are memory-mapped read-only \
+    instead of being unpickled. Loading is instant, and processes reading the \
+    same model share its memory.
 
     Args:
         filepath (str): Path to LDA model, e.g. ``/home/models/model.pickle``.
+        vocabulary (bool, optional): If True, the vocabulary saved with a model
+            in a directory is returned, too. Defaults to False.
 
     Returns:
-        A LDA model.
+        A LDA model and, if ``vocabulary`` is True, the vocabulary as NumPy array.
 
     Example:
         >>> import lda
@@ -397,6 +1531,11 @@ def read_model(filepath):
         ...     read_model(tmpfile.name) == a
         True
     """
+    if os.path.isdir(filepath):
+        model, types = _read_binary_model(filepath)
+        if vocabulary:
+            return model, types
+        return model
     with open(filepath, 'rb') as model:
         return pickle.load(model)
 
@@ -427,22 +1566,32 @@ def read_token2id(filepath):
     return dictionary.to_dict()
     
     
-def remove_features(features, document_term_matrix=None, tokenized_corpus=None, type_ids=None):
+def remove_features(features, document_term_matrix=None, tokenized_corpus=None, type_ids=None, lazy=False):
     """Removes features based on a list of tokens.
 
     With this function you can clean your corpus (either a document-term matrix \
     or a ``tokenized_corpus``) from *stopwords* and *hapax legomena*.
     Use the function :func:`create_document_term_matrix()` or :func:`tokenize` to \
     create a document-term matrix or to tokenize your corpus, respectively.
+    For a ``tokenized_corpus``, ``features`` are compiled once into a frozenset, \
+    and documents of type IDs, e.g. produced by :class:`Tokenizer`, are filtered \
+    by a boolean mask over ``type_ids``. If ``lazy`` is True, the documents are \
+    filtered one after another while iterating.
 
     Args:
         features (list): A list of tokens.
         document_term_matrix (pandas.DataFrame, optional): A document-term matrix.
         tokenized_corpus (list, optional): An iterable of one or more ``tokenized_document``.
         type_ids (dict, optional): A dictionary with types as key and identifiers as values.
+            If ``document_term_matrix`` is designed for large corpora or is a
+            sparse matrix, or ``tokenized_corpus`` contains type IDs, you have
+            to commit ``type_ids``, too.
+        lazy (bool, optional): If True, a generator of clean ``tokenized_document``
+            is returned. Defaults to False.
 
     Returns:
-        A clean document-term matrix as pandas DataFrame or ``tokenized_corpus`` as list.
+        A clean document-term matrix as pandas DataFrame (or sparse matrix with
+            the same shape) or ``tokenized_corpus`` as list or generator.
 
     Example:
         >>> document_labels = ['document']
@@ -450,25 +1599,32 @@ def remove_features(features, document_term_matrix=None, tokenized_corpus=None,
         >>> document_term_matrix = create_document_term_matrix(tokenized_corpus, document_labels)
         >>> features = ['this']
         >>> remove_features(features, document_term_matrix) #doctest: +NORMALIZE_WHITESPACE
-                   is  document    a
-        document  1.0       1.0  1.0
+                   is    a  document
+        document  1.0  1.0       1.0
         >>> document_term_matrix, _, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, large_corpus=True)
         >>> len(remove_features(features, document_term_matrix, type_ids=type_ids))
         3
-        >>> list(remove_features(features, tokenized_corpus=tokenized_corpus))
+        >>> document_term_matrix, _, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, sparse_matrix=True)
+        >>> remove_features(features, document_term_matrix, type_ids=type_ids).nnz
+        3
+        >>> remove_features(features, tokenized_corpus=tokenized_corpus)
         [['is', 'a', 'document']]
+        >>> list(remove_features(features, tokenized_corpus=[np.array([1, 2, 3, 1])], type_ids={'this': 1}, lazy=True))
+        [array([2, 3])]
     """
     log.info("Removing features ...")
     if document_term_matrix is not None and tokenized_corpus is None:
-        if isinstance(document_term_matrix.index, pd.MultiIndex):
+        if sparse.issparse(document_term_matrix):
+            return _remove_features_from_sparse_corpus_model(document_term_matrix, type_ids, features)
+        elif isinstance(document_term_matrix.index, pd.MultiIndex):
             return _remove_features_from_large_corpus_model(document_term_matrix, type_ids, features)
         else:
             return _remove_features_from_small_corpus_model(document_term_matrix, features)
     elif document_term_matrix is None and tokenized_corpus is not None:
-        clean_tokenized_corpus = pd.Series() # schöner machen
-        for n, tokenized_document in enumerate(tokenized_corpus):
-            clean_tokenized_corpus[str(n)] = _remove_features_from_tokenized_document(tokenized_document, features)
-        return clean_tokenized_corpus
+        clean_tokenized_corpus = _remove_features_from_tokenized_corpus(tokenized_corpus, features, type_ids)
+        if lazy:
+            return clean_tokenized_corpus
+        return list(clean_tokenized_corpus)
     else:
         raise ValueError("Commit either document-term matrix or tokenized_corpus.")
 
@@ -529,6 +1685,81 @@ def segment(document, segment_size=1000, tolerance=0, chunker=None,
     return segments
 
 
+def segment_array(tokens, chunk_offsets=None, segment_size=1000, tolerance=0, views=False):
+    """Segments an array of tokens, respecting existing chunks, without copying.
+
+    With this function you can segment an integer-encoded ``tokenized_document``, \
+    e.g. a document of :class:`EncodedCorpus`, following the same rules as \
+    :func:`segment()` and :func:`segment_fuzzy()`. Instead of lists of chunks, \
+    the chunks are described by their start offsets in ``tokens``, and the \
+    segments are returned as offsets, too. Each segment ``i`` consists of \
+    ``tokens[boundaries[i]:boundaries[i + 1]]``. If ``views`` is True, these \
+    slices are returned, which are views on ``tokens`` if it is a NumPy array.
+
+    Args:
+        tokens (numpy.ndarray): The tokens or type IDs of the document.
+        chunk_offsets (list, optional): Start offset of each chunk in ``tokens``.
+            If None, ``tokens`` is considered as one chunk. Defaults to None.
+        segment_size (int, optional): The target size of each segment, in tokens.
+            Defaults to 1000.
+        tolerance (float, optional): How much may the actual segment size differ from
+            the segment_size? If ``0 < tolerance < 1``, this is interpreted as a
+            fraction of the segment_size, otherwise it is interpreted as an
+            absolute number. If ``tolerance < 0``, chunks are never split apart.
+            Defaults to 0.
+        views (bool, optional): If True, the segments are returned instead of
+            their boundaries. Defaults to False.
+
+    Returns:
+        Segment boundaries as NumPy array or, if ``views`` is True, a list of
+            segments.
+
+    Example:
+        >>> tokens = np.arange(10)
+        >>> segment_array(tokens, [0, 5], segment_size=2)
+        array([ 0,  2,  4,  6,  8, 10])
+        >>> segment_array(tokens, [0, 5], segment_size=4, tolerance=1, views=True)
+        [array([0, 1, 2, 3, 4]), array([5, 6, 7, 8, 9])]
+    """
+    if tolerance > 0 and tolerance < 1:
+        tolerance = round(segment_size * tolerance)
+    num_tokens = len(tokens)
+    if chunk_offsets is None:
+        chunk_offsets = [0]
+    chunk_offsets = np.append(np.asarray(chunk_offsets, dtype=np.int64), num_tokens).tolist()
+
+    boundaries = [chunk_offsets[0]]
+    current_size = 0
+    position = chunk_offsets[0]
+    chunk = 0
+    while chunk < len(chunk_offsets) - 1:
+        chunk_start = position
+        chunk_end = chunk_offsets[chunk + 1]
+        current_size += chunk_end - chunk_start
+        if current_size >= segment_size:
+            too_long = current_size - segment_size
+            too_short = segment_size - (current_size - (chunk_end - chunk_start))
+            if tolerance >= 0 and min(too_long, too_short) > tolerance:
+                position = chunk_end - too_long
+            elif too_long >= too_short and chunk_start > boundaries[-1]:
+                position = chunk_start
+            else:
+                position = chunk_end
+                chunk += 1
+            boundaries.append(position)
+            current_size = 0
+        else:
+            position = chunk_end
+            chunk += 1
+    if boundaries[-1] < num_tokens:
+        boundaries.append(num_tokens)
+    boundaries = np.array(boundaries, dtype=np.int64)
+
+    if views:
+        return [tokens[start:stop] for start, stop in zip(boundaries[:-1], boundaries[1:])]
+    return boundaries
+
+
 def segment_fuzzy(document, segment_size=5000, tolerance=0.05):
     """Segments a document, tolerating existing chunks (like paragraphs).
 
@@ -665,6 +1896,173 @@ def tokenize(document, pattern=r'\p{L}+\p{P}?\p{L}+', lower=True):
         yield match.group()
 
 
+def stream_document_term_matrix(corpus, document_labels, tokenizer=tokenize, large_corpus=False):
+    """Creates a document-term matrix while reading one document at a time.
+
+    With this function you can create a document-term matrix from a very large \
+    corpus, which does not fit into memory. Pass the generator returned by \
+    :func:`read_files()` as ``corpus``, each ``document`` will be tokenized and \
+    counted before the next one is read. Peak memory is therefore proportional \
+    to the document-term matrix, not to the raw text.
+
+    Args:
+        corpus (iterable): An iterable of ``document``, e.g. the generator
+            returned by :func:`read_files()`.
+        document_labels (list): Name or label of each ``document``.
+        tokenizer (callable, optional): A one-argument function that tokenizes
+            each ``document``. If None, ``corpus`` is expected to be a
+            ``tokenized_corpus``. Defaults to :func:`tokenize()`.
+        large_corpus (bool, optional): If True, the document-term matrix will be
+            a pandas DataFrame with a MultiIndex, otherwise a sparse matrix in
+            CSR format. Defaults to False.
+
+    Returns:
+        A document-term matrix, ``document_ids`` and ``type_ids``.
+
+    Example:
+        >>> corpus = ['This is document one.', 'This is document two.']
+        >>> document_labels = ['document_one', 'document_two']
+        >>> document_term_matrix, document_ids, type_ids = stream_document_term_matrix(corpus, document_labels)
+        >>> document_term_matrix.toarray()
+        array([[1, 1, 1, 1, 0],
+               [1, 1, 1, 0, 1]])
+        >>> type_ids
+        {'this': 1, 'is': 2, 'document': 3, 'one': 4, 'two': 5}
+    """
+    log.info("Creating document-term matrix while reading corpus ...")
+    builder = DocumentTermMatrixBuilder()
+    for document_label, document in zip(document_labels, corpus):
+        if tokenizer is not None:
+            document = tokenizer(document)
+        builder.add_document(document_label, document)
+    if large_corpus:
+        return builder.to_large_corpus_model()
+    else:
+        return builder.to_sparse_matrix()
+
+
+def tokenize_files(pathlist, pattern=r'\p{L}+\p{P}?\p{L}+', lower=True, processes=None, chunksize=1,
+                   file_format=None, xpath_expression='//tei:text', sep='\t', csv_columns=None, labels=False):
+    """Reads and tokenizes files in parallel.
+
+    With this function you can spread reading and tokenizing a corpus across \
+    a pool of worker processes. Every worker reads a file like :func:`read_files()` \
+    does and tokenizes it with :func:`tokenize()`. The results are yielded in \
+    the order of ``pathlist``. Files that could not be processed are logged \
+    with the ``dariah_topics`` logger of the calling process and result in an \
+    empty ``tokenized_document``, thus the output stays aligned with ``pathlist`` \
+    and its document labels. Members of ZIP and tar archives are read by the \
+    calling process like in :func:`read_files()` and tokenized one by one, \
+    thus set ``labels`` to True to get the name of each member. Files are \
+    submitted to the pool in windows of ``2 * processes * chunksize``, thus \
+    at most one window of archive members is held in memory.
+
+    Args:
+        pathlist (list): One or more paths to text files, as str or
+            :class:`pathlib.Path`.
+        pattern (str, optional): Regular expression to match tokens.
+        lower (boolean, optional): If True, lowers all characters. Defaults to True.
+        processes (int, optional): Number of worker processes. If None, the
+            number of CPUs is used. Defaults to None.
+        chunksize (int, optional): Number of files sent to a worker at once.
+            Defaults to 1.
+        file_format (str, optional): Format of the files. Possible values are
+            ``text``, ``xml`` and ``csv``. If None, file extensions will be considered.
+            Defaults to None.
+        xpath_expression (str, optional): XPath expressions to match part of the
+            XML file. Defaults to ``//tei:text``.
+        sep (str, optional): Separator of CSV file. Defaults to ``'\\t'``
+        csv_columns (list, optional): Column name or names for CSV files. If None,
+            the whole file will be processed. Defaults to None.
+        labels (bool, optional): If True, a tuple of the path or member name and
+            the ``tokenized_document`` is yielded. Defaults to False.
+
+    Yields:
+        A ``tokenized_document`` as list, a list of ``tokenized_document`` if
+            ``xpath_expression`` matches multiple parts of a XML file, or, in case
+            of a CSV file, a ``dkpro_document`` as a pandas DataFrame. If ``labels``
+            is True, a tuple of the label and the ``tokenized_document``.
+
+    Example:
+        >>> import tempfile
+        >>> with tempfile.NamedTemporaryFile(suffix='.txt') as first:
+        ...     first.write(b"This is the first example.") and True
+        ...     first.flush()
+        ...     with tempfile.NamedTemporaryFile(suffix='.txt') as second:
+        ...         second.write(b"This is the second example.") and True
+        ...         second.flush()
+        ...         list(tokenize_files([first.name, second.name], processes=2))
+        True
+        True
+        [['this', 'is', 'the', 'first', 'example'], ['this', 'is', 'the', 'second', 'example']]
+        >>> list(tokenize_files(['missing.txt', 'unsupported.pdf'], processes=1))
+        [[], []]
+        >>> import pathlib
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     document = pathlib.Path(tmpdir, 'document.txt')
+        ...     document.write_text("This is an example.") and True
+        ...     list(tokenize_files([document], processes=1))
+        True
+        [['this', 'is', 'an', 'example']]
+        >>> import zipfile
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     archive = os.path.join(tmpdir, 'corpus.zip')
+        ...     with zipfile.ZipFile(archive, 'w') as corpus:
+        ...         corpus.writestr('first.txt', "This is the first example.")
+        ...         corpus.writestr('second.txt.gz', gzip.compress(b"This is the second example."))
+        ...     list(tokenize_files([archive], processes=1, labels=True))
+        [('first.txt', ['this', 'is', 'the', 'first', 'example']), ('second.txt.gz', ['this', 'is', 'the', 'second', 'example'])]
+    """
+    log.info("Reading and tokenizing {} files ...".format(len(pathlist)))
+    processes = os.cpu_count() if processes is None else processes
+    tasks = ((name, io.BytesIO(file.read()) if hasattr(file, 'read') else file,
+              _detect_file_format(name, file_format))
+             for path in pathlist for name, file in _iter_files(path))
+    worker = partial(_read_and_tokenize_file, pattern=pattern, lower=lower,
+                     xpath_expression=xpath_expression, sep=sep, csv_columns=csv_columns)
+    with Pool(processes) as pool:
+        while True:
+            window = list(islice(tasks, 2 * processes * chunksize))
+            if not window:
+                break
+            for label, tokenized_document, error in pool.imap(worker, window, chunksize):
+                if error is not None:
+                    log.error("Skipping {}, because it could not be processed: {}".format(label, error))
+                    tokenized_document = []
+                yield (label, tokenized_document) if labels else tokenized_document
+
+
+def _canonicalize(value):
+    """Converts sets and dictionaries to a deterministic representation.
+
+    This private function is wrapped in :func:`_update_fingerprint()`. The \
+    pickled value of a set depends on the iteration order of its items, \
+    which depends on ``PYTHONHASHSEED`` for strings. Sets and dictionaries are \
+    therefore converted to lists of items, sorted by their pickled canonical \
+    value, nested lists and tuples are converted item by item.
+
+    Args:
+        value: An argument of a cached function.
+
+    Returns:
+        A value whose pickled representation does not depend on hashing.
+
+    Example:
+        >>> _canonicalize({'b': {'y', 'x'}, 'a': 1})
+        ('dict', [('a', 1), ('b', ('set', ['x', 'y']))])
+    """
+    if isinstance(value, (set, frozenset)):
+        items = [_canonicalize(item) for item in value]
+    elif isinstance(value, dict):
+        items = [(_canonicalize(key), _canonicalize(item)) for key, item in value.items()]
+    elif type(value) in {list, tuple}:
+        return type(value)(_canonicalize(item) for item in value)
+    else:
+        return value
+    items.sort(key=partial(pickle.dumps, protocol=pickle.HIGHEST_PROTOCOL))
+    return type(value).__name__, items
+
+
 def _create_bag_of_words(document_labels, tokenized_corpus):
     """Creates a bag-of-words model.
 
@@ -696,13 +2094,75 @@ def _create_bag_of_words(document_labels, tokenized_corpus):
     return {document_ids[id_]: doc for id_, doc in bag_of_words.items()}, document_ids, type_ids
 
 
+def _create_hashed_corpus_model(tokenized_corpus, document_labels, num_buckets):
+    """Creates a sparse document-term matrix with the hashing trick.
+
+    This private function is wrapped in :func:`create_document_term_matrix()`. \
+    Each ``tokenized_document`` is vectorized by :func:`hash_document()`. \
+    Row *i* corresponds to document ID *i + 1* and column *j* to bucket *j*, \
+    whose types have type ID *j + 1*. Only the first ``_MAX_BUCKET_TYPES`` \
+    types of each bucket are kept as examples, thus memory does not grow with \
+    the vocabulary.
+
+    Args:
+        tokenized_corpus (list): Tokenized corpus as an iterable
+            containing one or more iterables containing tokens.
+        document_labels (list): Iterable of document labels.
+        num_buckets (int): Number of buckets.
+
+    Returns:
+        A document-term matrix as sparse CSR matrix, ``document_ids`` and ``type_ids``.
+
+    Raises:
+        ValueError, if a document label is not unique.
+
+    Example:
+        >>> tokenized_corpus = [['this', 'is', 'document', 'one'], ['this', 'is', 'document', 'two']]
+        >>> document_labels = ['document_one', 'document_two']
+        >>> document_term_matrix, document_ids, type_ids = _create_hashed_corpus_model(tokenized_corpus, document_labels, 2 ** 10)
+        >>> document_term_matrix[:, type_ids['two'] - 1].toarray()
+        array([[0],
+               [1]])
+        >>> _, _, type_ids = _create_hashed_corpus_model(tokenized_corpus, document_labels, 1)
+        >>> type_ids
+        {'this': 1, 'is': 1, 'document': 1, 'one': 1, 'two': 1}
+        >>> _, _, type_ids = _create_hashed_corpus_model([[str(n) for n in range(20)]], ['numbers'], 1)
+        >>> list(type_ids)
+        ['0', '1', '2', '3', '4', '5', '6', '7', '8', '9']
+    """
+    log.info("Creating hashed document-term matrix ...")
+    builder = DocumentTermMatrixBuilder()
+    bucket_types = defaultdict(list)
+    for document_label, tokenized_document in zip(document_labels, tokenized_corpus):
+        log.debug("Updating {} in document-term matrix ...".format(document_label))
+        if document_label in builder.document_ids:
+            raise ValueError("The document label {} is not unique.".format(document_label))
+        buckets, bucket_counts, types = hash_document(tokenized_document, num_buckets)
+        builder._append_row(document_label, buckets.tolist(), bucket_counts.tolist())
+        for bucket, types_of_bucket in zip(buckets.tolist(), types):
+            examples = bucket_types[bucket]
+            for type_ in types_of_bucket:
+                if len(examples) == _MAX_BUCKET_TYPES:
+                    break
+                if type_ not in examples:
+                    examples.append(type_)
+    document_term_matrix = sparse.csr_matrix((np.frombuffer(builder.counts, dtype=builder.counts.typecode),
+                                              np.frombuffer(builder.indices, dtype=builder.indices.typecode),
+                                              np.frombuffer(builder.indptr, dtype=builder.indptr.typecode)),
+                                             shape=(len(builder.indptr) - 1, num_buckets))
+    type_ids = {type_: bucket + 1 for bucket, types in sorted(bucket_types.items()) for type_ in types}
+    return document_term_matrix, builder.document_ids, type_ids
+
+
 def _create_large_corpus_model(tokenized_corpus, document_labels):
     """Creates a document-term matrix for large corpora.
 
     This private function is wrapped in :func:`create_document_term_matrix()` and \
     creates a pandas DataFrame containing document and type IDs as MultiIndex \
     and type frequencies as values representing the counts of tokens for each \
-    token in each document.
+    token in each document. The bag-of-words model is converted to parallel \
+    arrays of document IDs, type IDs and counts, which are turned into the \
+    DataFrame at once.
 
     Args:
         tokenized_corpus (list): Tokenized corpus as an iterable
@@ -712,110 +2172,670 @@ def _create_large_corpus_model(tokenized_corpus, document_labels):
     Returns:
         A document-term matrix as pandas DataFrame, ``document_ids`` and ``type_ids``.
 
-    Todo:
-        * Make the whole function faster.
-
     Example:
         >>> tokenized_corpus = [['this', 'is', 'document', 'one'], ['this', 'is', 'document', 'two']]
         >>> document_labels = ['document_one', 'document_two']
         >>> document_term_matrix, document_ids, type_ids = _create_large_corpus_model(tokenized_corpus, document_labels)
         >>> isinstance(document_term_matrix, pd.DataFrame) and isinstance(document_ids, dict) and isinstance(type_ids, dict)
         True
+        >>> list(document_term_matrix.index.names)
+        ['document_id', 'type_id']
+        >>> int(document_term_matrix[0].sum())
+        8
     """
+    log.info("Creating document-term matrix for large corpus ...")
     bag_of_words, document_ids, type_ids = _create_bag_of_words(document_labels, tokenized_corpus)
-    multi_index = _create_multi_index(bag_of_words)
-    document_term_matrix = pd.DataFrame(np.zeros((len(multi_index), 1), dtype=int), index=multi_index)
-    index_iterator = multi_index.groupby(multi_index.get_level_values('document_id'))
-
-    for document_id in range(1, len(multi_index.levels[0]) + 1):
-        for type_id in [val[1] for val in index_iterator[document_id]]:
-            document_term_matrix.set_value((document_id, type_id), 0, int(bag_of_words[document_id][type_id]))
+    document_id, type_id, count = _create_triples(bag_of_words)
+    multi_index = pd.MultiIndex.from_arrays([document_id, type_id], names=['document_id', 'type_id'])
+    document_term_matrix = pd.DataFrame({0: count}, index=multi_index)
     return document_term_matrix, document_ids, type_ids
 
 
-def _create_multi_index(bag_of_words):
-    """Creates a MultiIndex for a pandas DataFrame.
+def _create_small_corpus_model(tokenized_corpus, document_labels):
+    """Creates a document-term matrix for small corpora.
 
-    This private function is wrapped in :func:`_create_large_corpus_model()`.
+    This private function is wrapped in :func:`create_document_term_matrix()`. \
+    The counts are collected in a single pass using :class:`DocumentTermMatrixBuilder` \
+    and converted to a dense pandas DataFrame afterwards. Every document gets \
+    its own row, even if its label is not unique.
 
     Args:
-        bag_of_words (dict): A bag-of-words model of ``{document_id: {type_id: frequency}}``.
-
-    Returns:
-        Pandas MultiIndex.
+        tokenized_corpus (list): Tokenized corpus as an iterable
+            containing one or more iterables containing tokens.
+        document_labels (list): Name or label of each text file.
+
+
+    Returns:
+        Document-term matrix as pandas DataFrame.
 
     Example:
-        >>> bag_of_words = {1: {1: 2, 2: 3, 3: 4}}
-        >>> _create_multi_index(bag_of_words)
-        MultiIndex(levels=[[1], [1, 2, 3]],
-                   labels=[[0, 0, 0], [0, 1, 2]],
-                   names=['document_id', 'type_id'])
+        >>> tokenized_corpus = [['this', 'is', 'document', 'one'], ['this', 'is', 'document', 'two']]
+        >>> document_labels = ['document_one', 'document_two']
+        >>> _create_small_corpus_model(tokenized_corpus, document_labels) #doctest: +NORMALIZE_WHITESPACE
+                      this   is  document  one  two
+        document_one   1.0  1.0       1.0  1.0  0.0
+        document_two   1.0  1.0       1.0  0.0  1.0
+        >>> _create_small_corpus_model(tokenized_corpus, ['document', 'document']).index.tolist()
+        ['document', 'document']
     """
-    tuples = []
-    for document_id in range(1, len(bag_of_words) + 1):
-        if len(bag_of_words[document_id]) == 0:
-            tuples.append((document_id, 0))
-        for type_id in bag_of_words[document_id]:
-            tuples.append((document_id, type_id))
-    return pd.MultiIndex.from_tuples(tuples, names=['document_id', 'type_id'])
+    log.info("Creating document-term matrix for small corpus ...")
+    builder = DocumentTermMatrixBuilder()
+    index = []
+    for document_label, tokenized_document in zip(document_labels, tokenized_corpus):
+        builder.add_document(len(index), tokenized_document)
+        index.append(document_label)
+    sparse_matrix, _, type_ids = builder.to_sparse_matrix()
+    document_term_matrix = pd.DataFrame(sparse_matrix.toarray().astype(float), index=index,
+                                        columns=sorted(type_ids, key=type_ids.get))
+    document_term_matrix = document_term_matrix.loc[:, document_term_matrix.sum().sort_values(ascending=False, kind='mergesort').index]
+    return document_term_matrix
 
 
-def _create_small_corpus_model(tokenized_corpus, document_labels):
-    """Creates a document-term matrix for small corpora.
+def _create_sparse_corpus_model(tokenized_corpus, document_labels):
+    """Creates a sparse document-term matrix.
 
-    This private function is wrapped in :func:`create_document_term_matrix()`.
+    This private function is wrapped in :func:`create_document_term_matrix()` and \
+    creates a `scipy <https://www.scipy.org>`_ sparse matrix in CSR format in \
+    a single pass over ``tokenized_corpus`` using :class:`DocumentTermMatrixBuilder`. \
+    Document and type IDs are assigned \
+    in order of appearance, starting with 1. Row *i* corresponds to document ID \
+    *i + 1* and column *j* to type ID *j + 1*.
 
     Args:
         tokenized_corpus (list): Tokenized corpus as an iterable
             containing one or more iterables containing tokens.
-        document_labels (list): Name or label of each text file.
-
+        document_labels (list): Iterable of document labels.
 
     Returns:
-        Document-term matrix as pandas DataFrame.
+        A document-term matrix as sparse CSR matrix, ``document_ids`` and ``type_ids``.
+
+    Raises:
+        ValueError, if a document label is not unique.
 
     Example:
         >>> tokenized_corpus = [['this', 'is', 'document', 'one'], ['this', 'is', 'document', 'two']]
         >>> document_labels = ['document_one', 'document_two']
-        >>> _create_small_corpus_model(tokenized_corpus, document_labels) #doctest: +NORMALIZE_WHITESPACE
-                      this   is  document  two  one
-        document_one   1.0  1.0       1.0  0.0  1.0
-        document_two   1.0  1.0       1.0  1.0  0.0
+        >>> document_term_matrix, document_ids, type_ids = _create_sparse_corpus_model(tokenized_corpus, document_labels)
+        >>> document_term_matrix.shape
+        (2, 5)
+        >>> type_ids['two']
+        5
+        >>> _create_sparse_corpus_model(tokenized_corpus, ['document', 'document'])
+        Traceback (most recent call last):
+        ...
+        ValueError: The document label document is not unique.
     """
-    log.info("Creating document-term matrix for small corpus ...")
-    document_term_matrix = pd.DataFrame()
-    for tokenized_document, document_label in zip(tokenized_corpus, document_labels):
-        log.debug("Updating {} in document-term matrix ...".format(document_label))
-        current_document = pd.Series(Counter(tokenized_document))
-        current_document.name = document_label
-        document_term_matrix = document_term_matrix.append(current_document)
-    document_term_matrix = document_term_matrix.loc[:, document_term_matrix.sum().sort_values(ascending=False).index]
-    return document_term_matrix.fillna(0)
+    log.info("Creating sparse document-term matrix ...")
+    builder = DocumentTermMatrixBuilder()
+    for document_label, tokenized_document in zip(document_labels, tokenized_corpus):
+        if document_label in builder.document_ids:
+            raise ValueError("The document label {} is not unique.".format(document_label))
+        builder.add_document(document_label, tokenized_document)
+    return builder.to_sparse_matrix()
+
+
+def _create_triples(bag_of_words):
+    """Converts a bag-of-words model to parallel arrays.
+
+    This private function is wrapped in :func:`_create_large_corpus_model()`. \
+    Each document ID, type ID and count triple corresponds to one row of the \
+    document-term matrix. Documents without any tokens are represented by \
+    type ID 0 with count 0. The triples are sorted by document ID and type ID.
+
+    Args:
+        bag_of_words (dict): A bag-of-words model of ``{document_id: {type_id: frequency}}``.
+
+    Returns:
+        Three NumPy arrays containing document IDs, type IDs and counts.
+
+    Example:
+        >>> bag_of_words = {1: {3: 4, 1: 2}, 2: {}}
+        >>> document_id, type_id, count = _create_triples(bag_of_words)
+        >>> document_id.tolist(), type_id.tolist(), count.tolist()
+        ([1, 1, 2], [1, 3, 0], [2, 4, 0])
+    """
+    document_range = range(1, len(bag_of_words) + 1)
+    lengths = np.array([max(len(bag_of_words[id_]), 1) for id_ in document_range], dtype=int)
+    num_rows = int(lengths.sum())
+    document_id = np.repeat(np.arange(1, len(bag_of_words) + 1), lengths)
+    type_id = np.fromiter(chain.from_iterable(bag_of_words[id_].keys() or (0,) for id_ in document_range),
+                          dtype=int, count=num_rows)
+    count = np.fromiter(chain.from_iterable(bag_of_words[id_].values() or (0,) for id_ in document_range),
+                        dtype=int, count=num_rows)
+    order = np.lexsort((type_id, document_id))
+    return document_id[order], type_id[order], count[order]
+
+
+def _encode_tokens(tokenized_document, type_ids):
+    """Translates tokens to type IDs.
+
+    This private function is wrapped in :class:`Tokenizer`, \
+    :class:`DocumentTermMatrixBuilder` and :func:`postprocessing.save_encoded_corpus()`. \
+    Unknown tokens are added to ``type_ids`` like :func:`add_token2id()` does.
+
+    Args:
+        tokenized_document (list): An iterable of tokens.
+        type_ids (dict): A dictionary with types as key and identifiers as values.
+
+    Yields:
+        Type IDs.
+
+    Example:
+        >>> type_ids = {'this': 1}
+        >>> list(_encode_tokens(['this', 'is', 'this'], type_ids))
+        [1, 2, 1]
+    """
+    for token in tokenized_document:
+        type_id = type_ids.get(token)
+        if type_id is None:
+            type_id = type_ids[token] = len(type_ids) + 1
+        yield type_id
+
+
+def _detect_file_format(filepath, file_format):
+    """Determines the format of a file.
+
+    This private function is wrapped in :func:`read_files()` and \
+    :func:`tokenize_files()`.
+
+    Args:
+        filepath (str): Path to the file.
+        file_format (str): Format of the file. Possible values are ``text``,
+            ``xml`` and ``csv``. If None, the file extension will be considered.
+
+    Returns:
+        The file format as str, or None if the file extension is not supported.
+
+    Raises:
+        ValueError, if ``file_format`` is not supported.
+
+    Example:
+        >>> _detect_file_format('document.xml', None)
+        'xml'
+        >>> _detect_file_format('document.txt.gz', None)
+        'text'
+    """
+    root, extension = os.path.splitext(filepath)
+    if extension in _DECOMPRESSORS:
+        _, extension = os.path.splitext(root)
+    if file_format == 'text' or extension == '.txt':
+        return 'text'
+    elif file_format == 'xml' or extension == '.xml':
+        return 'xml'
+    elif file_format == 'csv' or extension == '.csv':
+        return 'csv'
+    elif file_format is None:
+        log.error("Skipping {}, because the file format {} is not supported.".format(filepath, extension))
+        return None
+    else:
+        raise ValueError("Unable to read {}, because the file format {} is not supported.".format(filepath, file_format))
+
+
+class _EncodedBowCorpus:
+    """Bag-of-words view on an :class:`EncodedCorpus`.
+
+    This private class is returned by :meth:`EncodedCorpus.doc2bow()`.
+    """
+    def __init__(self, corpus):
+        self.corpus = corpus
+
+    def __len__(self):
+        return len(self.corpus)
+
+    def __iter__(self):
+        for index in range(len(self.corpus)):
+            type_ids, counts = np.unique(self.corpus[index], return_counts=True)
+            yield list(zip((type_ids.astype(np.int64) - 1).tolist(), counts.tolist()))
+
+
+def _update_fingerprint(hasher, value, path=False):
+    """Updates a hash with the fingerprint of an argument.
+
+    This private function is wrapped in :meth:`PreprocessingCache.key()`. \
+    Paths naming existing files, also as items of a list or tuple, are \
+    represented by the hash of the file content, anything else by its \
+    pickled value. Strings are only treated as paths if ``path`` is True. \
+    Every item is prefixed with its type and length, thus neither the \
+    boundaries between items nor a file and a literal value can be confused. \
+    Sets and dictionaries are pickled as sorted items, see \
+    :func:`_canonicalize()`, thus the fingerprint does not depend on \
+    ``PYTHONHASHSEED``.
+
+    Args:
+        hasher: A :mod:`hashlib` hash object.
+        value: An argument of a cached function.
+        path (bool, optional): If True, strings naming existing files are
+            represented by the file content. Defaults to False.
+
+    Returns:
+        None.
+
+    Raises:
+        TypeError, if ``value`` cannot be pickled, e.g. a generator.
+
+    Example:
+        >>> import tempfile
+        >>> def fingerprint(value, path):
+        ...     hasher = hashlib.sha256()
+        ...     _update_fingerprint(hasher, value, path)
+        ...     return hasher.hexdigest()
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     filepaths = [os.path.join(tmpdir, name) for name in 'abcd']
+        ...     for filepath, content in zip(filepaths, ['ab', 'c', 'a', 'bc']):
+        ...         with open(filepath, 'w') as file:
+        ...             _ = file.write(content)
+        ...     concatenated = fingerprint(filepaths[:2], True) == fingerprint(filepaths[2:], True)
+        ...     literal = fingerprint(filepaths[0], False) == fingerprint(filepaths[0], True)
+        >>> concatenated, literal
+        (False, False)
+    """
+    if isinstance(value, (list, tuple)) and any(_is_file(item, path) for item in value):
+        _update_prefixed(hasher, type(value).__name__, str(len(value)).encode('ascii'))
+        for item in value:
+            _update_fingerprint(hasher, item, path)
+    elif _is_file(value, path):
+        content = hashlib.sha256()
+        with open(value, 'rb') as file:
+            for block in iter(partial(file.read, 2 ** 20), b''):
+                content.update(block)
+        _update_prefixed(hasher, 'file', content.digest())
+    else:
+        try:
+            _update_prefixed(hasher, 'pickle', pickle.dumps(_canonicalize(value), protocol=pickle.HIGHEST_PROTOCOL))
+        except (TypeError, pickle.PicklingError) as error:
+            raise TypeError("Arguments of type {} cannot be cached.".format(type(value).__name__)) from error
+    return None
+
+
+def _update_prefixed(hasher, kind, payload):
+    """Updates a hash with a payload, prefixed with its kind and length.
+
+    This private function is wrapped in :func:`_update_fingerprint()`.
+
+    Args:
+        hasher: A :mod:`hashlib` hash object.
+        kind (str): Name of the type of ``payload``, without spaces and colons.
+        payload (bytes): The bytes to hash.
+
+    Returns:
+        None.
+    """
+    hasher.update('{} {}:'.format(kind, len(payload)).encode('ascii'))
+    hasher.update(payload)
+    return None
+
+
+def _is_archive(filepath):
+    """Checks whether a file is a ZIP or tar archive, based on its name.
+
+    This private function is wrapped in :func:`read_files()`.
+
+    Args:
+        filepath (str): Path to the file.
+
+    Returns:
+        True, if ``filepath`` has an archive extension.
+
+    Example:
+        >>> _is_archive('corpus.tar.gz'), _is_archive('document.txt.gz')
+        (True, False)
+    """
+    root, extension = os.path.splitext(str(filepath))
+    if extension in _DECOMPRESSORS:
+        extension = os.path.splitext(root)[1]
+    return extension in {'.zip', '.tar', '.tgz', '.tbz2', '.txz'}
+
+
+def _iter_archive_members(filepath):
+    """Iterates over the files of a ZIP or tar archive.
+
+    This private function is wrapped in :func:`_iter_files()`. Members are \
+    opened one after another, tar archives are read sequentially. Compressed \
+    members, e.g. ``document.txt.gz``, are decompressed on the fly. Each \
+    member has to be read before the next one is requested.
+
+    Args:
+        filepath (str): Path to the archive.
+
+    Yields:
+        A tuple of the member's name and a binary file object.
+
+    Example:
+        >>> import tempfile
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     archive = os.path.join(tmpdir, 'corpus.tar.gz')
+        ...     with tarfile.open(archive, 'w:gz') as corpus:
+        ...         info = tarfile.TarInfo('document.txt')
+        ...         info.size = 8
+        ...         corpus.addfile(info, io.BytesIO(b"Example."))
+        ...     [(name, member.read()) for name, member in _iter_archive_members(archive)]
+        [('document.txt', b'Example.')]
+    """
+    log.debug("Reading members of {} ...".format(filepath))
+    if zipfile.is_zipfile(filepath):
+        with zipfile.ZipFile(filepath) as archive:
+            for info in archive.infolist():
+                if not info.is_dir():
+                    yield info.filename, _open_file(archive.open(info), info.filename)
+    else:
+        with tarfile.open(filepath, 'r:*') as archive:
+            for info in archive:
+                if info.isfile():
+                    yield info.name, _open_file(archive.extractfile(info), info.name)
+
+
+def _is_file(value, path=False):
+    """Checks, if a value is the path of an existing file.
+
+    This private function is wrapped in :func:`_update_fingerprint()`. \
+    Strings are only looked up on disk, if ``path`` is True.
+
+    Args:
+        value: Any object.
+        path (bool, optional): If True, strings are treated as paths. Defaults
+            to False.
+
+    Returns:
+        True, if ``value`` is a :class:`pathlib.Path`, or a string and ``path``
+            is True, naming a file.
+
+    Example:
+        >>> _is_file(__file__), _is_file(__file__, path=True)
+        (False, True)
+    """
+    return (isinstance(value, os.PathLike) or (path and isinstance(value, str))) and os.path.isfile(value)
+
+
+def _iter_files(filepath):
+    """Iterates over a file or the members of an archive.
+
+    This private function is wrapped in :func:`read_files()` and \
+    :func:`tokenize_files()`.
+
+    Args:
+        filepath (str): Path to a file or an archive.
+
+    Yields:
+        A tuple of the name and the file: ``filepath`` itself, or the name of
+            each archive member and a binary file object, see :func:`_iter_archive_members()`.
+
+    Example:
+        >>> list(_iter_files('document.txt'))
+        [('document.txt', 'document.txt')]
+    """
+    if _is_archive(filepath):
+        yield from _iter_archive_members(filepath)
+    else:
+        yield filepath, filepath
+
+
+def _iter_matrix_market_blocks(file, block_size):
+    """Parses the entries of a Matrix Market file block by block.
+
+    This private function is wrapped in :class:`MatrixMarketCorpus` and \
+    :func:`read_matrix_market_file()`.
+
+    Args:
+        file: Matrix Market file opened in binary mode, positioned after the
+            header.
+        block_size (int): Number of bytes read at once.
+
+    Yields:
+        The byte offset of each entry and the entries as NumPy array with
+            three columns: document ID, type ID and value.
+
+    Raises:
+        ValueError, if a line is not a valid entry.
+    """
+    offset = file.tell()
+    rest = b''
+    while True:
+        block = file.read(block_size)
+        data = rest + block
+        if not data:
+            break
+        end = data.rfind(b'\n') + 1 if block else len(data)
+        lines, rest = data[:end], data[end:]
+        newlines = np.flatnonzero(np.frombuffer(lines, dtype=np.uint8) == ord('\n'))
+        if not newlines.size or newlines[-1] != len(lines) - 1:
+            newlines = np.append(newlines, len(lines))
+        starts = np.concatenate(([0], newlines[:-1] + 1))
+        starts = starts[newlines > starts]
+        entries = _parse_matrix_market_entries(lines)
+        if len(entries) != len(starts):
+            raise ValueError("Blank or malformed line near byte {} of a Matrix Market file.".format(offset))
+        if len(entries):
+            yield starts + offset, entries
+        offset += end
+
+
+def _parse_matrix_market_entries(data):
+    """Parses entries of a Matrix Market file.
+
+    This private function is wrapped in :class:`MatrixMarketCorpus` and \
+    :func:`read_matrix_market_file()`.
+
+    Args:
+        data (bytes): Complete lines of a Matrix Market file, without header.
+
+    Returns:
+        The entries as NumPy array with three columns: document ID, type ID
+            and value.
+
+    Raises:
+        ValueError, if a line does not consist of three numbers.
+
+    Example:
+        >>> _parse_matrix_market_entries(b"1 1 2\\n1 3 1\\n")
+        array([[1., 1., 2.],
+               [1., 3., 1.]])
+        >>> _parse_matrix_market_entries(b"1 1 2\\n1 x 1\\n")
+        Traceback (most recent call last):
+        ...
+        ValueError: ...
+    """
+    if not data.strip():
+        return np.empty((0, 3))
+    entries = np.loadtxt(io.BytesIO(data), dtype=np.float64, comments=None, ndmin=2)
+    if entries.shape[1] != 3:
+        raise ValueError("Matrix Market entries have {} instead of 3 columns.".format(entries.shape[1]))
+    return entries
+
+
+def _open_file(file, name=None):
+    """Opens a plain or compressed file for reading bytes.
+
+    This private function is wrapped in the readers of :func:`read_files()`. \
+    The compression is detected from the extension of ``name``, which defaults \
+    to ``file``. gzip (``.gz``), bzip2 (``.bz2``) and xz (``.xz``) are \
+    decompressed in a streaming way.
+
+    Args:
+        file (str or file): Path to the file, or a binary file object.
+        name (str, optional): Name of the file, e.g. of an archive member. If
+            None and ``file`` is a file object, it is returned unchanged.
+            Defaults to None.
+
+    Returns:
+        A binary file object.
+
+    Example:
+        >>> _open_file(io.BytesIO(gzip.compress(b"Example.")), 'document.txt.gz').read()
+        b'Example.'
+    """
+    if name is None and hasattr(file, 'read'):
+        return file
+    extension = os.path.splitext(str(file if name is None else name))[1]
+    if extension in _DECOMPRESSORS:
+        return _DECOMPRESSORS[extension](file, 'rb')
+    elif hasattr(file, 'read'):
+        return file
+    else:
+        return open(file, 'rb')
 
 
-def _hapax_legomena_large_corpus_model(document_term_matrix, type_ids):
-    """Determines hapax legomena in large corpus model.
+def _prune_large_corpus_model(document_term_matrix, type_ids, min_df, max_df, max_features):
+    """Prunes the vocabulary of large corpus model.
 
-    This private function is wrapped in :func:`find_hapax_legomena()`.
+    This private function is wrapped in :func:`prune_vocabulary()`. Documents \
+    without any remaining type keep a placeholder with type ID 0, like in \
+    :meth:`DocumentTermMatrixBuilder.to_large_corpus_model()`.
 
     Args:
         document_term_matrix (pandas.DataFrame): A document-term matrix.
         type_ids (dict): A dictionary with types as key and identifiers as values.
+        min_df (int or float): Minimum document frequency.
+        max_df (int or float): Maximum document frequency.
+        max_features (int): Maximum number of types.
 
     Returns:
-        Hapax legomena in a list.
+        A pruned document-term matrix as pandas DataFrame and new ``type_ids``.
 
     Example:
-        >>> document_labels = ['document']
-        >>> tokenized_corpus = [['hapax', 'stopword', 'stopword']]
+        >>> document_labels = ['document_one', 'document_two']
+        >>> tokenized_corpus = [['token', 'stopword'], ['stopword']]
         >>> document_term_matrix, _, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, large_corpus=True)
-        >>> find_hapax_legomena(document_term_matrix, type_ids)
-        ['hapax']
+        >>> document_term_matrix, type_ids = _prune_large_corpus_model(document_term_matrix, type_ids, 1, 1, None)
+        >>> len(document_term_matrix), type_ids
+        (2, {'token': 1})
+    """
+    document_id = document_term_matrix.index.get_level_values('document_id').values
+    type_id = document_term_matrix.index.get_level_values('type_id').values
+    count = document_term_matrix[0].values
+    nonzero = (count != 0) & (type_id > 0)
+    statistics = corpus_statistics(document_term_matrix, type_ids)
+    keep = _select_types(statistics.document_frequencies, statistics.collection_frequencies,
+                         statistics.num_documents, min_df, max_df, max_features)
+    new_type_ids = np.cumsum(keep) * keep
+
+    keep_values = keep[type_id] & nonzero
+    empty = np.setdiff1d(document_id, document_id[keep_values])
+    document_id = np.concatenate((document_id[keep_values], empty))
+    type_id = np.concatenate((new_type_ids[type_id[keep_values]], np.zeros(len(empty), dtype=type_id.dtype)))
+    count = np.concatenate((count[keep_values], np.zeros(len(empty), dtype=count.dtype)))
+    order = np.lexsort((type_id, document_id))
+    multi_index = pd.MultiIndex.from_arrays([document_id[order], type_id[order]], names=['document_id', 'type_id'])
+    document_term_matrix = pd.DataFrame({0: count[order]}, index=multi_index)
+    return document_term_matrix, _remap_type_ids(type_ids, new_type_ids)
+
+
+def _prune_sparse_corpus_model(document_term_matrix, type_ids, min_df, max_df, max_features):
+    """Prunes the vocabulary of sparse corpus model.
+
+    This private function is wrapped in :func:`prune_vocabulary()`. Unlike \
+    :func:`_remove_features_from_sparse_corpus_model()`, removed columns are \
+    dropped, thus column *j* corresponds to the new type ID *j + 1*.
+
+    Args:
+        document_term_matrix (scipy.sparse.spmatrix): A sparse document-term matrix.
+        type_ids (dict): A dictionary with types as key and identifiers as values.
+        min_df (int or float): Minimum document frequency.
+        max_df (int or float): Maximum document frequency.
+        max_features (int): Maximum number of types.
+
+    Returns:
+        A pruned document-term matrix as sparse CSR matrix and new ``type_ids``.
+
+    Example:
+        >>> document_labels = ['document_one', 'document_two']
+        >>> tokenized_corpus = [['token', 'stopword'], ['stopword']]
+        >>> document_term_matrix, _, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, sparse_matrix=True)
+        >>> document_term_matrix, type_ids = _prune_sparse_corpus_model(document_term_matrix, type_ids, 1, 1, None)
+        >>> document_term_matrix.toarray(), type_ids
+        (array([[1],
+               [0]]), {'token': 1})
+    """
+    statistics = corpus_statistics(document_term_matrix, type_ids)
+    document_term_matrix = sparse.csr_matrix(document_term_matrix)
+    keep = _select_types(statistics.document_frequencies[1:], statistics.collection_frequencies[1:],
+                         statistics.num_documents, min_df, max_df, max_features)
+    new_type_ids = np.concatenate(([0], np.cumsum(keep) * keep))
+
+    keep_values = keep[document_term_matrix.indices] & (document_term_matrix.data != 0)
+    indptr = np.concatenate(([0], np.cumsum(keep_values)))[document_term_matrix.indptr]
+    document_term_matrix = sparse.csr_matrix((document_term_matrix.data[keep_values],
+                                              new_type_ids[document_term_matrix.indices[keep_values] + 1] - 1,
+                                              indptr),
+                                             shape=(document_term_matrix.shape[0], int(keep.sum())))
+    return document_term_matrix, _remap_type_ids(type_ids, new_type_ids)
+
+
+def _read_binary_document_term_matrix(filepath):
+    """Reads a document-term matrix from NPZ file.
+
+    This private function is wrapped in :func:`read_document_term_matrix()`. \
+    The arrays needed for the saved variant are decompressed into memory, \
+    because a compressed file cannot be memory-mapped. Nothing is unpickled, \
+    labels keep the dtype they were saved with.
+
+    Args:
+        filepath (str): Path to NPZ file written by :func:`postprocessing.save_document_term_matrix()`.
+
+    Returns:
+        A document-term matrix, ``document_ids`` and ``type_ids``. The
+            dictionaries are None, if they have not been saved.
+
+    Example:
+        >>> import tempfile
+        >>> from dariah_topics import postprocessing
+        >>> document_term_matrix = pd.DataFrame([[1.0, 0.0], [0.0, 2.0]], index=[10, 20], columns=['a', 'b'])
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     postprocessing.save_document_term_matrix(document_term_matrix, tmpdir, binary=True)
+        ...     matrix = _read_binary_document_term_matrix(os.path.join(tmpdir, 'document_term_matrix.npz'))[0]
+        >>> matrix.index.tolist(), matrix.equals(document_term_matrix)
+        ([10, 20], True)
+    """
+    log.info("Reading {} ...".format(filepath))
+    with np.load(filepath, allow_pickle=False) as arrays:
+        kind = str(arrays['kind'])
+        row, col, data = arrays['row'], arrays['col'], arrays['data']
+        if kind == 'sparse':
+            document_term_matrix = sparse.csr_matrix((data, (row, col)), shape=tuple(arrays['shape']))
+        elif kind == 'large':
+            index = pd.MultiIndex.from_arrays([row, col], names=['document_id', 'type_id'])
+            document_term_matrix = pd.DataFrame({0: data}, index=index)
+        else:
+            values = np.zeros(tuple(arrays['shape']), dtype=data.dtype)
+            values[row, col] = data
+            document_term_matrix = pd.DataFrame(values, index=arrays['index'].tolist(),
+                                                columns=arrays['columns'].tolist())
+        token2id = []
+        for name in ['document_ids', 'type_ids']:
+            if name + '_keys' in arrays:
+                token2id.append(dict(zip(arrays[name + '_keys'].tolist(), arrays[name + '_values'].tolist())))
+            else:
+                token2id.append(None)
+    return (document_term_matrix, *token2id)
+
+
+def _read_binary_model(path):
+    """Reads a LDA model from separate NumPy arrays and metadata.
+
+    This private function is wrapped in :func:`read_model()`.
+
+    Args:
+        path (str): Path to the directory written by :func:`postprocessing.save_model()`.
+
+    Returns:
+        A LDA model with memory-mapped arrays and the vocabulary, which is None,
+            if it has not been saved.
     """
-    id2type = {id_: type_ for type_, id_ in type_ids.items()}
-    document_term_matrix_collapsed = document_term_matrix.groupby(document_term_matrix.index.get_level_values('type_id')).sum()
-    hapax_legomena = document_term_matrix_collapsed.loc[document_term_matrix_collapsed[0] == 1]
-    return [id2type[token] for token in hapax_legomena.index.get_level_values('type_id')]
+    log.info("Reading model from {} ...".format(path))
+    with open(os.path.join(path, 'model.json'), encoding='utf-8') as file:
+        metadata = json.load(file)
+    model_class = getattr(importlib.import_module(metadata['module']), metadata['class'])
+    if metadata.get('gensim'):
+        model = model_class.load(os.path.join(path, 'model.gensim'), mmap='r')
+    else:
+        model = model_class.__new__(model_class)
+        model.__dict__.update(metadata['attributes'])
+        for name in metadata['arrays']:
+            setattr(model, name, np.load(os.path.join(path, name + '.npy'), mmap_mode='r'))
+        for alias, name in metadata['aliases'].items():
+            setattr(model, alias, getattr(model, name))
+    vocabulary_path = os.path.join(path, 'vocabulary.npy')
+    vocabulary = np.load(vocabulary_path, mmap_mode='r') if os.path.exists(vocabulary_path) else None
+    return model, vocabulary
 
 
 def _read_csv(filepath, sep, columns):
@@ -824,7 +2844,7 @@ def _read_csv(filepath, sep, columns):
     This private function is wrapped in `read_files()`.
     
     Args:
-        filepath (str): Path to CSV file.
+        filepath (str): Path to (compressed) CSV file, or a binary file object.
         sep (str): Separator of CSV file.
         columns (list): Column names for the CSV file. If None, the whole file will be processed.
 
@@ -850,7 +2870,181 @@ def _read_csv(filepath, sep, columns):
     log.debug("Reading columns {} of {} ...".format(columns, filepath))
     if columns is None:
         log.warning("No column names were specified or do not match. The whole file will be processed.")
-    return pd.read_csv(filepath, sep=sep, quoting=csv.QUOTE_NONE, usecols=columns)
+    with _open_file(filepath) as file:
+        return pd.read_csv(file, sep=sep, quoting=csv.QUOTE_NONE, usecols=columns)
+
+
+def _read_documents(file, name, file_format, xpath_expression, sep, csv_columns, iterparse):
+    """Reads the documents of a single file or archive member.
+
+    This private function is wrapped in :func:`read_files()`.
+
+    Args:
+        file (str or file): Path to the file, or a binary file object.
+        name (str): Name of the file, used to detect its format.
+        file_format (str): Format of the file. If None, the extension of
+            ``name`` will be considered.
+        xpath_expression (str): XPath expressions to match part of the XML file.
+        sep (str): Separator of CSV file.
+        csv_columns (list): Column names for the CSV file.
+        iterparse (bool): If True, XML files will be parsed incrementally.
+
+    Yields:
+        A tuple of the label and a ``document`` as str or, in case of a CSV file,
+            a ``dkpro_document`` as pandas DataFrame. The label is ``name``, or,
+            if the file is parsed incrementally, ``name`` followed by ``#`` and
+            the index of the element.
+    """
+    current_file_format = _detect_file_format(name, file_format)
+    if current_file_format == 'xml' and iterparse:
+        for n, document in enumerate(_iterparse_xml(file, xpath_expression)):
+            yield '{}#{}'.format(name, n), document
+    elif current_file_format is not None:
+        yield name, _read_file(file, current_file_format, xpath_expression, sep, csv_columns)
+
+
+def _read_file(filepath, file_format, xpath_expression, sep, csv_columns):
+    """Reads a file based on its path and format.
+
+    This private function is wrapped in :func:`read_files()` and \
+    :func:`_read_and_tokenize_file()`.
+
+    Args:
+        filepath (str): Path to the (compressed) file, or a binary file object.
+        file_format (str): Format of the file, as returned by :func:`_detect_file_format()`.
+        xpath_expression (str): XPath expressions to match part of the XML file.
+        sep (str): Separator of CSV file.
+        csv_columns (list): Column names for the CSV file.
+
+    Returns:
+        A ``document`` as str or, in case of a CSV file, a ``dkpro_document``
+            as pandas DataFrame.
+    """
+    if file_format == 'text':
+        return _read_txt(filepath)
+    elif file_format == 'xml':
+        return _read_xml(filepath, xpath_expression)
+    elif file_format == 'csv':
+        return _read_csv(filepath, sep, csv_columns)
+
+
+def _read_and_tokenize_file(task, pattern, lower, xpath_expression, sep, csv_columns):
+    """Reads and tokenizes a file in a worker process.
+
+    This private function is wrapped in :func:`tokenize_files()`. Exceptions \
+    are not raised in the worker, but returned to the calling process.
+
+    Args:
+        task (tuple): Label of the file, its path or a binary file object, and
+            its format, as returned by :func:`_detect_file_format()`. Files
+            without format result in an empty ``tokenized_document``.
+        pattern (str): Regular expression to match tokens.
+        lower (boolean): If True, lowers all characters.
+        xpath_expression (str): XPath expressions to match part of the XML file.
+        sep (str): Separator of CSV file.
+        csv_columns (list): Column names for the CSV file.
+
+    Returns:
+        A tuple of the label, the processed document (or None) and an error
+            message (or None).
+
+    Example:
+        >>> _read_and_tokenize_file(('missing.txt', 'missing.txt', 'text'), r'\\w+', True, '//text', ',', None)[2]
+        "FileNotFoundError: [Errno 2] No such file or directory: 'missing.txt'"
+    """
+    label, file, file_format = task
+    if file_format is None:
+        return label, [], None
+    try:
+        document = _read_file(file, file_format, xpath_expression, sep, csv_columns)
+        if isinstance(document, str):
+            return label, list(tokenize(document, pattern, lower)), None
+        elif isinstance(document, list):
+            return label, [list(tokenize(part, pattern, lower)) for part in document], None
+        else:
+            return label, document, None
+    except Exception as error:
+        return label, None, "{}: {}".format(type(error).__name__, error)
+
+
+def _iterparse_xml(filepath, xpath_expression):
+    """Reads a TEI XML file incrementally.
+
+    This private function is wrapped in :func:`read_files()`. Only elements \
+    matching ``xpath_expression`` trigger events. As soon as a matching element \
+    is closed, its text is yielded and the element is cleared. Its preceding \
+    siblings and the preceding siblings of all its ancestors are removed from \
+    the tree, thus memory does not grow with the number of parts, e.g. of \
+    ``TEI`` elements in a ``teiCorpus``.
+
+    Args:
+        filepath (str): Path to (compressed) XML file, or a binary file object.
+        xpath_expression (str): XPath expression selecting elements by name,
+            e.g. ``//tei:text`` or ``//div``.
+
+    Yields:
+        The text of each matching element as str.
+
+    Raises:
+        ValueError, if ``xpath_expression`` does not select elements by name.
+
+    Example:
+        >>> import tempfile
+        >>> with tempfile.NamedTemporaryFile(suffix='.xml') as tmpfile:
+        ...     tmpfile.write(b"<text><div>First part.</div><div>Second <hi>part</hi>.</div></text>") and True
+        ...     tmpfile.flush()
+        ...     list(_iterparse_xml(tmpfile.name, '//div'))
+        True
+        ['First part.', 'Second part.']
+        >>> with tempfile.NamedTemporaryFile(suffix='.xml') as tmpfile:
+        ...     tmpfile.write(b"<corpus><doc><text>First.</text></doc><doc><text>Second.</text></doc></corpus>") and True
+        ...     tmpfile.flush()
+        ...     list(_iterparse_xml(tmpfile.name, '//text'))
+        True
+        ['First.', 'Second.']
+    """
+    log.debug("Parsing {} matching part or parts of {} incrementally ...".format(xpath_expression, filepath))
+    ns = dict(tei='http://www.tei-c.org/ns/1.0')
+    match = regex.match(r'^//?(?:(\w+):)?([\w.-]+)$', xpath_expression)
+    if match is None or (match.group(1) is not None and match.group(1) not in ns):
+        raise ValueError("Unable to parse {} incrementally, because the XPath expression {} "
+                         "does not select elements by name.".format(filepath, xpath_expression))
+    prefix, name = match.groups()
+    tag = '{{{}}}{}'.format(ns[prefix], name) if prefix else name
+    with _open_file(filepath) as file:
+        for _, element in etree.iterparse(file, events=('end',), tag=tag, huge_tree=True):
+            yield ''.join(element.itertext(etree.Element))
+            if next(element.iterancestors(tag), None) is None:
+                element.clear()
+                for node in chain([element], element.iterancestors()):
+                    while node.getprevious() is not None:
+                        del node.getparent()[0]
+
+
+def _read_matrix_market_header(file):
+    """Reads the header of a Matrix Market file.
+
+    This private function is wrapped in :class:`MatrixMarketCorpus` and \
+    :func:`read_matrix_market_file()`.
+
+    Args:
+        file: Matrix Market file opened in binary mode.
+
+    Returns:
+        Number of documents, number of types and number of non-zero values.
+            ``file`` is positioned after the header.
+
+    Raises:
+        ValueError, if ``file`` is not a Matrix Market file in coordinate format.
+    """
+    header = file.readline()
+    if not header.lower().startswith(b'%%matrixmarket matrix coordinate'):
+        raise ValueError("The file {} is not a Matrix Market file in coordinate format.".format(file.name))
+    line = file.readline()
+    while line.startswith(b'%'):
+        line = file.readline()
+    num_docs, num_terms, num_nnz = map(int, line.split())
+    return num_docs, num_terms, num_nnz
 
 
 def _read_txt(filepath):
@@ -859,7 +3053,7 @@ def _read_txt(filepath):
     This private function is wrapped in `read_files()`.
 
     Args:
-        filepath (str): Path to plain text file.
+        filepath (str): Path to (compressed) plain text file, or a binary file object.
   
     Returns:
         A ``document`` as str.
@@ -874,8 +3068,8 @@ def _read_txt(filepath):
         'This is a plain text example.'
     """
     log.debug("Reading {} ...".format(filepath))
-    with open(filepath, 'r', encoding='utf-8') as document:
-        return document.read()
+    with _open_file(filepath) as file:
+        return io.TextIOWrapper(file, encoding='utf-8').read()
 
 
 def _read_xml(filepath, xpath_expression):
@@ -884,7 +3078,7 @@ def _read_xml(filepath, xpath_expression):
     This private function is wrapped in `read_files()`.
     
     Args:
-        filepath (str): Path to XML file.
+        filepath (str): Path to (compressed) XML file, or a binary file object.
         xpath_expression (str): XPath expressions to match part of the XML file.
     
     Returns:
@@ -902,7 +3096,8 @@ def _read_xml(filepath, xpath_expression):
     """
     log.debug("Reading {} matching part or parts of {} ...".format(xpath_expression, filepath))
     ns = dict(tei='http://www.tei-c.org/ns/1.0')
-    tree = etree.parse(filepath)
+    with _open_file(filepath) as file:
+        tree = etree.parse(file)
     document = [''.join(element.xpath('.//text()')) for element in tree.xpath(xpath_expression, namespaces=ns)]
     if len(document) == 1:
         return document[0]
@@ -910,6 +3105,29 @@ def _read_xml(filepath, xpath_expression):
         return document
 
 
+def _remap_type_ids(type_ids, new_type_ids):
+    """Applies new type IDs to ``type_ids``.
+
+    This private function is wrapped in :func:`prune_vocabulary()`.
+
+    Args:
+        type_ids (dict): A dictionary with types as key and identifiers as values.
+        new_type_ids (numpy.ndarray): New identifier for each old identifier, 0
+            for removed types.
+
+    Returns:
+        A dictionary with the remaining types as key and new identifiers as values.
+
+    Example:
+        >>> _remap_type_ids({'removed': 1, 'kept': 2}, np.array([0, 0, 1]))
+        {'kept': 1}
+    """
+    new_type_ids = new_type_ids.tolist()
+    remapped_type_ids = {type_: new_type_ids[id_] for type_, id_ in type_ids.items()
+                         if id_ < len(new_type_ids) and new_type_ids[id_]}
+    return dict(sorted(remapped_type_ids.items(), key=lambda item: item[1]))
+
+
 def _remove_features_from_large_corpus_model(document_term_matrix, type_ids, features):
     """Removes features from large corpus model.
 
@@ -959,6 +3177,74 @@ def _remove_features_from_small_corpus_model(document_term_matrix, features):
     return document_term_matrix.drop(features, axis=1)
 
 
+def _remove_features_from_sparse_corpus_model(document_term_matrix, type_ids, features):
+    """Removes features from sparse corpus model.
+
+    This private function is wrapped in :func:`remove_features()`. The shape \
+    of ``document_term_matrix`` is preserved, thus columns still correspond to \
+    ``type_ids``, but the removed columns will not contain any values.
+
+    Args:
+        document_term_matrix (scipy.sparse.spmatrix): A sparse document-term matrix.
+        type_ids (dict): A dictionary with types as key and identifiers as values.
+        features (list): A list of tokens.
+
+    Returns:
+        A clean document-term matrix as sparse CSR matrix.
+
+    Example:
+        >>> document_labels = ['document']
+        >>> tokenized_corpus = [['token', 'stopword', 'stopword']]
+        >>> document_term_matrix, _, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, sparse_matrix=True)
+        >>> _remove_features_from_sparse_corpus_model(document_term_matrix, type_ids, ['token']).toarray()
+        array([[0, 2]])
+    """
+    document_term_matrix = sparse.csr_matrix(document_term_matrix)
+    keep = np.ones(document_term_matrix.shape[1], dtype=bool)
+    keep[[type_ids[token] - 1 for token in set(features) if token in type_ids]] = False
+    keep_values = keep[document_term_matrix.indices]
+    indptr = np.concatenate(([0], np.cumsum(keep_values)))[document_term_matrix.indptr]
+    return sparse.csr_matrix((document_term_matrix.data[keep_values],
+                              document_term_matrix.indices[keep_values],
+                              indptr),
+                             shape=document_term_matrix.shape)
+
+
+def _remove_features_from_tokenized_corpus(tokenized_corpus, features, type_ids=None):
+    """Removes features from a tokenized corpus.
+
+    This private function is wrapped in :func:`remove_features()`. ``features`` \
+    are compiled once, into a frozenset and, if ``type_ids`` is not None, into \
+    a boolean mask over type IDs, which is applied to documents of type IDs.
+
+    Args:
+        tokenized_corpus (list): An iterable of one or more ``tokenized_document``.
+        features (list): An iterable of tokens.
+        type_ids (dict, optional): A dictionary with types as key and identifiers
+            as values. Defaults to None.
+
+    Yields:
+        A clean ``tokenized_document`` as list, or as NumPy array, if it consists
+            of type IDs.
+
+    Example:
+        >>> tokenized_corpus = [['token', 'stopword'], np.array([2, 1, 3])]
+        >>> list(_remove_features_from_tokenized_corpus(tokenized_corpus, ['stopword'], {'token': 1, 'stopword': 2}))
+        [['token'], array([1, 3])]
+    """
+    features = frozenset(features)
+    feature_mask = None
+    if type_ids is not None:
+        feature_mask = np.zeros(max(type_ids.values(), default=0) + 1, dtype=bool)
+        feature_mask[[type_ids[token] for token in features if token in type_ids]] = True
+    for tokenized_document in tokenized_corpus:
+        if feature_mask is not None and isinstance(tokenized_document, np.ndarray) and tokenized_document.dtype.kind in 'iu':
+            known = tokenized_document < len(feature_mask)
+            yield tokenized_document[~feature_mask[np.where(known, tokenized_document, 0)]]
+        else:
+            yield _remove_features_from_tokenized_document(tokenized_document, features)
+
+
 def _remove_features_from_tokenized_document(tokenized_document, features):
     """Removes features from a tokenized document.
 
@@ -967,7 +3253,8 @@ def _remove_features_from_tokenized_document(tokenized_document, features):
     Args:
         tokenized_document (list): The tokenized document to process. This is an iterable of
             tokens.
-        features (list): An iterable of tokens.
+        features (list): An iterable of tokens. Pass a frozenset to avoid
+            converting it for each document.
 
     Returns:
         A clean tokenized document as list.
@@ -978,36 +3265,47 @@ def _remove_features_from_tokenized_document(tokenized_document, features):
         >>> _remove_features_from_tokenized_document(tokenized_document, features)
         ['token']
     """
-    tokenized_document_arr = np.array(tokenized_document)
-    features_arr = np.array(features)
-    indices = np.where(np.in1d(tokenized_document_arr, features_arr))
-    return np.delete(tokenized_document_arr, indices).tolist()
+    if not isinstance(features, (set, frozenset)):
+        features = frozenset(features)
+    return [token for token in tokenized_document if token not in features]
 
 
-def _list_mfw_large_corpus_model(document_term_matrix, type_ids, most_frequent_tokens):
-    """Determines stopwords in large corpus model.
+def _select_types(document_frequencies, collection_frequencies, num_documents, min_df, max_df, max_features):
+    """Selects types by document and collection frequency.
 
-    This private function is wrapped in :func:`list_mfw()`.
+    This private function is wrapped in :func:`prune_vocabulary()`.
 
     Args:
-        document_term_matrix (pandas.DataFrame): A document-term matrix.
-        type_ids (dict): A dictionary with types as key and identifiers as values.
-        most_frequent_tokens (int, optional): Treshold for most frequent tokens.
+        document_frequencies (numpy.ndarray): Number of documents containing each type.
+        collection_frequencies (numpy.ndarray): Number of tokens of each type.
+        num_documents (int): Number of documents.
+        min_df (int or float): Minimum document frequency. A float is interpreted
+            as fraction of documents.
+        max_df (int or float): Maximum document frequency. A float is interpreted
+            as fraction of documents.
+        max_features (int): Maximum number of types. If None, there is no limit.
 
     Returns:
-        Most frequent tokens in a list.
+        A boolean NumPy array, which is True for types to keep.
+
+    Raises:
+        ValueError, if ``max_df`` corresponds to fewer documents than ``min_df``.
 
     Example:
-        >>> document_labels = ['document']
-        >>> tokenized_corpus = [['hapax', 'stopword', 'stopword']]
-        >>> document_term_matrix, _, type_ids = create_document_term_matrix(tokenized_corpus, document_labels, large_corpus=True)
-        >>> list_mfw(document_term_matrix, 1, type_ids)
-        ['stopword']
+        >>> _select_types(np.array([1, 2, 2, 3]), np.array([1, 5, 2, 9]), 3, 2, 0.9, 1)
+        array([False,  True, False, False])
     """
-    id2type = {id_: type_ for type_, id_ in type_ids.items()}
-    document_term_matrix_collapsed = document_term_matrix.groupby(document_term_matrix.index.get_level_values('type_id')).sum()
-    stopwords = document_term_matrix_collapsed[0].nlargest(most_frequent_tokens)
-    return [id2type[token] for token in stopwords.index.get_level_values('type_id')]
+    min_documents = min_df * num_documents if isinstance(min_df, float) else min_df
+    max_documents = max_df * num_documents if isinstance(max_df, float) else max_df
+    if max_documents < min_documents:
+        raise ValueError("max_df corresponds to fewer documents than min_df.")
+    keep = (document_frequencies >= max(min_documents, 1)) & (document_frequencies <= max_documents)
+    if max_features is not None and keep.sum() > max_features:
+        candidates = np.flatnonzero(keep)
+        most_frequent = candidates[np.argsort(-collection_frequencies[candidates], kind='mergesort')[:max_features]]
+        keep = np.zeros(len(keep), dtype=bool)
+        keep[most_frequent] = True
+    return keep
 
 
 def _token2id(tokens):
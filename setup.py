@@ -19,18 +19,22 @@ setup(
     license='Apache 2.0',
     classifiers=[
         'Development Status :: 3 - Alpha',
-        'Programming Language :: Python :: 3.4',
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.6'
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11'
     ],
+    python_requires='>=3.8',
     keywords=['topic modeling', 'lda', 'natural language processing', 'digital humanities'],
     packages=find_packages(exclude=['docs', 'test', 'notebooks']),
     install_requires=[
         'pandas>=0.19.2',
         'regex>=2017.01.14',
         'gensim>=0.13.2',
-        'lda>=1.0.5',
-        'numpy>=1.3',
+        'lda>=1.0.5,<3.1',
+        'numba>=0.50',
+        'numpy>=1.16',
+        'scipy>=0.19.0',
         'lxml>=3.6.4',
         'matplotlib>=1.5.3',
         'bokeh>=0.12.6',
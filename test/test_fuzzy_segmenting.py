@@ -2,10 +2,11 @@
 # -*- coding: utf-8 -*-
 
 from dariah_topics.preprocessing import segment_fuzzy, split_paragraphs, \
-    segment, tokenize
+    segment, segment_array, tokenize, Tokenizer
 from functools import partial
 from itertools import chain
 from pathlib import Path
+import numpy as np
 import re
 
 
@@ -107,3 +108,29 @@ def test_segment():
     lengths = list(map(len, segments))
     assert min(lengths[:-1]) >= 950, "a segment is too short in " + str(segments)
     assert max(lengths) <= 1050, "a segment is too long in " + str(segments)
+
+
+def test_segment_tokenizer():
+    """Tokenizer instance as drop-in replacement for tokenize"""
+    path = project_path.joinpath('notebooks', 'data', 'grenzboten_sample', 'Beck_1844_Tagebuch_56.txt')
+    text = path.read_text(encoding='utf-8')
+    chunker = partial(split_paragraphs, sep=re.compile(r'\n\n'))
+    expected = segment(text, segment_size=1000, tolerance=0.05,
+                       chunker=chunker, tokenizer=tokenize)
+    segments = segment(text, segment_size=1000, tolerance=0.05,
+                       chunker=chunker, tokenizer=Tokenizer())
+    assert segments == expected
+
+
+def test_segment_array():
+    """array segmentation matches segment"""
+    chunk_sizes = [3, 17, 1, 40, 8, 8, 25, 2, 13, 31, 5, 9, 22, 4, 36, 11]
+    chunks = [list(range(sum(chunk_sizes[:n]), sum(chunk_sizes[:n + 1]))) for n in range(len(chunk_sizes))]
+    tokens = np.arange(sum(chunk_sizes))
+    chunk_offsets = np.cumsum([0] + chunk_sizes[:-1])
+    for segment_size, tolerance in [(50, 0.1), (30, 0), (60, -1), (7, 2), (20, 5)]:
+        expected = segment(chunks, segment_size=segment_size, tolerance=tolerance)
+        segments = segment_array(tokens, chunk_offsets, segment_size=segment_size,
+                                 tolerance=tolerance, views=True)
+        assert [segment.tolist() for segment in segments] == expected
+        assert all(np.shares_memory(segment, tokens) for segment in segments)